@@ -0,0 +1,143 @@
+# ============================================
+# audio/analysis.py - 템포 / 키 추정 (LoopComposition 시작값)
+# ============================================
+"""
+Sound Stone 하나에서 BPM과 키를 추정해 LoopCompositionScene의 시작값으로 제안.
+워커("analysis" 작업)에서 돌고, 결과는 샘플 버전(processed_audio dict)에 캐시.
+
+- 속도: ANALYSIS_SR(≈11 kHz)로 평균 decimate → STFT 한 번으로 템포/키 둘 다 (30 s 샘플이
+  Pi에서도 수십 ms 수준)
+- 템포: onset envelope(로그 spectral flux) 자기상관(FFT) → 40~220 BPM lag 범위에서
+  120 BPM 중심 로그-가우시안 가중 최대 (옥타브 오류 완화) + 포물선 보간
+- 키: chroma(55 Hz~2 kHz 빈 → 12 피치클래스 합) 와 Krumhansl 장/단조 프로파일 상관 최대.
+  씬의 스케일은 장음계뿐이므로 단조가 이기면 나란한 장조(+3반음)를 제안 — 음 집합이 같다
+- 템포는 실제 onset(features.onset_frames — 에너지가 올라간 flux 피크)이 MIN_ONSETS개
+  이상일 때만. 지속음/드론/노이즈의 작은 flux 요동도 정규화하면 주기적으로 보이므로
+- 신뢰도가 낮으면(짧은 원샷 등) 해당 값은 0으로 → 씬이 제안하지 않음
+"""
+
+import numpy as np
+from audio.features import spectral_flux, onset_frames
+
+ANALYSIS_SR = 11025
+FRAME = 1024
+HOP = 256
+BPM_MIN, BPM_MAX = 40, 220
+MIN_TEMPO_SEC = 3.0         # 이보다 짧으면 템포 추정 안 함
+MIN_ONSETS = 4              # 이보다 onset이 적으면 템포 추정 안 함 (패드/드론/노이즈)
+TEMPO_CONFIDENCE = 0.1
+KEY_CONFIDENCE = 0.5
+
+# Krumhansl-Kessler 프로파일 (C 기준)
+MAJOR_PROFILE = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
+MINOR_PROFILE = np.array([6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
+
+KEY_NAMES = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")   # key_idx → 이름
+
+# pack() 레이아웃
+FIELDS = ("bpm", "bpm_confidence", "key_idx", "key_confidence", "minor")
+
+
+def _decimate(mono, sample_rate):
+    """정수 배 평균 decimate (박스 필터 — 템포/chroma에는 충분)"""
+    q = max(1, int(round(sample_rate / float(ANALYSIS_SR))))
+    n = len(mono) // q * q
+    if q == 1 or n == 0:
+        return mono, float(sample_rate)
+    return mono[:n].reshape(-1, q).mean(axis=1), sample_rate / float(q)
+
+
+def _stft_mag(x):
+    if len(x) < FRAME:
+        x = np.concatenate([x, np.zeros(FRAME - len(x), dtype=np.float32)])
+    frames = np.lib.stride_tricks.sliding_window_view(x, FRAME)[::HOP]
+    return np.abs(np.fft.rfft(frames * np.hanning(FRAME).astype(np.float32), axis=1))
+
+
+def estimate_tempo(mag, sr):
+    """→ (bpm, 신뢰도 0~1)"""
+    fps = sr / HOP
+    env = spectral_flux(mag)
+    if len(env) / fps < MIN_TEMPO_SEC:
+        return 0.0, 0.0
+    # 프레임 RMS (Parseval) — onset은 dB 상승만 보므로 창 이득은 상관없음
+    frame_rms = np.sqrt(2.0 * (mag ** 2).sum(axis=1)) / FRAME
+    if len(onset_frames(mag, frame_rms)) < MIN_ONSETS:
+        return 0.0, 0.0
+    env = env - np.convolve(env, np.ones(16) / 16.0, mode="same")      # 느린 레벨 변화 제거
+    env = np.maximum(env, 0.0)
+    env = env - env.mean()              # 평균을 빼야 자기상관 정규화가 주기성만 본다
+    size = 1 << (2 * len(env) - 1).bit_length()
+    spec = np.fft.rfft(env, size)
+    acf = np.fft.irfft(spec * np.conj(spec), size)[:len(env)]
+    if acf[0] <= 0:
+        return 0.0, 0.0
+    acf /= acf[0]
+    lo = max(1, int(np.floor(60.0 * fps / BPM_MAX)))
+    hi = min(len(acf) - 2, int(np.ceil(60.0 * fps / BPM_MIN)))
+    if hi <= lo:
+        return 0.0, 0.0
+    lags = np.arange(lo, hi + 1)
+    bpms = 60.0 * fps / lags
+    weight = np.exp(-0.5 * (np.log2(bpms / 120.0) / 0.9) ** 2)
+    i = int(np.argmax(acf[lags] * weight))
+    lag, conf = float(lags[i]), float(acf[lags[i]])
+    # 포물선 보간으로 소수 lag
+    a, b, c = acf[lags[i] - 1], acf[lags[i]], acf[lags[i] + 1]
+    denom = a - 2 * b + c
+    if denom < 0:
+        lag += 0.5 * (a - c) / denom
+    return float(np.clip(60.0 * fps / lag, BPM_MIN, BPM_MAX)), max(0.0, conf)
+
+
+def _chroma_matrix(sr):
+    freqs = np.fft.rfftfreq(FRAME, 1.0 / sr)
+    m = np.zeros((len(freqs), 12))
+    band = (freqs >= 55.0) & (freqs <= 2000.0)
+    pc = np.round(12.0 * np.log2(freqs[band] / 440.0) + 9).astype(np.int64) % 12     # 0 = C
+    m[np.flatnonzero(band), pc] = 1.0
+    return m
+
+
+def estimate_key(mag, sr):
+    """→ (KEYS 인덱스(장조), 신뢰도, 단조였는지)"""
+    chroma = (mag ** 2 @ _chroma_matrix(sr)).sum(axis=0)
+    if chroma.sum() <= 0:
+        return 0, 0.0, False
+    chroma = chroma / chroma.sum()
+    # 24개 조(장/단 × 12 으뜸음) 프로파일 행렬과 피어슨 상관을 한 번에
+    idx = (np.arange(12)[None, :] - np.arange(12)[:, None]) % 12
+    profiles = np.concatenate([MAJOR_PROFILE[idx], MINOR_PROFILE[idx]])     # [24, pc]
+    z = lambda a: (a - a.mean(axis=-1, keepdims=True)) / (a.std(axis=-1, keepdims=True) + 1e-12)
+    r = z(profiles) @ z(chroma) / 12.0
+    best = int(np.argmax(r))
+    tonic, conf, minor = best % 12, float(r[best]), best >= 12
+    key = (tonic + 3) % 12 if minor else tonic
+    return key, conf, minor
+
+
+def analyze(data, sample_rate):
+    mono = np.asarray(data, dtype=np.float32)
+    if mono.ndim > 1:
+        mono = mono.mean(axis=1)
+    x, sr = _decimate(mono, sample_rate)
+    mag = _stft_mag(x.astype(np.float32))
+    bpm, bpm_conf = estimate_tempo(mag, sr)
+    key, key_conf, minor = estimate_key(mag, sr)
+    return {"bpm": bpm if bpm_conf >= TEMPO_CONFIDENCE else 0.0, "bpm_confidence": bpm_conf,
+            "key_idx": key, "key_confidence": key_conf if key_conf >= KEY_CONFIDENCE else 0.0,
+            "minor": float(minor)}
+
+
+def pack(result):
+    return np.array([result[k] for k in FIELDS], dtype=np.float32)
+
+
+def unpack(arr):
+    arr = np.asarray(arr, dtype=np.float32)
+    if len(arr) != len(FIELDS):
+        return None
+    out = {k: float(v) for k, v in zip(FIELDS, arr)}
+    out["key_idx"] = int(out["key_idx"])
+    out["minor"] = bool(out["minor"])
+    return out
@@ -0,0 +1,191 @@
+# ============================================
+# audio/biquad.py - 스트리밍 IIR(biquad) 필터 엔진
+# ============================================
+"""
+EQ - Low Pass / High Pass용 Butterworth biquad 캐스케이드.
+블록 단위로 처리하며 상태(zi)를 블록 사이에 이어 간다 → 실시간 프리뷰와
+오프라인 렌더(dsp.craft)가 같은 필터를 쓴다.
+
+- 계수: second-order sections (sos) — 행마다 [b0, b1, b2, 1, a1, a2]
+  order N(짝수)이면 N/2개 섹션, 섹션 Q = 1 / (2 sin((2k+1)π / 2N))
+- 처리: scipy.signal.sosfilt가 있으면 사용, 없으면 NumPy 폴백
+  (블록마다 all-pole 임펄스 응답과 FFT 컨볼루션 — 샘플 단위 파이썬 루프 없음)
+- 채널: x가 (n, channels)면 채널 축으로 한 번에 처리
+- 컷오프 램프: set_cutoff()로 목표만 바꾸고, process()가 RAMP_STEP 샘플마다
+  계수를 다시 계산해 RAMP_MS 동안 로그 보간 (R-R 스윕 중 지퍼 노이즈 방지)
+"""
+
+import math
+import numpy as np
+
+try:
+    from scipy.signal import sosfilt as _sosfilt
+    SCIPY_AVAILABLE = True
+except ImportError:
+    _sosfilt = None
+    SCIPY_AVAILABLE = False
+
+RAMP_MS = 20.0       # 컷오프 변경 램프 길이
+RAMP_STEP = 32       # 램프 중 계수 갱신 간격(샘플)
+
+
+def butterworth_sos(kind, cutoff, sample_rate, order=2):
+    """RBJ biquad 공식으로 만든 Butterworth sos (kind: "lowpass" | "highpass")"""
+    nyq = 0.5 * sample_rate
+    fc = min(max(float(cutoff), 1.0), nyq * 0.999)
+    w0 = 2.0 * math.pi * fc / sample_rate
+    cw, sw = math.cos(w0), math.sin(w0)
+    rows = []
+    for k in range(max(1, order // 2)):
+        q = 1.0 / (2.0 * math.sin((2 * k + 1) * math.pi / (2 * max(2, order))))
+        alpha = sw / (2.0 * q)
+        a0 = 1.0 + alpha
+        if kind == "lowpass":
+            b = ((1.0 - cw) / 2.0, 1.0 - cw, (1.0 - cw) / 2.0)
+        elif kind == "highpass":
+            b = ((1.0 + cw) / 2.0, -(1.0 + cw), (1.0 + cw) / 2.0)
+        else:
+            raise ValueError(f"Unknown filter kind: {kind}")
+        rows.append([b[0] / a0, b[1] / a0, b[2] / a0, 1.0, -2.0 * cw / a0, (1.0 - alpha) / a0])
+    return np.array(rows, dtype=np.float64)
+
+
+# ---------- NumPy 폴백 ----------
+def _allpole_impulse(a1, a2, n):
+    """1 / (1 + a1 z^-1 + a2 z^-2)의 임펄스 응답 n개 (극점 닫힌 형태)"""
+    k = np.arange(n, dtype=np.float64)
+    disc = complex(a1 * a1 - 4.0 * a2) ** 0.5
+    p1, p2 = (-a1 + disc) / 2.0, (-a1 - disc) / 2.0
+    if abs(p1 - p2) < 1e-9:
+        h = (k + 1.0) * np.power(p1, k)
+    else:
+        h = (np.power(p1, k + 1.0) - np.power(p2, k + 1.0)) / (p1 - p2)
+    return np.real(h)
+
+
+def _sosfilt_numpy(sos, x, zi):
+    """
+    sosfilt와 같은 동작 (Direct Form II transposed 상태 zi: (sections, channels, 2)).
+    섹션마다: FIR(b) → 이전 상태를 첫 두 샘플에 더함 → all-pole 임펄스 응답과 FFT 컨볼루션
+    """
+    n = x.shape[0]
+    y = x
+    size = 1 << max(1, (2 * n - 1).bit_length())
+    zo = np.empty_like(zi)
+    for s, (b0, b1, b2, _, a1, a2) in enumerate(sos):
+        xin = y
+        # w = b * x (블록 안)
+        w = b0 * xin
+        if n > 1:
+            w[1:] += b1 * xin[:-1]
+        if n > 2:
+            w[2:] += b2 * xin[:-2]
+        # DF2T 초기 상태는 all-pole 입력의 첫 두 샘플에 더한 것과 같다
+        # (y[0] = w[0] + z0, y[1] = w[1] - a1 y[0] + z1)
+        w[0] += zi[s, :, 0]
+        if n > 1:
+            w[1] += zi[s, :, 1]
+        h = _allpole_impulse(a1, a2, n)
+        spec = np.fft.rfft(w, size, axis=0) * np.fft.rfft(h, size)[:, None]
+        y = np.fft.irfft(spec, size, axis=0)[:n]
+        # 다음 블록 상태 (DF2T 정의): z0 = b1 x[-1] - a1 y[-1] + z1', z1' = b2 x[-1] - a2 y[-1]
+        z1 = b2 * xin[-1] - a2 * y[-1]
+        if n > 1:
+            z0 = b1 * xin[-1] - a1 * y[-1] + b2 * xin[-2] - a2 * y[-2]
+        else:
+            z0 = b1 * xin[-1] - a1 * y[-1] + zi[s, :, 1]
+        zo[s, :, 0] = z0
+        zo[s, :, 1] = z1
+    return y, zo
+
+
+def sosfilt(sos, x, zi):
+    """x: (n, channels) float64 → (y, zf). scipy 유무와 관계없이 같은 결과"""
+    if SCIPY_AVAILABLE:
+        return _sosfilt(sos, x, axis=0, zi=zi)
+    return _sosfilt_numpy(sos, x, zi)
+
+
+class BiquadFilter:
+    """
+    상태를 가진 스트리밍 필터.
+        f = BiquadFilter("lowpass", 2000, 44100)
+        y = f.process(block)        # (n,) 또는 (n, channels)
+        f.set_cutoff(800)           # 다음 process()부터 RAMP_MS 동안 램프
+    """
+
+    def __init__(self, kind, cutoff, sample_rate, channels=1, order=2):
+        self.kind = kind
+        self.sample_rate = int(sample_rate)
+        self.order = int(order)
+        self.channels = int(channels)
+        self.cutoff = float(cutoff)          # 현재(램프 중간값일 수 있음)
+        self.target = float(cutoff)
+        self._ramp_left = 0
+        self._ramp_len = max(1, int(self.sample_rate * RAMP_MS / 1000.0))
+        self._sos = butterworth_sos(kind, cutoff, sample_rate, order)
+        self._zi = np.zeros((len(self._sos), self.channels, 2), dtype=np.float64)
+
+    def reset(self):
+        self._zi[:] = 0.0
+
+    def set_cutoff(self, cutoff, ramp=True):
+        cutoff = float(cutoff)
+        if cutoff == self.target:
+            return
+        self.target = cutoff
+        if ramp:
+            self._ramp_left = self._ramp_len
+        else:
+            self._ramp_left = 0
+            self.cutoff = cutoff
+            self._sos = butterworth_sos(self.kind, cutoff, self.sample_rate, self.order)
+
+    def _advance_ramp(self, step):
+        """step 샘플만큼 램프 진행 — 남은 구간 비율만큼 로그 스케일로 목표에 다가감"""
+        frac = step / float(self._ramp_left)
+        self._ramp_left -= step
+        if self._ramp_left:
+            lc, lt = math.log(self.cutoff), math.log(self.target)
+            self.cutoff = math.exp(lc + (lt - lc) * frac)
+        else:
+            self.cutoff = self.target
+        self._sos = butterworth_sos(self.kind, self.cutoff, self.sample_rate, self.order)
+
+    @property
+    def ramping(self):
+        return self._ramp_left > 0
+
+    def process(self, x):
+        x = np.asarray(x)
+        mono = x.ndim == 1
+        buf = x.reshape(len(x), -1).astype(np.float64)
+        if buf.shape[1] != self.channels:
+            raise ValueError(f"BiquadFilter expects {self.channels} channels, got {buf.shape[1]}")
+        if not len(buf):
+            return x.astype(np.float32)
+        if not self._ramp_left:
+            y, self._zi = sosfilt(self._sos, buf, self._zi)
+        else:
+            y = np.empty_like(buf)
+            done, n = 0, len(buf)
+            while done < n:
+                if self._ramp_left:
+                    c = min(RAMP_STEP, n - done, self._ramp_left)
+                    self._advance_ramp(c)
+                else:
+                    c = n - done
+                y[done:done + c], self._zi = sosfilt(self._sos, buf[done:done + c], self._zi)
+                done += c
+        y = y.astype(np.float32)
+        return y[:, 0] if mono else y
+
+
+def filter_offline(data, kind, cutoff, sample_rate, order=2, block=65536):
+    """전체 버퍼를 블록 단위로 필터 (dsp.craft용)"""
+    f = BiquadFilter(kind, cutoff, sample_rate, order=order)
+    data = np.asarray(data, dtype=np.float32)
+    out = np.empty_like(data)
+    for i in range(0, len(data), block):
+        out[i:i + block] = f.process(data[i:i + block])
+    return out
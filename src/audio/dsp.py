@@ -0,0 +1,58 @@
+# ============================================
+# audio/dsp.py - Sound Crafting 오프라인 처리
+# ============================================
+"""
+SoundCraftingScene 툴(Trim/Reverse/Speed/EQ)을 샘플 전체에 적용.
+오디오 워커 프로세스에서 호출되므로 pygame/씬 모듈을 import하지 않는다.
+
+craft(data, sr, params) 적용 순서: trim → reverse → speed → low pass → high pass
+params = {"trim": (begin_sec, end_sec), "reverse": bool, "speed": 배율,
+          "keep_pitch": bool, "lowpass": Hz, "highpass": Hz}   (없는 키는 건너뜀)
+"""
+
+import numpy as np
+from audio import biquad, stretch
+from config import MAX_STONE_SEC
+
+
+def trim(data, sample_rate, begin_sec, end_sec):
+    a = max(0, int(round(begin_sec * sample_rate)))
+    b = min(len(data), int(round(end_sec * sample_rate)))
+    return data[a:max(a, b)]
+
+
+def reverse(data):
+    return data[::-1]
+
+
+def change_speed(data, sample_rate, factor, keep_pitch=False):
+    """
+    재생 속도 배율 (>1 빠르고 짧게) — audio/stretch.py 스트림을 끝까지 렌더.
+    결과는 MAX_STONE_SEC에서 자름 (x0.01이면 원본의 100배 — 루프에 다 들어가지도 않음)
+    """
+    return stretch.change_speed(data, factor, keep_pitch,
+                                max_frames=int(MAX_STONE_SEC * sample_rate))
+
+
+def lowpass(data, sample_rate, cutoff, order=2):
+    """Butterworth low pass (audio/biquad.py — 프리뷰와 같은 스트리밍 필터)"""
+    return biquad.filter_offline(data, "lowpass", cutoff, sample_rate, order)
+
+
+def highpass(data, sample_rate, cutoff, order=2):
+    return biquad.filter_offline(data, "highpass", cutoff, sample_rate, order)
+
+
+def craft(data, sample_rate, params):
+    out = np.asarray(data, dtype=np.float32)
+    if params.get("trim") is not None:
+        out = trim(out, sample_rate, *params["trim"])
+    if params.get("reverse"):
+        out = reverse(out)
+    if params.get("speed", 1.0) != 1.0:
+        out = change_speed(out, sample_rate, params["speed"], params.get("keep_pitch", False))
+    if params.get("lowpass"):
+        out = lowpass(out, sample_rate, params["lowpass"])
+    if params.get("highpass"):
+        out = highpass(out, sample_rate, params["highpass"])
+    return np.ascontiguousarray(out, dtype=np.float32)
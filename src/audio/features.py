@@ -0,0 +1,225 @@
+# ============================================
+# audio/features.py - Sound Stone 특징 추출 (디스크립터)
+# ============================================
+"""
+샘플 버전(녹음 테이크 / 렌더 결과)마다 한 번만 계산하는 오디오 디스크립터.
+Sound Stone의 색/모양/질감은 이 값에서만 나온다 (프레임마다 계산하지 않음).
+
+- STFT: sliding_window_view로 (프레임 × FRAME) 행렬을 만들어 rfft 한 번 → 파이썬 루프 없음
+- spectral centroid: 프레임 에너지 가중 평균 (Hz)
+- RMS envelope: 프레임 RMS → ENV_POINTS 점으로 요약 (peak 정규화)
+- onset density: 로그 크기 spectral flux 피크 중 에너지가 올라간 곳의 수 / 초
+- pitch: 프레임 자기상관(= |X|² 역FFT)의 최대 lag → 유성 프레임 f0의 중앙값 (무성이면 0)
+- flatness: 기하평균/산술평균 (0 = 음정, 1 = 노이즈)
+
+워커 작업("features")은 pack()한 float32 벡터를 돌려주고 UI가 unpack() —
+공유 메모리로 배열만 주고받는 audio/worker.py 규칙을 따른다.
+for_sample()은 sample dict / <audio>.features.npy 사이드카 캐시만 본다 (계산은 워커).
+"""
+
+import colorsys
+import os
+import numpy as np
+
+FEATURES_VERSION = 1
+FRAME = 2048
+HOP = 512
+ENV_POINTS = 64
+PITCH_MIN_HZ, PITCH_MAX_HZ = 60.0, 1000.0
+FEATURES_SUFFIX = ".features.npy"
+ONSET_RISE_DB = 3.0     # onset으로 인정할 최소 에너지 상승
+
+# pack() 벡터 레이아웃: [version, n_samples, 스칼라 FIELDS..., envelope(ENV_POINTS)]
+FIELDS = ("duration", "rms", "peak", "centroid_hz", "flatness", "onset_density", "pitch_hz")
+
+
+def _to_mono(data):
+    data = np.asarray(data, dtype=np.float32)
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    return data
+
+
+def stft_mag(mono, frame=FRAME, hop=HOP):
+    """(프레임 수, frame//2+1) 크기 스펙트럼 — 짧으면 0으로 채워 최소 1프레임"""
+    if len(mono) < frame:
+        mono = np.concatenate([mono, np.zeros(frame - len(mono), dtype=np.float32)])
+    frames = np.lib.stride_tricks.sliding_window_view(mono, frame)[::hop]
+    win = np.hanning(frame).astype(np.float32)
+    return np.abs(np.fft.rfft(frames * win, axis=1)), frames
+
+
+def spectral_flux(mag):
+    """로그 크기의 양의 변화량 합 (프레임당 1값, 첫 프레임은 0)"""
+    logm = np.log1p(mag)
+    flux = np.maximum(np.diff(logm, axis=0), 0.0).sum(axis=1)
+    return np.concatenate([[0.0], flux])
+
+
+def pick_peaks(env, k=1.5, min_gap=2):
+    """적응형 임계(중앙값 + k·MAD) 위 지역 최댓값 인덱스 (min_gap 프레임 이내는 큰 것만)"""
+    if len(env) < 3:
+        return np.zeros(0, dtype=np.intp)
+    med = np.median(env)
+    thr = med + k * np.median(np.abs(env - med)) + 1e-9
+    mid = env[1:-1]
+    idx = np.flatnonzero((mid > env[:-2]) & (mid >= env[2:]) & (mid > thr)) + 1
+    if len(idx) > 1 and min_gap > 1:
+        keep = [idx[0]]
+        for i in idx[1:]:
+            if i - keep[-1] >= min_gap:
+                keep.append(i)
+            elif env[i] > env[keep[-1]]:
+                keep[-1] = i
+        idx = np.asarray(keep, dtype=np.intp)
+    return idx
+
+
+def onset_frames(mag, frame_rms, rise_db=ONSET_RISE_DB, lookback=4):
+    """
+    onset 프레임 인덱스 = spectral flux 피크 중 에너지가 실제로 올라간 곳
+    (직전 lookback 프레임 최솟값보다 rise_db 이상) — 정상 상태 음/노이즈의 flux 요동은 제외
+    """
+    peaks = pick_peaks(spectral_flux(mag))
+    if not len(peaks):
+        return peaks
+    db = 20.0 * np.log10(np.maximum(frame_rms, 1e-6))
+    padded = np.concatenate([np.full(lookback, db[0]), db])
+    prior = np.lib.stride_tricks.sliding_window_view(padded, lookback)[:len(db)].min(axis=1)
+    return peaks[db[peaks] - prior[peaks] >= rise_db]
+
+
+def _pitch(mag, frame_rms, sample_rate):
+    """유성 프레임 f0 중앙값 (Hz) — 자기상관 = irfft(|X|²)"""
+    loud = frame_rms > max(1e-4, 0.25 * frame_rms.max())
+    if not loud.any():
+        return 0.0
+    acf = np.fft.irfft(mag[loud] ** 2, axis=1)
+    lo = int(sample_rate / PITCH_MAX_HZ)
+    hi = min(acf.shape[1] // 2, int(sample_rate / PITCH_MIN_HZ))
+    if hi <= lo + 1:
+        return 0.0
+    seg = acf[:, lo:hi]
+    lag = np.argmax(seg, axis=1)
+    strength = seg[np.arange(len(seg)), lag] / np.maximum(acf[:, 0], 1e-12)
+    voiced = strength > 0.5
+    if voiced.sum() < max(1, len(seg) // 4):
+        return 0.0
+    return float(np.median(sample_rate / (lag[voiced] + lo)))
+
+
+def extract(data, sample_rate):
+    """→ dict: FIELDS 스칼라 + "envelope" (ENV_POINTS, 0~1)"""
+    mono = _to_mono(data)
+    sr = float(sample_rate)
+    out = {k: 0.0 for k in FIELDS}
+    out["envelope"] = np.zeros(ENV_POINTS, dtype=np.float32)
+    out["duration"] = len(mono) / sr
+    if len(mono) < 2:
+        return out
+    out["rms"] = float(np.sqrt(np.mean(mono.astype(np.float64) ** 2)))
+    out["peak"] = float(np.abs(mono).max())
+
+    mag, frames = stft_mag(mono)
+    frame_rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    power = mag ** 2
+    energy = power.sum(axis=1)
+    freqs = np.fft.rfftfreq(FRAME, 1.0 / sr)
+    if energy.sum() > 0:
+        centroids = (power @ freqs) / np.maximum(energy, 1e-12)
+        out["centroid_hz"] = float(np.sum(centroids * energy) / energy.sum())
+        spec = mag[energy > 0] + 1e-12
+        out["flatness"] = float(np.mean(np.exp(np.mean(np.log(spec), axis=1)) / np.mean(spec, axis=1)))
+
+    onsets = onset_frames(mag, frame_rms)
+    out["onset_density"] = len(onsets) / max(out["duration"], 1e-3)
+    out["pitch_hz"] = _pitch(mag, frame_rms, sr)
+
+    # 프레임 RMS → ENV_POINTS 구간 최대값 (짧은 트랜지언트도 남게)
+    # (프레임이 ENV_POINTS보다 적으면 같은 시작점이 반복 → reduceat은 그 프레임 값을 그대로)
+    starts = (np.arange(ENV_POINTS) * len(frame_rms)) // ENV_POINTS
+    env = np.maximum.reduceat(frame_rms, starts)
+    out["envelope"] = (env / max(env.max(), 1e-9)).astype(np.float32)
+    return out
+
+
+# ---------- 직렬화 (워커 ↔ UI, 사이드카) ----------
+def pack(desc, n_samples):
+    head = [FEATURES_VERSION, n_samples] + [desc[k] for k in FIELDS]
+    return np.concatenate([np.asarray(head, dtype=np.float32),
+                           np.asarray(desc["envelope"], dtype=np.float32)])
+
+
+def unpack(arr, n_samples=None):
+    """pack()의 역. 버전/길이가 안 맞으면 None (재계산 필요)"""
+    arr = np.asarray(arr, dtype=np.float32)
+    head = 2 + len(FIELDS)
+    if len(arr) != head + ENV_POINTS or int(arr[0]) != FEATURES_VERSION:
+        return None
+    if n_samples is not None and int(arr[1]) != int(n_samples):
+        return None
+    desc = {k: float(v) for k, v in zip(FIELDS, arr[2:head])}
+    desc["envelope"] = arr[head:].copy()
+    return desc
+
+
+def for_sample(sample):
+    """
+    sample dict에 캐시된 디스크립터 (없으면 <path>.features.npy 사이드카) → dict | None.
+    계산하지 않는다 — 없으면 씬이 워커에 "features" 작업을 보낸다.
+    """
+    if not isinstance(sample, dict):
+        return None
+    cached = sample.get("descriptors")
+    if cached is not None:
+        return cached
+    path, data = sample.get("path"), sample.get("data")
+    if path and os.path.exists(path + FEATURES_SUFFIX):
+        try:
+            desc = unpack(np.load(path + FEATURES_SUFFIX),
+                          None if data is None else len(data))
+        except (OSError, ValueError):
+            desc = None
+        if desc is not None:
+            sample["descriptors"] = desc
+            return desc
+    return None
+
+
+def store(sample, desc):
+    """디스크립터를 sample dict에 캐시 (+ path가 있으면 사이드카 저장)"""
+    sample["descriptors"] = desc
+    path, data = sample.get("path"), sample.get("data")
+    if path and data is not None:
+        try:
+            np.save(path + FEATURES_SUFFIX, pack(desc, len(data)))
+        except OSError as e:
+            print(f"[Features] could not save descriptors: {e}")
+
+
+# ---------- Sound Stone 비주얼 ----------
+def stone_visuals(desc, vertices_max=16):
+    """
+    디스크립터 → {"color", "shape", "texture"}
+    - color: centroid(어두움=따뜻한 색 → 밝음=차가운 색), 명도 = RMS, 채도 = 음정 유무
+    - shape: 꼭짓점 수/들쭉날쭉함 = onset density, 반지름 = RMS envelope
+    - texture: flatness (glassy / grainy / rough)
+    """
+    c = float(np.clip((np.log10(max(desc["centroid_hz"], 1.0)) - 2.0) / 1.9, 0.0, 1.0))  # 100Hz~8kHz
+    value = 0.55 + 0.45 * float(np.clip(desc["rms"] / 0.25, 0.0, 1.0))
+    sat = 0.75 if desc["pitch_hz"] > 0 else 0.45
+    r, g, b = colorsys.hsv_to_rgb(0.02 + 0.62 * c, sat, value)
+    color = (int(r * 255), int(g * 255), int(b * 255))
+
+    density = float(desc["onset_density"])
+    n = int(np.clip(6 + density * 2, 6, vertices_max))
+    jag = float(np.clip(density / 8.0, 0.0, 1.0))
+    env = np.asarray(desc["envelope"], dtype=np.float32)
+    at = np.interp(np.linspace(0, len(env) - 1, n), np.arange(len(env)), env) if len(env) else np.ones(n)
+    radii = 0.72 + 0.28 * at
+    radii = radii * (1.0 - 0.18 * jag * (np.arange(n) % 2))        # 홀수 꼭짓점을 안으로 → 뾰족
+    shape = {"vertices": n, "jag": jag, "radii": [float(v) for v in radii]}
+
+    flat = desc["flatness"]
+    texture = "glassy" if flat < 0.1 else ("grainy" if flat < 0.3 else "rough")
+    return {"color": color, "shape": shape, "texture": texture}
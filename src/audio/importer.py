@@ -0,0 +1,191 @@
+# ============================================
+# audio/importer.py - 외부 WAV 일괄 가져오기
+# ============================================
+"""
+폴더의 WAV들을 Library 항목으로 가져온다 (REC 말고 오디오를 넣는 두 번째 길).
+
+- scan(): 디렉터리의 .wav 중 아직 가져오지 않은 것 (원본 경로 + 수정 시각으로 판단)
+- import_file(): 파일 하나 — 워커 프로세스에서 실행
+  · 디코딩(8/16/24/32bit PCM) → mono → SAMPLE_RATE가 아니면 stretch의 polyphase
+    리샘플러(블록 단위 벡터 연산)로 변환 → audio_store 블롭으로 저장 (같은 내용은 한 벌)
+  · 피크 피라미드(.peaks.npz) / 디스크립터(.features.npy) 사이드카, 템포/키 추정,
+    파형 썸네일까지 여기서 — UI는 작은 메타데이터 dict만 받는다
+- BulkImport: 파일마다 ProcessPoolExecutor 작업 하나, poll()로 진행률 수집.
+  전부 끝나면(또는 cancel) 완료된 항목을 append_library_packs로 인덱스에 한 번에 기록
+  · cancel()은 UI 스레드를 막지 않음: 대기 작업만 취소하고, 실행 중인 작업은
+    백그라운드 스레드가 기다렸다가 기록
+  (블롭 참조 수도 그때 한 번에 — 워커는 참조 수를 건드리지 않음)
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+from config import SAMPLE_RATE, IMPORT_WORKERS
+
+IMPORT_EXTS = (".wav",)
+
+
+def _source_key(path):
+    return os.path.abspath(path), int(os.path.getmtime(path))
+
+
+def scan(directory, packs=()):
+    """directory의 가져올 WAV 경로 (정렬) — packs에 같은 원본/수정 시각이 있으면 제외"""
+    if not directory or not os.path.isdir(directory):
+        return []
+    known = {(p.get("source"), p.get("source_mtime")) for p in packs if p.get("source")}
+    out = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.lower().endswith(IMPORT_EXTS) and os.path.isfile(path) and _source_key(path) not in known:
+            out.append(path)
+    return out
+
+
+def import_file(src):
+    """src WAV 하나를 저장소로 가져오고 Library 항목 dict를 돌려줌 (워커 프로세스)"""
+    from audio import analysis, features
+    from audio.stretch import change_speed
+    from audio.waveform import PeakPyramid
+    from ui.thumbnails import render_waveform_thumbnail
+    from utils import audio_store
+    from utils.file_manager import load_wav
+
+    data, sr = load_wav(src)
+    mono = data.mean(axis=1) if data.ndim > 1 else data
+    if sr != SAMPLE_RATE:
+        mono = change_speed(mono, sr / float(SAMPLE_RATE))
+    mono = np.ascontiguousarray(mono, dtype=np.float32)
+    digest = audio_store.write_blob(mono, SAMPLE_RATE)
+    dst = audio_store.blob_path(digest)
+
+    # 이미 있던 블롭이면 사이드카도 그대로 재사용
+    sample = {"path": dst, "data": mono, "sample_rate": SAMPLE_RATE}
+    peaks = PeakPyramid.for_sample(sample)
+    if features.for_sample(sample) is None:
+        features.store(sample, features.extract(mono, SAMPLE_RATE))
+    est = analysis.analyze(mono, SAMPLE_RATE)
+
+    source, mtime = _source_key(src)
+    return {
+        "name": os.path.splitext(os.path.basename(src))[0],
+        "date": datetime.fromtimestamp(mtime).isoformat(timespec="seconds"),
+        "duration": len(mono) / float(SAMPLE_RATE),
+        "bpm": round(est["bpm"]) if est["bpm"] > 0 else None,
+        "key": analysis.KEY_NAMES[est["key_idx"]] if est["key_confidence"] > 0 else None,
+        "layers": 1,
+        "bars": 0,
+        "audio_path": dst,
+        "audio_blob": digest,
+        "source": source,
+        "source_mtime": mtime,
+        "thumb": render_waveform_thumbnail(peaks),
+    }
+
+
+class BulkImport:
+    """
+    백그라운드 일괄 가져오기. 씬의 update에서 poll() → progress로 표시,
+    finished가 되면 entries가 인덱스에 기록돼 있다.
+    """
+
+    def __init__(self, sources, workers=IMPORT_WORKERS):
+        self.sources = list(sources)
+        self.workers = int(workers) or (os.cpu_count() or 1)
+        self.entries = []               # 완료된 항목 (원본 순서와 무관)
+        self.errors = []                # (원본 경로, 메시지)
+        self.committed = False
+        self._pool = None
+        self._futures = []
+        self._done = queue.SimpleQueue()    # 완료 콜백(풀 스레드) → poll()(UI 스레드)
+        self._collected = 0
+
+    @property
+    def total(self):
+        return len(self.sources)
+
+    @property
+    def progress(self):
+        """(완료 수, 전체 수)"""
+        return self._collected, self.total
+
+    @property
+    def finished(self):
+        return self.committed
+
+    def start(self):
+        if not self.sources:
+            self._commit()
+            return self
+        try:
+            from multiprocessing import get_context
+            # fork는 pygame/오디오 스레드 상태까지 복제하므로 spawn (audio/worker.py와 같은 이유)
+            self._pool = ProcessPoolExecutor(max_workers=min(self.workers, self.total),
+                                             mp_context=get_context("spawn"))
+        except (ImportError, OSError, ValueError, NotImplementedError) as e:
+            print(f"[BulkImport] process pool unavailable — thread fallback ({e})")
+            self._pool = ThreadPoolExecutor(max_workers=1)
+        for src in self.sources:
+            fut = self._pool.submit(import_file, src)
+            fut.add_done_callback(lambda f, src=src: self._done.put((src, f)))
+            self._futures.append(fut)
+        return self
+
+    def poll(self):
+        """완료된 작업 수집 → 이번에 끝난 수. 전부 끝나면 인덱스에 한 번에 기록"""
+        n = 0
+        while True:
+            try:
+                src, fut = self._done.get_nowait()
+            except queue.Empty:
+                break
+            n += 1
+            self._collected += 1
+            if fut.cancelled():
+                continue
+            try:
+                self.entries.append(fut.result())
+            except Exception as e:       # 깨진 파일 하나로 전체를 멈추지 않음
+                self.errors.append((src, str(e)))
+                print(f"[BulkImport] {os.path.basename(src)}: {e}")
+        if not self.committed and self._collected >= self.total:
+            self._commit()
+        return n
+
+    def wait(self):
+        """끝날 때까지 블로킹 (CLI용)"""
+        while not self.finished:
+            if not self.poll():
+                time.sleep(0.05)
+
+    def cancel(self):
+        """
+        남은 작업 취소 — 블로킹하지 않음 (Library exit에서 호출).
+        이미 끝난 파일은 바로, 실행 중이던 파일은 끝나는 대로 백그라운드 스레드가 기록
+        """
+        if self.committed:
+            return
+        for fut in self._futures:
+            fut.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self.poll()
+        if not self.committed:
+            threading.Thread(target=self.wait, daemon=True).start()
+
+    def _commit(self):
+        from utils.file_manager import append_library_packs
+        self.committed = True
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+        if self.entries:
+            order = {src: i for i, src in enumerate(os.path.abspath(s) for s in self.sources)}
+            self.entries.sort(key=lambda e: order.get(e["source"], 0))
+            try:
+                append_library_packs(self.entries)
+            except OSError as e:
+                print(f"[BulkImport] could not update library index: {e}")
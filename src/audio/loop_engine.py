@@ -0,0 +1,170 @@
+# ============================================
+# audio/loop_engine.py - 루프 렌더링 엔진
+# ============================================
+"""
+LoopCompositionScene의 grid([bar][layer] = [sample, ...])를 오디오로 렌더링.
+
+- 1 bar = 4/4, TICKS_PER_BAR(32분음표) 틱
+- sample: {"start", "length"(ticks), "tpl", "melody", "pitch"(semitone), "gain"(%)}
+- Melody면 pitch 반영(재생 속도), Rhythm이면 pitch 무시
+"""
+
+import numpy as np
+from config import SAMPLE_RATE
+from audio.mixer import as_mono_f32, semitones_to_rate
+from audio.transport import BEATS_PER_BAR, TICKS_PER_BAR
+from audio.scheduler import BarScheduler
+
+
+def bar_frames(bpm, sample_rate=SAMPLE_RATE):
+    return int(round(BEATS_PER_BAR * 60.0 / float(bpm) * sample_rate))
+
+
+def tick_frames(bpm, sample_rate=SAMPLE_RATE, ticks_per_bar=TICKS_PER_BAR):
+    return bar_frames(bpm, sample_rate) / float(ticks_per_bar)
+
+
+def stone_audio(stone):
+    """sound_stone dict → float32 mono 배열 (없으면 None)"""
+    if not isinstance(stone, dict):
+        return None
+    sample = stone.get("processed_audio", stone)
+    if isinstance(sample, dict):
+        cached = sample.get("_mono")
+        if cached is not None:
+            return cached
+        data = sample.get("data")
+        if data is None:
+            return None
+        mono = as_mono_f32(data)
+        sample["_mono"] = mono
+        return mono
+    return None
+
+
+def template_audio(tpl):
+    return stone_audio(tpl.get("data")) if tpl else None
+
+
+def sample_rate_factor(s):
+    return semitones_to_rate(s.get("pitch", 0)) if s.get("melody", True) else 1.0
+
+
+def render_event(out, audio, offset, frames, rate, gain):
+    """audio를 rate로 재생해 out[offset:offset+frames]에 더함 (선형 보간)"""
+    if audio is None or len(audio) < 2 or frames <= 0:
+        return
+    n = min(frames, len(out) - offset, int(np.ceil((len(audio) - 1) / rate)))
+    if n <= 0:
+        return
+    if rate == 1.0:
+        out[offset:offset + n] += audio[:n] * gain
+        return
+    pos = np.arange(n, dtype=np.float64) * rate
+    out[offset:offset + n] += np.interp(pos, np.arange(len(audio)), audio).astype(np.float32) * gain
+
+
+def render_bar(bar_layers, bpm, sample_rate=SAMPLE_RATE, ticks_per_bar=TICKS_PER_BAR, only_layer=None):
+    """한 bar(레이어 목록) → float32 mono 버퍼 (길이 = bar_frames)"""
+    n = bar_frames(bpm, sample_rate)
+    out = np.zeros(n, dtype=np.float32)
+    for li, samples in enumerate(bar_layers):
+        if only_layer is not None and li != only_layer:
+            continue
+        for s in samples:
+            # 틱 위치는 Transport.tick_offset과 같은 정수 계산
+            offset = (s["start"] * n) // ticks_per_bar
+            frames = ((s["start"] + s["length"]) * n) // ticks_per_bar - offset
+            render_event(out, template_audio(s.get("tpl")), offset, frames,
+                         sample_rate_factor(s), s.get("gain", 100) / 100.0)
+    return out
+
+
+def render_loop(grid, bpm, sample_rate=SAMPLE_RATE, ticks_per_bar=TICKS_PER_BAR):
+    """grid 전체 → bar를 이어붙인 float32 mono 버퍼"""
+    if not grid:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate([render_bar(b, bpm, sample_rate, ticks_per_bar) for b in grid])
+
+
+def grid_job_inputs(grid):
+    """
+    grid → (arrays{key: float32 mono}, 배열 없는 grid) — 오디오 워커로 보낼 때
+    배열은 공유 메모리로, 이벤트는 작은 dict로 나눈다 (같은 템플릿 오디오는 한 번만)
+    """
+    arrays, keys, plain = {}, {}, []
+    for bar in grid:
+        pbar = []
+        for layer in bar:
+            player = []
+            for s in layer:
+                audio = template_audio(s.get("tpl"))
+                key = None
+                if audio is not None:
+                    key = keys.get(id(audio))
+                    if key is None:
+                        key = keys[id(audio)] = f"a{len(keys)}"
+                        arrays[key] = audio
+                ev = {k: s[k] for k in ("start", "length", "melody", "pitch", "gain") if k in s}
+                ev["audio"] = key
+                player.append(ev)
+            pbar.append(player)
+        plain.append(pbar)
+    return arrays, plain
+
+
+def grid_from_job(plain, arrays):
+    """grid_job_inputs의 역: 워커 쪽에서 render_bar가 읽을 수 있는 grid로 복원"""
+    stones = {k: {"data": a, "_mono": a} for k, a in arrays.items()}
+    return [[[dict(ev, tpl=({"data": stones[ev["audio"]]} if ev.get("audio") else None))
+              for ev in layer] for layer in bar] for bar in plain]
+
+
+class LoopPlayer:
+    """
+    grid 루프 재생기. BarScheduler가 bar N 재생 중 bar N+1을 워커 스레드에서 미리 렌더하고,
+    믹서 콜백은 준비된 버퍼를 복사만 한다.
+    """
+
+    def __init__(self, mixer, bpm, bars):
+        self.mixer = mixer
+        self._grid = []
+        self.scheduler = BarScheduler(mixer, self._render_bar, bpm, bars)
+
+    @property
+    def playing(self):
+        return self.scheduler.running
+
+    @property
+    def transport(self):
+        return self.scheduler.transport
+
+    def _render_bar(self, bar, bpm):
+        grid = self._grid
+        if bar >= len(grid):
+            return np.zeros(bar_frames(bpm, self.mixer.sample_rate), dtype=np.float32)
+        return render_bar(grid[bar], bpm, self.mixer.sample_rate)
+
+    def refresh(self, grid):
+        """grid가 바뀌면 호출 — 워커가 읽는 스냅샷을 교체하고 다음 bar 재렌더"""
+        self._grid = [[list(samples) for samples in bar] for bar in grid]
+        self.scheduler.invalidate()
+
+    def set_bpm(self, bpm):
+        self.scheduler.set_bpm(bpm)
+
+    def set_bars(self, bars):
+        self.scheduler.set_bars(bars)
+
+    def start(self, grid, bar=0):
+        self._grid = [[list(samples) for samples in b] for b in grid]
+        self.scheduler.start(bar)
+
+    def stop(self):
+        self.scheduler.stop()
+
+    def playhead(self):
+        return self.scheduler.playhead()
+
+    def stats(self):
+        return self.scheduler.stats()
@@ -0,0 +1,285 @@
+# ============================================
+# audio/mixer.py - 콜백 기반 실시간 믹서 (보이스 풀)
+# ============================================
+"""
+고정 크기 보이스 풀을 가진 블록 단위 NumPy 믹서.
+
+- 보이스 상태(active/pos/rate/gain/delay)는 NumPy 배열로 미리 할당
+- 콜백(render_into)의 보이스 믹싱은 미리 만든 스크래치 버퍼에 out= 연산만 수행
+  → 블록/샘플 크기의 새 배열 데이터는 할당하지 않음. 보장은 거기까지:
+  보이스마다 슬라이스 view와 NumPy 스칼라 같은 작은 객체는 생기고, 보이스 순회는 파이썬 루프
+  (MAX_VOICES개). 등록된 source 훅(스케줄러/스트림)은 각자 규칙을 따른다
+- 출력 스케일은 file_manager.to_int16과 같음(×32768, 반올림, int16 범위 클립) —
+  실시간 출력과 저장한 WAV가 같은 값
+- 샘플 미리듣기, 루프 재생, Library 팩 미리듣기가 모두 get_mixer() 하나를 공유
+- 출력 장치는 audio/player.py (sounddevice / pygame / null / wav 파일)
+"""
+
+import math
+import threading
+import numpy as np
+from config import SAMPLE_RATE, CHANNELS, BUFFER_SIZE, MAX_VOICES
+
+
+def semitones_to_rate(semi):
+    return 2.0 ** (semi / 12.0)
+
+
+def as_mono_f32(data):
+    """재생용 버퍼: float32 mono, C-contiguous"""
+    data = np.asarray(data)
+    if data.dtype == np.int16:
+        data = data.astype(np.float32) / 32768.0
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    return np.ascontiguousarray(data, dtype=np.float32)
+
+
+class Mixer:
+    def __init__(self, sample_rate=SAMPLE_RATE, channels=CHANNELS,
+                 block_size=BUFFER_SIZE, max_voices=MAX_VOICES):
+        self.sample_rate = int(sample_rate)
+        self.channels = int(channels)
+        self.block_size = int(block_size)
+        self.max_voices = int(max_voices)
+        self.master_gain = 1.0
+
+        V, B = self.max_voices, self.block_size
+        # --- 보이스 풀 ---
+        self._active = np.zeros(V, dtype=bool)
+        self._pos = np.zeros(V, dtype=np.float64)     # 읽기 위치(프레임, 소수)
+        self._rate = np.ones(V, dtype=np.float64)     # 재생 속도(피치)
+        self._gain = np.ones(V, dtype=np.float32)
+        self._delay = np.zeros(V, dtype=np.int64)     # 시작까지 남은 프레임(샘플 정확도)
+        self._loop = np.zeros(V, dtype=bool)
+        self._left = np.full(V, -1, dtype=np.int64)   # 남은 출력 프레임 (-1 = 소스 끝까지)
+        self._stamp = np.zeros(V, dtype=np.int64)     # 시작 순번 (클수록 나중에 시작)
+        self._started = 0
+        self._buffers = [None] * V                    # float32 mono 소스
+        self._tags = [None] * V                       # "sample" / "loop" / "pack" ...
+        self._lock = threading.Lock()                 # 보이스 할당(play)/stop_tag 직렬화
+
+        # --- 스크래치(콜백 전용, 미리 할당) ---
+        self._ramp = np.arange(B, dtype=np.float64)
+        self._idx = np.empty(B, dtype=np.float64)
+        self._flo = np.empty(B, dtype=np.float64)
+        self._i0 = np.empty(B, dtype=np.int64)
+        self._i1 = np.empty(B, dtype=np.int64)
+        self._fa = np.empty(B, dtype=np.float32)
+        self._fb = np.empty(B, dtype=np.float32)
+        self._frac = np.empty(B, dtype=np.float32)
+        self._mix = np.zeros(B, dtype=np.float32)
+        self._out = np.zeros((B, self.channels), dtype=np.int16)
+
+        # 블록마다 호출되는 소스 훅: fn(mix_view, frames) — mix_view에 더해 넣음
+        self._sources = []
+
+    # ---------- UI 스레드 API ----------
+    def play(self, data, gain=1.0, pitch=0.0, rate=None, tag=None, delay=0, loop=False, limit=-1):
+        """
+        버퍼 재생 시작 → voice id (빈 보이스가 없으면 가장 오래된 보이스를 뺏음)
+        pitch: 반음, rate가 주어지면 rate 우선. delay: 다음 블록 기준 시작 지연 프레임
+        limit: 최대 출력 프레임(-1이면 소스 끝까지)
+        """
+        buf = as_mono_f32(data)
+        if len(buf) < 2:
+            return None
+        r = float(rate) if rate is not None else semitones_to_rate(pitch)
+        with self._lock:
+            return self._start_voice(buf, gain, r, delay, tag, loop, limit)
+
+    def _start_voice(self, buf, gain, rate, delay, tag, loop, limit):
+        v = self._free_voice()
+        self._active[v] = False
+        self._buffers[v] = buf
+        self._tags[v] = tag
+        self._pos[v] = 0.0
+        self._rate[v] = rate
+        self._gain[v] = gain
+        self._delay[v] = delay
+        self._loop[v] = loop
+        self._left[v] = limit
+        self._started += 1
+        self._stamp[v] = self._started
+        self._active[v] = True     # 마지막에 켜서 콜백이 반쯤 설정된 보이스를 보지 않게
+        return v
+
+    def _free_voice(self):
+        active = self._active
+        for v in range(self.max_voices):
+            if not active[v]:
+                return v
+        return int(np.argmin(self._stamp))   # 모두 사용 중이면 가장 먼저 시작한 보이스
+
+    def stop(self, voice):
+        if voice is not None:
+            self._active[voice] = False
+
+    def stop_tag(self, tag):
+        with self._lock:
+            for v in range(self.max_voices):
+                if self._tags[v] == tag:
+                    self._active[v] = False
+
+    def stop_all(self):
+        self._active[:] = False
+
+    def is_playing(self, tag=None):
+        if tag is None:
+            return bool(self._active.any())
+        return any(self._active[v] and self._tags[v] == tag for v in range(self.max_voices))
+
+    def set_voice(self, voice, gain=None, pitch=None, rate=None):
+        if voice is None:
+            return
+        if gain is not None:
+            self._gain[voice] = gain
+        if rate is not None:
+            self._rate[voice] = rate
+        elif pitch is not None:
+            self._rate[voice] = semitones_to_rate(pitch)
+
+    def add_source(self, fn):
+        if fn not in self._sources:
+            self._sources.append(fn)
+
+    def remove_source(self, fn):
+        if fn in self._sources:
+            self._sources.remove(fn)
+
+    # ---------- 오디오 스레드 ----------
+    def render_into(self, out):
+        """out: (frames, channels) int16 — 장치 콜백이 넘겨준 버퍼에 직접 채움"""
+        frames = out.shape[0]
+        done = 0
+        B = self.block_size
+        while done < frames:
+            n = min(B, frames - done)
+            self._render_block(n)
+            out[done:done + n] = self._out[:n]
+            done += n
+
+    def render(self, frames=None):
+        """pull 방식 장치용: 내부 버퍼 view 반환 (frames <= block_size)"""
+        n = self.block_size if frames is None else min(int(frames), self.block_size)
+        self._render_block(n)
+        return self._out[:n]
+
+    def callback(self, outdata, frames, time_info, status):
+        """sounddevice OutputStream 콜백 시그니처"""
+        self.render_into(outdata)
+
+    def _render_block(self, n):
+        mix = self._mix[:n]
+        mix.fill(0.0)
+        for v in range(self.max_voices):
+            if self._active[v]:
+                self._mix_voice(v, mix, n)
+        for fn in self._sources:
+            fn(mix, n)
+
+        np.multiply(mix, 32768.0 * self.master_gain, out=mix)
+        np.rint(mix, out=mix)
+        np.clip(mix, -32768.0, 32767.0, out=mix)
+        out = self._out[:n]
+        for c in range(self.channels):
+            np.copyto(out[:, c], mix, casting="unsafe")
+
+    def _mix_voice(self, v, mix, n):
+        d = self._delay[v]
+        if d >= n:
+            self._delay[v] = d - n
+            return
+        self._delay[v] = 0
+        buf = self._buffers[v]
+        length = buf.shape[0]
+        rate = self._rate[v]
+        gain = self._gain[v]
+        pos = self._pos[v]
+        off, m = d, n - d
+        left = self._left[v]
+        if 0 <= left < m:
+            m = int(left)
+        while m > 0:
+            # 이번 구간에서 보간 가능한 프레임 수 (idx < length-1)
+            c = int(math.ceil((length - 1 - pos) / rate)) if pos < length - 1 else 0
+            c = max(0, min(m, c))
+            if c:
+                self._mix_segment(buf, pos, rate, gain, mix[off:off + c], c)
+                pos += rate * c
+                off += c
+                m -= c
+            if m > 0:
+                if not self._loop[v]:
+                    self._active[v] = False
+                    break
+                # 루프 보이스: 넘친 만큼 처음부터 이어서
+                pos = pos - (length - 1) if c else 0.0
+                pos = pos if 0.0 <= pos < length - 1 else 0.0
+        self._pos[v] = pos
+        if left >= 0:
+            left -= off - d
+            self._left[v] = left
+            if left <= 0:
+                self._active[v] = False
+
+    def _mix_segment(self, buf, pos, rate, gain, dst, c):
+        fa = self._fa[:c]
+        if rate == 1.0 and pos == int(pos):
+            p = int(pos)
+            np.multiply(buf[p:p + c], gain, out=fa)
+            np.add(dst, fa, out=dst)
+            return
+        idx, flo = self._idx[:c], self._flo[:c]
+        i0, i1 = self._i0[:c], self._i1[:c]
+        fb, frac = self._fb[:c], self._frac[:c]
+        np.multiply(self._ramp[:c], rate, out=idx)
+        np.add(idx, pos, out=idx)
+        np.floor(idx, out=flo)
+        np.copyto(i0, flo, casting="unsafe")
+        np.add(i0, 1, out=i1)
+        np.subtract(idx, flo, out=flo)
+        np.copyto(frac, flo, casting="unsafe")
+        buf.take(i0, out=fa)
+        buf.take(i1, out=fb)
+        # a + (b - a) * frac
+        np.subtract(fb, fa, out=fb)
+        np.multiply(fb, frac, out=fb)
+        np.add(fa, fb, out=fa)
+        np.multiply(fa, gain, out=fa)
+        np.add(dst, fa, out=dst)
+
+
+# ---------- 공유 믹서 ----------
+_shared = None
+_shared_output = None
+_output_kind = None
+
+
+def configure_output(kind):
+    """공유 믹서를 만들 때 쓸 출력 종류 (None이면 config.AUDIO_OUTPUT) — get_mixer() 전에 호출"""
+    global _output_kind
+    _output_kind = kind
+
+
+def get_mixer():
+    """앱 전체가 공유하는 믹서 (처음 호출 시 출력 장치와 함께 생성)"""
+    global _shared, _shared_output
+    if _shared is None:
+        from audio.player import open_output
+        _shared = Mixer()
+        _shared_output = open_output(_shared, _output_kind)
+    return _shared
+
+
+def get_output():
+    """공유 믹서의 출력 장치 (아직 안 열렸으면 None)"""
+    return _shared_output
+
+
+def shutdown_mixer():
+    global _shared, _shared_output
+    if _shared_output is not None:
+        _shared_output.close()
+    _shared = None
+    _shared_output = None
@@ -0,0 +1,85 @@
+# ============================================
+# audio/onsets.py - onset / 무음 검출 → Trim 스냅 후보
+# ============================================
+"""
+녹음이 끝난 직후(AudioRecorder.stop) 한 번 돌려 Trim 핸들이 스냅할 후보 시점을 만든다.
+
+- onset: features.onset_frames (로그 spectral flux 피크 + 에너지 상승) — 트랜지언트
+  직전에 자르도록 프레임 시작 시각을 사용
+- 무음: 프레임 RMS가 (최대 - SILENCE_DB) 또는 SILENCE_FLOOR_DB 아래인 구간이
+  MIN_SILENCE_SEC 이상이면 그 경계 (소리 시작 / 소리 끝)
+- 결과: 0과 샘플 길이를 포함한 정렬된 float64 배열 (초)
+  → snap()이 np.searchsorted(이진 탐색)로 다음/이전 후보를 찾는다
+"""
+
+import numpy as np
+from audio.features import stft_mag, onset_frames
+from config import SAMPLE_RATE
+
+FRAME = 1024
+HOP = 256
+SILENCE_DB = 40.0          # 최대 레벨 대비 이만큼 낮으면 무음
+SILENCE_FLOOR_DB = -55.0   # 절대 무음 기준 (dBFS)
+MIN_SILENCE_SEC = 0.15
+MERGE_SEC = 0.03           # 이보다 가까운 후보는 하나로
+
+
+def _silence_edges(frame_rms, sample_rate):
+    db = 20.0 * np.log10(np.maximum(frame_rms, 1e-6))
+    thr = max(db.max() - SILENCE_DB, SILENCE_FLOOR_DB)
+    silent = db < thr
+    if silent.all() or not silent.any():
+        return np.zeros(0)
+    # 구간 경계: 0/1 변화 지점 (앞뒤를 소리로 패딩해 양 끝 무음도 구간이 되게)
+    change = np.flatnonzero(np.diff(np.concatenate([[0], silent.astype(np.int8), [0]])))
+    starts, ends = change[0::2], change[1::2]               # 무음 [start, end) 프레임
+    long_enough = (ends - starts) * HOP / float(sample_rate) >= MIN_SILENCE_SEC
+    starts, ends = starts[long_enough], ends[long_enough]
+    # 소리 끝 = 무음 프레임이 시작된 곳 (+1 hop 여유), 소리 시작 = 첫 소리 프레임 시작 (약간 일찍)
+    # (파일 맨 앞 무음의 시작 / 맨 끝 무음의 끝은 경계가 아님)
+    sound_end = (starts[starts > 0] + 1) * HOP / float(sample_rate)
+    sound_start = ends[ends < len(silent)] * HOP / float(sample_rate)
+    return np.concatenate([sound_end, sound_start])
+
+
+def trim_candidates(data, sample_rate):
+    """→ 정렬된 후보 시점 배열 (초, 0과 길이 포함)"""
+    mono = np.asarray(data, dtype=np.float32)
+    if mono.ndim > 1:
+        mono = mono.mean(axis=1)
+    duration = len(mono) / float(sample_rate)
+    if len(mono) < FRAME:
+        return np.array([0.0, duration])
+    mag, frames = stft_mag(mono, FRAME, HOP)
+    frame_rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    onsets = onset_frames(mag, frame_rms) * HOP / float(sample_rate)
+    points = np.concatenate([[0.0, duration], onsets, _silence_edges(frame_rms, sample_rate)])
+    points = np.unique(np.clip(points, 0.0, duration))
+    if len(points) > 2:
+        # 너무 가까운 후보 병합 (앞쪽 유지, 양 끝은 항상 유지)
+        keep = np.concatenate([[True], np.diff(points) >= MERGE_SEC])
+        keep[-1] = True
+        points = points[keep]
+    return points
+
+
+def snap(points, current, direction):
+    """current에서 direction(+1/-1) 쪽으로 가장 가까운 후보 (없으면 current)"""
+    if points is None or not len(points):
+        return current
+    eps = 1e-6
+    if direction > 0:
+        i = int(np.searchsorted(points, current + eps, side="left"))
+        return float(points[i]) if i < len(points) else current
+    i = int(np.searchsorted(points, current - eps, side="right")) - 1
+    return float(points[i]) if i >= 0 else current
+
+
+def for_sample(sample):
+    """sample dict에 캐시된 후보 (없으면 계산해 캐시 — 샘플당 한 번)"""
+    if not isinstance(sample, dict):
+        return None
+    points = sample.get("trim_points")
+    if points is None and sample.get("data") is not None:
+        points = sample["trim_points"] = trim_candidates(sample["data"], sample.get("sample_rate", SAMPLE_RATE))
+    return points
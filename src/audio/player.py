@@ -0,0 +1,160 @@
+# ============================================
+# audio/player.py - 믹서 출력 장치
+# ============================================
+"""
+Mixer를 실제 장치(또는 가짜 장치)에 연결한다.
+
+- SoundDeviceOutput: sounddevice 콜백 스트림 (있으면 우선)
+- PygameOutput: pygame.mixer 채널에 블록을 큐잉하는 펌프 스레드
+- NullOutput: 소리 없이 콜백만 돌림 (pump(frames)로 수동 구동 가능)
+  · "manual": 스레드 없이 호출자가 pump() — 헤드리스 런타임이 프레임에 맞춰 구동
+- WavFileOutput: 콜백 결과를 WAV 파일로 기록 (테스트/오프라인 확인용)
+"""
+
+import time
+import wave
+import threading
+from config import AUDIO_OUTPUT
+
+
+class NullOutput:
+    """장치 없이 믹서를 구동. realtime=True면 실시간 속도로 스레드에서 펌프"""
+
+    def __init__(self, mixer, realtime=False):
+        self.mixer = mixer
+        self.realtime = realtime
+        self.frames_rendered = 0
+        self._running = False
+        self._thread = None
+        if realtime:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def pump(self, frames):
+        """frames 만큼 블록 단위로 콜백 실행"""
+        left = int(frames)
+        while left > 0:
+            n = min(left, self.mixer.block_size)
+            self._consume(self.mixer.render(n))
+            self.frames_rendered += n
+            left -= n
+
+    def _consume(self, block):
+        return
+
+    def _run(self):
+        period = self.mixer.block_size / float(self.mixer.sample_rate)
+        next_t = time.perf_counter()
+        while self._running:
+            self.pump(self.mixer.block_size)
+            next_t += period
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def close(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+class WavFileOutput(NullOutput):
+    """렌더링된 블록을 16bit WAV로 기록"""
+
+    def __init__(self, mixer, path, realtime=False):
+        self._wf = wave.open(path, "wb")
+        self._wf.setnchannels(mixer.channels)
+        self._wf.setsampwidth(2)
+        self._wf.setframerate(mixer.sample_rate)
+        self.path = path
+        super().__init__(mixer, realtime=realtime)
+
+    def _consume(self, block):
+        self._wf.writeframes(block.tobytes())
+
+    def close(self):
+        super().close()
+        if self._wf is not None:
+            self._wf.close()
+            self._wf = None
+
+
+class SoundDeviceOutput:
+    def __init__(self, mixer):
+        import sounddevice as sd
+        self.mixer = mixer
+        self._stream = sd.OutputStream(samplerate=mixer.sample_rate, channels=mixer.channels,
+                                       dtype="int16", blocksize=mixer.block_size,
+                                       callback=mixer.callback)
+        self._stream.start()
+
+    def close(self):
+        self._stream.stop()
+        self._stream.close()
+
+
+class PygameOutput:
+    """pygame.mixer에는 콜백이 없으므로, 전용 채널의 큐가 비면 다음 청크를 렌더해 넣는다"""
+
+    CHUNK_BLOCKS = 4   # 한 번에 큐잉하는 블록 수(지연 vs 끊김 안전 마진)
+
+    def __init__(self, mixer):
+        import pygame
+        import numpy as np
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=mixer.sample_rate, channels=mixer.channels,
+                              size=-16, buffer=mixer.block_size)
+        self._pg = pygame
+        self.mixer = mixer
+        self.channel = pygame.mixer.Channel(pygame.mixer.get_num_channels() - 1)
+        frames = mixer.block_size * self.CHUNK_BLOCKS
+        # 청크 버퍼 두 개를 번갈아 사용 (Sound가 참조 중인 버퍼를 덮어쓰지 않도록)
+        self._chunks = [np.zeros((frames, mixer.channels), dtype=np.int16) for _ in range(2)]
+        self._which = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _next_sound(self):
+        chunk = self._chunks[self._which]
+        self._which ^= 1
+        self.mixer.render_into(chunk)
+        return self._pg.mixer.Sound(buffer=chunk)
+
+    def _run(self):
+        period = self.mixer.block_size / float(self.mixer.sample_rate)
+        self.channel.play(self._next_sound())
+        while self._running:
+            if self.channel.get_queue() is None:
+                self.channel.queue(self._next_sound())
+            time.sleep(period)
+
+    def close(self):
+        self._running = False
+        self._thread.join(timeout=1.0)
+        self.channel.stop()
+
+
+def open_output(mixer, kind=None):
+    """config.AUDIO_OUTPUT에 따라 출력 장치 열기 (auto: sounddevice → pygame → null)"""
+    kind = kind or AUDIO_OUTPUT
+    if kind.startswith("wav:"):
+        return WavFileOutput(mixer, kind[4:], realtime=True)
+    if kind == "null":
+        return NullOutput(mixer, realtime=True)
+    if kind == "manual":
+        return NullOutput(mixer, realtime=False)
+    if kind in ("auto", "sounddevice"):
+        try:
+            return SoundDeviceOutput(mixer)
+        except Exception as e:
+            if kind == "sounddevice":
+                print(f"[Player] sounddevice unavailable — null output ({e})")
+                return NullOutput(mixer, realtime=True)
+    try:
+        return PygameOutput(mixer)
+    except Exception as e:
+        print(f"[Player] pygame mixer unavailable — null output ({e})")
+        return NullOutput(mixer, realtime=True)
@@ -0,0 +1,189 @@
+# ============================================
+# audio/prefetch.py - Library 팩 오디오 백그라운드 프리패치
+# ============================================
+"""
+SD카드에서 팩 WAV 전체를 P-DC 순간에 읽으면 수백 ms 멈춘다.
+
+- AudioPrefetcher: 워커 스레드가 선택 팩 + 이웃 팩의 앞부분(PREFETCH_HEAD_SEC)을
+  미리 읽어 용량 제한(PREFETCH_CACHE_MB) LRU에 보관
+- PackStream: 캐시된 앞부분으로 즉시 재생을 시작하고, 나머지는 별도 스레드가
+  청크 단위로 이어 읽어 붙인다 (믹서 source — 콜백은 청크 복사만)
+"""
+
+import threading
+from collections import OrderedDict
+import numpy as np
+from config import PREFETCH_HEAD_SEC, PREFETCH_CACHE_MB
+from utils.audio_codec import audio_info, read_frames
+
+STREAM_CHUNK_SEC = 1.0
+
+
+class PrefetchEntry:
+    def __init__(self, path, head, total_frames, sample_rate):
+        self.path = path
+        self.head = head                  # float32 mono, 앞부분
+        self.total_frames = total_frames
+        self.sample_rate = sample_rate
+
+    @property
+    def nbytes(self):
+        return self.head.nbytes
+
+
+class AudioPrefetcher:
+    def __init__(self, head_sec=PREFETCH_HEAD_SEC, cache_mb=PREFETCH_CACHE_MB):
+        self.head_sec = float(head_sec)
+        self.max_bytes = int(cache_mb * 1024 * 1024)
+        self._cache = OrderedDict()       # path → PrefetchEntry
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._wanted = []                 # 우선순위 순 경로 (최신 요청이 이전 요청을 대체)
+        self._wake = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # ---------- UI 스레드 ----------
+    def request(self, paths):
+        """paths: 우선순위 순 (선택 팩 먼저, 그다음 이웃)"""
+        with self._lock:
+            self._wanted = [p for p in paths if p and p not in self._cache]
+        if self._wanted:
+            self._wake.set()
+
+    def get(self, path):
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is not None:
+                self._cache.move_to_end(path)
+            return entry
+
+    def load_now(self, path):
+        """캐시 미스 시 동기 로드(앞부분만) — 그래도 전체 로드보다 훨씬 짧다"""
+        entry = self.get(path)
+        if entry is None:
+            entry = self._load(path)
+            self._store(entry)
+        return entry
+
+    def close(self):
+        self._running = False
+        self._wake.set()
+        self._thread.join(timeout=1.0)
+        with self._lock:
+            self._cache.clear()
+            self._wanted = []
+            self._bytes = 0
+
+    # ---------- 워커 ----------
+    def _load(self, path):
+        frames, sr, _ = audio_info(path)
+        head = read_frames(path, 0, int(self.head_sec * sr))
+        return PrefetchEntry(path, head, frames, sr)
+
+    def _store(self, entry):
+        with self._lock:
+            old = self._cache.pop(entry.path, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._cache[entry.path] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes and len(self._cache) > 1:
+                _, ev = self._cache.popitem(last=False)
+                self._bytes -= ev.nbytes
+
+    def _run(self):
+        while self._running:
+            self._wake.wait()
+            self._wake.clear()
+            while self._running:
+                with self._lock:
+                    path = None
+                    while self._wanted:
+                        p = self._wanted.pop(0)
+                        if p not in self._cache:
+                            path = p
+                            break
+                if path is None:
+                    break
+                try:
+                    self._store(self._load(path))
+                except (OSError, ValueError, EOFError) as e:
+                    print(f"[Prefetch] {path}: {e}")
+
+
+class PackStream:
+    """
+    앞부분(entry.head)으로 즉시 재생을 시작하고 나머지는 로더 스레드가 이어 붙이는 스트림.
+    믹서 source로 등록되며, 데이터가 아직 안 왔으면 그 블록은 무음(starved 카운트).
+    """
+
+    def __init__(self, mixer, entry, gain=1.0):
+        self.mixer = mixer
+        self.entry = entry
+        self.gain = float(gain)
+        self._chunks = [entry.head]       # 콜백은 읽기만, 로더는 append만
+        self._ci = 0                      # 현재 청크
+        self._pos = 0                     # 청크 안 위치
+        self._loaded = len(entry.head)
+        self.done = False
+        self.starved = 0
+        self._running = True
+        self._loader = None
+        if self._loaded < entry.total_frames:
+            self._loader = threading.Thread(target=self._load_rest, daemon=True)
+            self._loader.start()
+
+    def start(self):
+        self.mixer.add_source(self._on_block)
+        return self
+
+    def stop(self):
+        self._running = False
+        self.mixer.remove_source(self._on_block)
+        self.done = True
+
+    def _load_rest(self):
+        e = self.entry
+        step = int(STREAM_CHUNK_SEC * e.sample_rate)
+        while self._running and self._loaded < e.total_frames:
+            try:
+                chunk = read_frames(e.path, self._loaded, step)
+            except (OSError, ValueError, EOFError) as err:
+                print(f"[PackStream] {e.path}: {err}")
+                break
+            if len(chunk) == 0:
+                break
+            self._chunks.append(chunk)
+            self._loaded += len(chunk)
+
+    # ---------- 오디오 스레드 ----------
+    def _on_block(self, mix, n):
+        if self.done:
+            return
+        done = 0
+        while done < n:
+            chunks = self._chunks
+            if self._ci >= len(chunks):
+                if self._loader is not None and self._loader.is_alive():
+                    self.starved += 1
+                    return
+                # 로더가 마지막 청크를 붙이고 막 끝났을 수 있음 — 죽은 걸 본 뒤 다시 확인
+                if self._ci >= len(self._chunks):
+                    self.done = True       # 끝 — UI가 stop()으로 정리
+                    return
+                continue
+            buf = chunks[self._ci]
+            c = min(len(buf) - self._pos, n - done)
+            if c > 0:
+                dst = mix[done:done + c]
+                if self.gain == 1.0:
+                    np.add(dst, buf[self._pos:self._pos + c], out=dst)
+                else:
+                    dst += buf[self._pos:self._pos + c] * self.gain
+                self._pos += c
+                done += c
+            if self._pos >= len(buf):
+                self._ci += 1
+                self._pos = 0
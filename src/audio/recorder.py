@@ -3,50 +3,126 @@
 # ============================================
 """오디오 녹음 및 재생"""
 
+import threading
 import pygame
 import numpy as np
 import wave
 import io
-from config import SAMPLE_RATE, CHANNELS
+from config import SAMPLE_RATE, CHANNELS, BUFFER_SIZE
+from audio.waveform import PeakPyramid
+from audio import onsets
+from audio.mixer import get_mixer
+from utils.file_manager import new_sample_path, save_wav
+from utils import clock
 
 class AudioRecorder:
     def __init__(self):
-        pygame.mixer.init(frequency=SAMPLE_RATE, channels=CHANNELS)
+        # 출력 장치(pygame.mixer 등)는 첫 재생 때 get_mixer()가 연다
         self.recording = False
-        self.recorded_data = []
+        self.recorded_data = []      # 캡처 블록(float32, mono) 목록
         self.sample_rate = SAMPLE_RATE
-    
+        self._polled = 0             # poll_blocks()가 이미 넘겨준 블록 수
+        self._lock = threading.Lock()
+        self._stream = None
+        self._started_at = 0.0
+        self._dummy_frames = 0       # 더미 입력: 지금까지 생성한 프레임 수
+
     def start(self):
         """녹음 시작"""
         self.recording = True
         self.recorded_data = []
-        # TODO: 실제 마이크 입력 구현
-        # 현재는 더미 데이터 생성
+        self._polled = 0
+        self._dummy_frames = 0
+        self._started_at = clock.now()
+        self._stream = self._open_input_stream()
         print("Recording started...")
-    
+
+    def _open_input_stream(self):
+        """sounddevice가 있으면 실제 마이크 입력, 없으면 더미(사인파) 입력"""
+        try:
+            import sounddevice as sd
+        except ImportError:
+            return None
+        try:
+            stream = sd.InputStream(samplerate=self.sample_rate, channels=1, dtype="float32",
+                                    blocksize=BUFFER_SIZE, callback=self._on_input_block)
+            stream.start()
+            return stream
+        except Exception as e:
+            print(f"[AudioRecorder] input device unavailable — dummy input ({e})")
+            return None
+
+    def _on_input_block(self, indata, frames, time_info, status):
+        # 오디오 스레드: 블록 복사만 하고 바로 리턴
+        block = indata[:, 0].copy()
+        with self._lock:
+            self.recorded_data.append(block)
+
+    def _pump_dummy_input(self):
+        """더미 입력: 경과 시간만큼 A4 사인파 블록을 생성"""
+        target = int((clock.now() - self._started_at) * self.sample_rate)
+        frequency = 440  # A4
+        while self._dummy_frames + BUFFER_SIZE <= target:
+            n0 = self._dummy_frames
+            t = (np.arange(n0, n0 + BUFFER_SIZE, dtype=np.float64)) / self.sample_rate
+            block = (np.sin(2 * np.pi * frequency * t) * 0.3).astype(np.float32)
+            self.recorded_data.append(block)
+            self._dummy_frames += BUFFER_SIZE
+
+    def poll_blocks(self):
+        """지난 호출 이후 새로 캡처된 블록들(전체 버퍼는 건드리지 않음)"""
+        if not self.recording:
+            return []
+        if self._stream is None:
+            self._pump_dummy_input()
+        with self._lock:
+            new = self.recorded_data[self._polled:]
+            self._polled = len(self.recorded_data)
+        return new
+
     def stop(self):
         """녹음 중지 및 샘플 반환"""
+        if self._stream is None:
+            self._pump_dummy_input()
+        else:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
         self.recording = False
         print("Recording stopped")
+
+        with self._lock:
+            blocks = list(self.recorded_data)
+        if blocks:
+            sample = np.concatenate(blocks)
+        else:
+            sample = np.zeros(0, dtype=np.float32)
+        duration = len(sample) / float(self.sample_rate)
         
-        # TODO: 실제 오디오 데이터 반환
-        # 더미 샘플 생성
-        duration = 2.0  # 2초
-        t = np.linspace(0, duration, int(SAMPLE_RATE * duration))
-        frequency = 440  # A4
-        sample = np.sin(2 * np.pi * frequency * t) * 0.3
-        
-        return {
+        result = {
             "data": sample,
             "sample_rate": self.sample_rate,
             "duration": duration
         }
+        # 테이크를 data/samples/에 저장하고 피크 피라미드를 옆에 캐시
+        try:
+            result["path"] = save_wav(new_sample_path(), sample, self.sample_rate)
+        except OSError as e:
+            print(f"[AudioRecorder] could not save take: {e}")
+        PeakPyramid.for_sample(result)
+        # Trim 스냅 후보 (onset/무음 경계) — 테이크당 한 번
+        onsets.for_sample(result)
+        return result
     
     def play(self, sample):
-        """샘플 재생"""
-        # TODO: 실제 재생 구현
-        print(f"Playing sample with duration: {sample.get('duration', 0)}s")
+        """샘플 재생 (공유 믹서)"""
+        mixer = get_mixer()
+        mixer.stop_tag("sample")
+        return mixer.play(sample["data"], tag="sample")
+    
+    def is_playing(self):
+        return get_mixer().is_playing("sample")
     
     def stop_playback(self):
         """재생 중지"""
-        pygame.mixer.stop()
\ No newline at end of file
+        get_mixer().stop_tag("sample")
\ No newline at end of file
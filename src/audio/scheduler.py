@@ -0,0 +1,154 @@
+# ============================================
+# audio/scheduler.py - 룩어헤드 bar 프리렌더 스케줄러
+# ============================================
+"""
+bar N이 재생되는 동안 워커 스레드가 grid에서 bar N+1을 미리 렌더.
+
+- 더블 버퍼: _cur(재생 중 bar) / _next(준비된 다음 bar)
+  슬롯은 (buffer, bar, bpm) 튜플이며 매번 새로 만들어 참조만 교체 → 락 없음
+  (콜백은 참조를 읽고 바꾸기만 하므로 렌더 중인 버퍼를 절대 보지 않는다)
+- 룩어헤드: 현재 bar 끝까지 lookahead_blocks × BUFFER_SIZE 프레임 남았을 때 렌더 시작
+  · 크게: 언더런에 안전 / 작게: 편집이 더 빨리 들림
+- 콜백이 bar 끝에서 _next를 못 받으면 언더런 카운트 후 무음, 다음 블록에서 재시도
+"""
+
+import threading
+import numpy as np
+from config import BUFFER_SIZE, LOOKAHEAD_BLOCKS
+from audio.transport import Transport
+
+
+class BarScheduler:
+    def __init__(self, mixer, render_fn, bpm, bars, lookahead_blocks=LOOKAHEAD_BLOCKS):
+        """render_fn(bar_index, bpm) → float32 mono 버퍼 (워커 스레드에서 호출)"""
+        self.mixer = mixer
+        self.render_fn = render_fn
+        self.lookahead_frames = int(lookahead_blocks) * BUFFER_SIZE
+        # BPM/Bars는 transport가 들고 있음 — 다음에 렌더하는 bar부터 반영
+        self.transport = Transport(bpm=bpm, bars=bars, sample_rate=mixer.sample_rate)
+
+        self._cur = None      # (buffer, bar, bpm)
+        self._next = None
+        self._pos = 0         # _cur 안의 재생 위치
+        self._dirty = False   # 준비된 _next를 다시 렌더해야 함(편집/BPM 변경)
+
+        # 통계
+        self.underruns = 0    # 다음 bar가 없어 무음이 나간 블록 수
+        self.late_renders = 0 # 룩어헤드 여유보다 늦게 끝난 렌더 수
+        self.rendered = 0
+
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+
+    # ---------- UI 스레드 ----------
+    @property
+    def running(self):
+        return self._running
+
+    def start(self, bar=0):
+        self.stop()
+        self.transport.start(bar)
+        self._cur = self._render(self.transport.bar)     # 첫 bar는 동기 렌더
+        self._next = None
+        self._pos = 0
+        self.transport.begin_bar(self._cur[1], self._cur[2])
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+        self.mixer.add_source(self._on_block)
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self.mixer.remove_source(self._on_block)
+        self.transport.stop()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._cur = self._next = None
+
+    def set_bpm(self, bpm):
+        if float(bpm) != self.transport.bpm:
+            self.transport.set_bpm(bpm)
+            self.invalidate()
+
+    def set_bars(self, bars):
+        if int(bars) != self.transport.bars:
+            self.transport.set_bars(bars)
+            self.invalidate()
+
+    def invalidate(self):
+        """grid/BPM 변경: 아직 재생 전인 다음 bar를 다시 렌더"""
+        self._dirty = True
+        self._wake.set()
+
+    def playhead(self):
+        return self.transport.playhead()
+
+    def stats(self):
+        return {"underruns": self.underruns, "late": self.late_renders, "rendered": self.rendered}
+
+    # ---------- 워커 스레드 ----------
+    def _render(self, bar):
+        bpm = self.transport.bpm
+        buf = np.ascontiguousarray(self.render_fn(bar, bpm), dtype=np.float32)
+        self.rendered += 1
+        return (buf, bar, bpm)
+
+    def _worker(self):
+        sr = float(self.mixer.sample_rate)
+        while self._running:
+            cur = self._cur
+            if cur is None:
+                break
+            remaining = len(cur[0]) - self._pos
+            if self._next is not None and not self._dirty:
+                # 준비 완료 — 콜백이 넘겨받을 때까지 대기
+                self._wake.wait(timeout=max(0.005, remaining / sr))
+                self._wake.clear()
+                continue
+            if self._next is None and remaining > self.lookahead_frames:
+                # 아직 이르다: 룩어헤드 지점까지 잠
+                self._wake.wait(timeout=(remaining - self.lookahead_frames) / sr)
+                self._wake.clear()
+                continue
+
+            self._dirty = False
+            nxt_bar = self.transport.next_bar(cur[1])
+            slot = self._render(nxt_bar)
+            if self._cur is cur:
+                self._next = slot   # 참조 교체 = 발행
+                if len(cur[0]) - self._pos < BUFFER_SIZE:
+                    self.late_renders += 1
+            # 그 사이 콜백이 bar를 넘겼으면 버리고 다음 루프에서 다시 계산
+
+    # ---------- 오디오 스레드 (mixer source) ----------
+    def _on_block(self, mix, n):
+        done = 0
+        while done < n:
+            cur = self._cur
+            if cur is None:
+                return
+            buf = cur[0]
+            c = min(len(buf) - self._pos, n - done)
+            if c > 0:
+                dst = mix[done:done + c]
+                np.add(dst, buf[self._pos:self._pos + c], out=dst)
+                self._pos += c
+                done += c
+                self.transport.advance(c)
+            if self._pos >= len(buf):
+                nxt = self._next
+                if nxt is None:
+                    # 언더런: 이번 블록 나머지는 무음, 다음 블록에서 다시 시도
+                    self.underruns += 1
+                    self._wake.set()
+                    return
+                self._cur = nxt
+                self._next = None
+                self._pos = 0
+                self.transport.begin_bar(nxt[1], nxt[2])
+                self._wake.set()
@@ -0,0 +1,113 @@
+# ============================================
+# audio/stream.py - Sound Crafting 스트리밍 프리뷰
+# ============================================
+"""
+Sound Crafting 체인(confirm 값 또는 조정 중인 값)을 오디오 블록마다 적용해 바로 들려주는 믹서 source.
+
+- trim/reverse: 원본 버퍼의 slice view (복사 없음)
+- speed: stretch.SpeedStream — 출력 전체를 만들지 않고 read(n)만큼 생성
+- low/high pass: biquad.BiquadFilter — 상태를 블록 사이에 이어 가고, 컷오프가
+  바뀌면 램프 (재생을 끊지 않음)
+- 워커 렌더(dsp.craft)를 기다리지 않는다 — update()로 넘긴 값이 다음 오디오 블록부터
+  들리므로, 씬은 confirm 전 R-R 값도 디텐트마다 바로 들려줄 수 있다
+"""
+
+import numpy as np
+from audio.stretch import SpeedStream
+from audio.biquad import BiquadFilter
+
+FILTER_KINDS = ("lowpass", "highpass")     # dsp.craft와 같은 순서
+
+
+def source_view(data, sample_rate, params):
+    """trim → reverse 까지 적용한 view"""
+    data = np.asarray(data, dtype=np.float32)
+    if params.get("trim") is not None:
+        b, e = params["trim"]
+        a = max(0, int(round(b * sample_rate)))
+        data = data[a:max(a, min(len(data), int(round(e * sample_rate))))]
+    if params.get("reverse"):
+        data = data[::-1]
+    return data
+
+
+def build_stream(data, sample_rate, params):
+    return SpeedStream(source_view(data, sample_rate, params),
+                       params.get("speed", 1.0), params.get("keep_pitch", False))
+
+
+def _layout(params):
+    """이 값이 바뀌면 스트림을 새로 만들어야 함 (나머지는 재생 중 반영)"""
+    return params.get("trim"), bool(params.get("reverse")), bool(params.get("keep_pitch"))
+
+
+class CraftPreview:
+    """믹서 source로 등록되는 루프 프리뷰 (끝나면 처음부터 다시)"""
+
+    def __init__(self, mixer, data, sample_rate, params, gain=1.0, loop=True):
+        self.mixer = mixer
+        self.data = data
+        self.sample_rate = int(sample_rate)
+        self.gain = float(gain)
+        self.loop = loop
+        self.done = False
+        self._layout = _layout(params)
+        # 오디오 스레드는 (스트림, 필터들) 튜플 하나만 읽는다 — 교체는 한 번에
+        self._chain = (build_stream(data, sample_rate, params), self._make_filters(params, {}))
+
+    def _make_filters(self, params, current):
+        filters = []
+        for kind in FILTER_KINDS:
+            cutoff = params.get(kind)
+            if not cutoff:
+                continue
+            f = current.get(kind)
+            if f is None:
+                f = BiquadFilter(kind, cutoff, self.sample_rate)
+            else:
+                f.set_cutoff(cutoff)          # 재생 중 스윕 → 램프
+            filters.append(f)
+        return filters
+
+    def update(self, params, seek=None):
+        """
+        파라미터 변경 반영. 배율/컷오프는 재생 위치를 유지한 채 다음 블록부터,
+        trim/reverse/keep_pitch가 바뀌면 스트림을 처음부터 다시 만든다.
+        seek: 트림된 view 기준 프레임 (음수면 끝에서부터) — 새 위치에서 재생
+        """
+        stream, filters = self._chain
+        current = {f.kind: f for f in filters}
+        layout = _layout(params)
+        if layout != self._layout:
+            self._layout = layout
+            stream = build_stream(self.data, self.sample_rate, params)
+        else:
+            stream.set_factor(params.get("speed", 1.0))
+        if seek is not None:
+            stream.seek(seek if seek >= 0 else stream.length + seek)
+        self._chain = (stream, self._make_filters(params, current))
+
+    def start(self):
+        self.mixer.add_source(self._on_block)
+        return self
+
+    def stop(self):
+        self.mixer.remove_source(self._on_block)
+        self.done = True
+
+    # ---------- 오디오 스레드 ----------
+    def _on_block(self, mix, n):
+        stream, filters = self._chain
+        if self.done or stream.length < 2:
+            return
+        if stream.done:
+            if not self.loop:
+                self.done = True
+                return
+            stream.reset()
+        block = stream.read(n)
+        for f in filters:
+            block = f.process(block)
+        if self.gain != 1.0:
+            block *= self.gain
+        np.add(mix, block, out=mix)
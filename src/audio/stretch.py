@@ -0,0 +1,211 @@
+# ============================================
+# audio/stretch.py - 스트리밍 속도 변경 (Speed 툴 x0.01 ~ x50)
+# ============================================
+"""
+출력을 블록 단위로 만들어내는 속도 변경 스트림.
+
+- 피치 따라감(기본): 폴리페이즈 windowed-sinc 리샘플러
+  · 위상 PHASES개 × 탭 테이블을 배율마다 한 번 계산 (배율 > 1이면 컷오프를 1/배율로 낮춰 앨리어싱 방지)
+  · 블록마다 (n × 탭) 인덱스 행렬로 한 번에 곱합 → 파이썬 루프 없음
+- 피치 유지(keep_pitch): WSOLA
+  · 프레임 N, 출력 홉 N/2 (Hann 50% 겹침 합 = 1), 입력 홉 = N/2 × 배율
+  · 다음 프레임 위치는 ±TOL 안에서 직전 프레임의 자연스러운 연속과 상관이 최대인 곳
+- 어느 쪽이든 메모리는 입력 + 블록 크기 — x0.01(100배 길어짐)도 출력 전체를 만들지 않고
+  read(n)으로 필요한 만큼만 만든다 (프리뷰는 첫 블록부터 바로 재생)
+"""
+
+import math
+import numpy as np
+
+MAX_HALF_TAPS = 128     # 배율이 커도 커널 반폭 상한 (블록당 연산량 제한)
+
+
+class PolyphaseResampler:
+    ZERO_CROSSINGS = 8
+    PHASES = 128
+
+    def __init__(self, data, factor=1.0):
+        data = np.asarray(data, dtype=np.float32)
+        self.length = len(data)
+        pad = np.zeros(MAX_HALF_TAPS + 1, dtype=np.float32)
+        self._src = np.concatenate([pad, data, pad])
+        self._off = len(pad)
+        self.pos = 0.0              # 입력 기준 위치 (소수)
+        self._tables = {}           # 배율 → (오프셋 k, 테이블)
+        self.set_factor(factor)
+
+    def set_factor(self, factor):
+        self.factor = float(factor)
+        key = round(self.factor, 4)
+        cached = self._tables.get(key)
+        if cached is None:
+            cached = self._tables[key] = self._build_table(self.factor)
+            if len(self._tables) > 32:
+                self._tables.pop(next(iter(self._tables)))
+        self._kernel = cached          # (k, 테이블) 한 번에 교체 — 오디오 스레드가 읽는 중이어도 안전
+
+    def _build_table(self, factor):
+        fc = min(1.0, 1.0 / factor)                     # 정규화 컷오프 (다운샘플이면 낮춤)
+        half = min(MAX_HALF_TAPS, int(math.ceil(self.ZERO_CROSSINGS / fc)))
+        k = np.arange(-half + 1, half + 1)
+        phi = np.arange(self.PHASES) / float(self.PHASES)
+        t = k[None, :] - phi[:, None]                    # 출력 위치 기준 탭 거리
+        x = np.clip(t / half, -1.0, 1.0)                 # Blackman 창 (연속형)
+        win = 0.42 + 0.5 * np.cos(np.pi * x) + 0.08 * np.cos(2 * np.pi * x)
+        h = fc * np.sinc(fc * t) * win
+        h /= h.sum(axis=1, keepdims=True)                 # DC 이득 1
+        return k, h.astype(np.float32)
+
+    @property
+    def done(self):
+        return self.pos >= self.length
+
+    def reset(self):
+        self.pos = 0.0
+
+    def read(self, n):
+        out = np.zeros(n, dtype=np.float32)
+        if self.done:
+            return out
+        p = self.pos + np.arange(n, dtype=np.float64) * self.factor
+        valid = int(np.searchsorted(p, self.length))      # 입력 끝 이후는 무음
+        if valid:
+            p = p[:valid]
+            base = np.floor(p)
+            k, table = self._kernel
+            phase = np.minimum(((p - base) * self.PHASES).astype(np.intp), self.PHASES - 1)
+            idx = base.astype(np.intp)[:, None] + k[None, :] + self._off
+            out[:valid] = np.einsum("ij,ij->i", self._src[idx], table[phase])
+        self.pos = p[-1] + self.factor if valid == n else self.pos + n * self.factor
+        return out
+
+
+class Wsola:
+    FRAME = 1024
+    TOLERANCE = 256
+
+    def __init__(self, data, factor=1.0):
+        data = np.asarray(data, dtype=np.float32)
+        self.length = len(data)
+        n, tol = self.FRAME, self.TOLERANCE
+        self.hop = n // 2
+        self._pad = n + tol
+        pad = np.zeros(self._pad, dtype=np.float32)
+        self._src = np.concatenate([pad, data, pad])
+        self._win = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n) / n)).astype(np.float32)   # periodic Hann
+        self.factor = float(factor)
+        self.reset()
+
+    def set_factor(self, factor):
+        self.factor = float(factor)
+
+    def reset(self):
+        self.pos = 0.0              # 공칭 분석 위치 (입력 기준)
+        self._natural = None        # 직전 프레임의 자연스러운 연속 시작
+        self._ola = np.zeros(self.FRAME, dtype=np.float32)
+        self._ready = np.zeros(0, dtype=np.float32)
+
+    @property
+    def done(self):
+        return self.pos >= self.length + self.FRAME and not len(self._ready)
+
+    def _next_frame(self):
+        n, tol, hop = self.FRAME, self.TOLERANCE, self.hop
+        nominal = int(round(self.pos)) + self._pad
+        nominal = min(max(nominal, tol), len(self._src) - n - tol)
+        if self._natural is None:
+            start = nominal
+        else:
+            # 겹치는 구간(hop)만으로 상관 계산 — 자연 연속과 가장 닮은 위치
+            template = self._src[self._natural:self._natural + hop]
+            region = self._src[nominal - tol:nominal + tol + hop]
+            corr = np.correlate(region, template, mode="valid")
+            start = nominal - tol + int(np.argmax(corr))
+        frame = self._src[start:start + n] * self._win
+        self._ola += frame
+        emitted = self._ola[:hop].copy()
+        self._ola[:-hop] = self._ola[hop:]
+        self._ola[-hop:] = 0.0
+        self._natural = start + hop
+        self.pos += hop * self.factor
+        return emitted
+
+    def read(self, n):
+        chunks, have = [self._ready], len(self._ready)
+        while have < n and self.pos < self.length + self.FRAME:
+            c = self._next_frame()
+            chunks.append(c)
+            have += len(c)
+        buf = np.concatenate(chunks) if len(chunks) > 1 else self._ready
+        out = np.zeros(n, dtype=np.float32)
+        m = min(n, len(buf))
+        out[:m] = buf[:m]
+        self._ready = buf[m:]
+        return out
+
+
+class SpeedStream:
+    """
+    속도 변경 스트림. read(n)으로 n 프레임씩 출력.
+    set_factor()로 재생 중에도 배율을 바꿀 수 있다 (다음 블록부터 반영).
+    """
+
+    def __init__(self, data, factor=1.0, keep_pitch=False):
+        self.keep_pitch = bool(keep_pitch)
+        self._engine = (Wsola if self.keep_pitch else PolyphaseResampler)(data, factor)
+
+    @property
+    def factor(self):
+        return self._engine.factor
+
+    @property
+    def position(self):
+        """입력 기준 현재 위치 (프레임)"""
+        return min(self._engine.pos, self._engine.length)
+
+    @property
+    def length(self):
+        return self._engine.length
+
+    @property
+    def done(self):
+        return self._engine.done
+
+    def set_factor(self, factor):
+        self._engine.set_factor(factor)
+
+    def reset(self):
+        self._engine.reset()
+
+    def seek(self, frame):
+        """입력 기준 위치로 이동 (프리뷰에서 트림 핸들 근처부터 듣기)"""
+        self._engine.reset()
+        self._engine.pos = float(max(0, min(self._engine.length, frame)))
+
+    def read(self, n):
+        return self._engine.read(int(n))
+
+
+def stretched_length(n, factor):
+    return max(1, int(math.ceil(n / float(factor))))
+
+
+def change_speed(data, factor, keep_pitch=False, block=8192, max_frames=None):
+    """
+    SpeedStream을 끝까지 돌려 전체 결과를 만든다 (오프라인 렌더).
+    max_frames: 결과 상한 (x0.01 같은 극단 배율에서 쓸모없이 긴 버퍼를 막음)
+    """
+    data = np.asarray(data, dtype=np.float32)
+    if float(factor) == 1.0 or len(data) < 2:
+        return data
+    total = stretched_length(len(data), factor)
+    if max_frames is not None:
+        total = min(total, int(max_frames))
+    stream = SpeedStream(data, factor, keep_pitch)
+    out = np.empty(total, dtype=np.float32)
+    done = 0
+    while done < total:
+        c = min(block, total - done)
+        out[done:done + c] = stream.read(c)
+        done += c
+    return out
@@ -0,0 +1,87 @@
+# ============================================
+# audio/transport.py - 샘플 정확도 트랜스포트/템포 클럭
+# ============================================
+"""
+프레임 인덱스로 진행하는 루프 트랜스포트 (BPM/Bars의 단일 출처).
+
+- 오디오 콜백(BarScheduler)이 advance(frames)로 진행 → 화면 프레임(dt) 흔들림과 무관
+- bar 경계는 스케줄러가 begin_bar(bar, bpm)로 알려줌 — 그 bar가 렌더된 BPM으로 bar_len 갱신
+- set_bpm/set_bars: 다음에 렌더하는 bar부터 쓰이는 값. 재생 중인 bar 길이는 그대로
+- UI는 playhead()로 (bar, tick 소수) 위치를 읽어 그림
+"""
+
+from config import SAMPLE_RATE, DEFAULT_BPM
+
+BEATS_PER_BAR = 4
+TICKS_PER_BAR = 32
+
+
+class Transport:
+    def __init__(self, bpm=DEFAULT_BPM, bars=4, sample_rate=SAMPLE_RATE, ticks_per_bar=TICKS_PER_BAR):
+        self.sample_rate = int(sample_rate)
+        self.ticks_per_bar = int(ticks_per_bar)
+        self.bpm = float(bpm)     # 다음에 렌더할 bar의 BPM
+        self.bars = int(bars)     # 루프 길이 (bar 수)
+        self.running = False
+
+        self.bar = 0              # 현재 bar 인덱스 (0..bars-1)
+        self.bar_pos = 0          # 현재 bar 안에서의 프레임 위치
+        self.bar_len = self._bar_len(self.bpm)   # 현재 bar 길이 (재생 중인 bar의 BPM 기준)
+        self.frame = 0            # 시작 이후 누적 프레임 (디버그/동기화용)
+
+    def _bar_len(self, bpm):
+        return int(round(BEATS_PER_BAR * 60.0 / bpm * self.sample_rate))
+
+    def tick_offset(self, tick):
+        """bar 시작 기준 tick의 프레임 위치"""
+        return (tick * self.bar_len) // self.ticks_per_bar
+
+    @property
+    def tick_frames(self):
+        return self.bar_len / float(self.ticks_per_bar)
+
+    def next_bar(self, bar):
+        """bar 다음에 재생할 bar (현재 Bars 기준으로 감음)"""
+        return (int(bar) + 1) % max(1, self.bars)
+
+    # ---------- UI 스레드 ----------
+    def start(self, bar=0):
+        self.bar = int(bar) % max(1, self.bars)
+        self.bar_pos = 0
+        self.bar_len = self._bar_len(self.bpm)
+        self.frame = 0
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def set_bpm(self, bpm):
+        """재생 중이면 다음 bar부터 (현재 bar는 begin_bar 때 정해진 길이 유지)"""
+        self.bpm = float(bpm)
+        if not self.running:
+            self.bar_len = self._bar_len(self.bpm)
+
+    def set_bars(self, bars):
+        self.bars = max(1, int(bars))
+
+    # ---------- 오디오 스레드 ----------
+    def begin_bar(self, bar, bpm):
+        """스케줄러가 새 bar 버퍼를 재생하기 시작할 때 위치/길이를 맞춤"""
+        self.bar = int(bar)
+        self.bar_len = self._bar_len(bpm)
+        self.bar_pos = 0
+
+    def advance(self, frames):
+        """frames만큼 진행 (bar 경계는 begin_bar가 정하므로 bar_len에서 멈춤)"""
+        if not self.running:
+            return
+        self.bar_pos = min(self.bar_len, self.bar_pos + frames)
+        self.frame += frames
+
+    def playhead(self):
+        """(bar, tick 소수) — 그리기용"""
+        return self.bar, self.bar_pos / self.tick_frames
+
+    def loop_position(self):
+        """루프 전체 기준 0..1 위치 (Bars를 줄여 현재 bar가 범위 밖이면 끝으로)"""
+        return min(1.0, (self.bar + self.bar_pos / float(self.bar_len)) / max(1, self.bars))
@@ -0,0 +1,251 @@
+# ============================================
+# audio/waveform.py - 파형 피크 피라미드 (LOD 캐시)
+# ============================================
+"""
+샘플 하나당 한 번만 계산하는 다해상도 min/max/RMS 피크 피라미드.
+
+- level 0: BASE_BIN 샘플마다 1 bin
+- level k: level k-1 의 bin을 FACTOR개씩 묶음
+- 그릴 때는 "픽셀당 샘플 수"보다 bin이 촘촘한 가장 거친 레벨을 골라
+  화면 폭(width) 만큼만 reduce → O(width)
+- 오디오 파일 옆에 <audio>.peaks.npz 로 저장해 재계산을 피함
+"""
+
+import os
+import numpy as np
+
+BASE_BIN = 64      # level 0 bin 크기(샘플)
+FACTOR = 4         # 레벨 간 축소 배율
+MIN_BINS = 16      # 이보다 작아지면 상위 레벨 생성 중단
+PEAKS_SUFFIX = ".peaks.npz"
+
+
+def _to_mono(data):
+    data = np.asarray(data, dtype=np.float32)
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    return data
+
+
+def _reduce_bins(mins, maxs, sq, factor):
+    """bin 배열을 factor개씩 묶어 다음 레벨 생성 (끝 자투리 bin 포함)"""
+    n = len(mins)
+    starts = np.arange(0, n, factor)
+    counts = np.diff(np.append(starts, n)).astype(np.float32)
+    return (np.minimum.reduceat(mins, starts),
+            np.maximum.reduceat(maxs, starts),
+            np.add.reduceat(sq, starts) / counts)
+
+
+class PeakPyramid:
+    """min/max/mean-square 피라미드. levels[k] = (mins, maxs, meansq)"""
+
+    def __init__(self, levels, n_samples, sample_rate):
+        self.levels = levels
+        self.n_samples = int(n_samples)
+        self.sample_rate = int(sample_rate)
+
+    # ---------- 생성 ----------
+    @classmethod
+    def from_audio(cls, data, sample_rate):
+        mono = _to_mono(data)
+        n = len(mono)
+        pad = (-n) % BASE_BIN
+        if pad:
+            # 마지막 bin은 가장자리 값으로 채워 min/max 왜곡 방지
+            edge = mono[-1] if n else 0.0
+            mono = np.concatenate([mono, np.full(pad, edge, dtype=np.float32)])
+        blocks = mono.reshape(-1, BASE_BIN)
+        levels = [(blocks.min(axis=1), blocks.max(axis=1),
+                   np.einsum("ij,ij->i", blocks, blocks) / BASE_BIN)]
+        while len(levels[-1][0]) > MIN_BINS:
+            levels.append(_reduce_bins(*levels[-1], FACTOR))
+        return cls(levels, n, sample_rate)
+
+    # ---------- 저장/로드 ----------
+    def save(self, path):
+        arrays = {"meta": np.array([self.n_samples, self.sample_rate, BASE_BIN, FACTOR], dtype=np.int64)}
+        for k, (mn, mx, sq) in enumerate(self.levels):
+            arrays[f"min{k}"] = mn.astype(np.float32)
+            arrays[f"max{k}"] = mx.astype(np.float32)
+            arrays[f"sq{k}"] = sq.astype(np.float32)
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as z:
+            n_samples, sr, base_bin, factor = (int(v) for v in z["meta"])
+            if base_bin != BASE_BIN or factor != FACTOR:
+                return None  # 포맷이 바뀌었으면 재계산
+            levels = []
+            k = 0
+            while f"min{k}" in z:
+                levels.append((z[f"min{k}"], z[f"max{k}"], z[f"sq{k}"]))
+                k += 1
+        return cls(levels, n_samples, sr)
+
+    @classmethod
+    def for_sample(cls, sample):
+        """
+        샘플 dict에 캐시된 피라미드를 반환(없으면 생성).
+        sample["path"]가 있으면 옆에 .peaks.npz로 저장/재사용.
+        """
+        if not isinstance(sample, dict):
+            return None
+        cached = sample.get("peaks")
+        if cached is not None:
+            return cached
+        data = sample.get("data")
+        sr = sample.get("sample_rate")
+        path = sample.get("path")
+        pyr = None
+        if path:
+            side = path + PEAKS_SUFFIX
+            if os.path.exists(side):
+                try:
+                    pyr = cls.load(side)
+                except (OSError, ValueError, KeyError):
+                    pyr = None
+                if pyr is not None and data is not None and pyr.n_samples != len(data):
+                    pyr = None  # 오디오가 바뀜
+        if pyr is None:
+            if data is None or sr is None:
+                return None
+            pyr = cls.from_audio(data, sr)
+            if path:
+                try:
+                    pyr.save(path + PEAKS_SUFFIX)
+                except OSError as e:
+                    print(f"[PeakPyramid] could not save peaks: {e}")
+        sample["peaks"] = pyr
+        return pyr
+
+    # ---------- 조회 ----------
+    @property
+    def duration(self):
+        return self.n_samples / float(self.sample_rate) if self.sample_rate else 0.0
+
+    def _bin_size(self, level):
+        return BASE_BIN * (FACTOR ** level)
+
+    def columns(self, start_sec, end_sec, width):
+        """
+        [start_sec, end_sec) 구간을 width 픽셀로 그릴 (mins, maxs, rms) 반환.
+        비용은 O(width) — 선택된 레벨의 bin 수가 width의 FACTOR배 이내.
+        """
+        width = int(width)
+        if width <= 0 or self.n_samples == 0:
+            z = np.zeros(max(0, width), dtype=np.float32)
+            return z, z, z
+        s0 = max(0, int(start_sec * self.sample_rate))
+        s1 = min(self.n_samples, int(end_sec * self.sample_rate))
+        if s1 <= s0:
+            z = np.zeros(width, dtype=np.float32)
+            return z, z, z
+
+        spp = (s1 - s0) / float(width)   # samples per pixel
+        level = 0
+        while level + 1 < len(self.levels) and self._bin_size(level + 1) <= spp:
+            level += 1
+        mins, maxs, sq = self.levels[level]
+        bs = self._bin_size(level)
+
+        # 픽셀 경계 → bin 인덱스 (각 픽셀에 최소 1 bin)
+        edges = (s0 + np.arange(width) * spp) // bs
+        edges = np.clip(edges.astype(np.int64), 0, len(mins) - 1)
+        b0 = int(edges[0])
+        b1 = max(min(len(mins), (s1 - 1) // bs + 1), int(edges[-1]) + 1)
+        mn, mx, ms = mins[b0:b1], maxs[b0:b1], sq[b0:b1]
+        rel = edges - b0
+        # zoom-in(픽셀이 bin보다 작음)에서는 같은 bin을 여러 픽셀이 공유
+        uniq, inv = np.unique(rel, return_inverse=True)
+        out_min = np.minimum.reduceat(mn, uniq)[inv]
+        out_max = np.maximum.reduceat(mx, uniq)[inv]
+        counts = np.diff(np.append(uniq, len(ms))).astype(np.float32)
+        out_rms = np.sqrt(np.add.reduceat(ms, uniq) / counts)[inv]
+        return out_min, out_max, out_rms
+
+
+class LiveWaveform:
+    """
+    녹음 중 실시간 파형/레벨 미터.
+    - push(block): 새 캡처 블록만 벡터 reduce → 컬럼(min/max/meansq) 링 버퍼에 추가
+    - 전체 녹음 버퍼는 절대 다시 훑지 않음
+    """
+
+    def __init__(self, columns=600, frames_per_col=256, peak_decay=1.5):
+        self.columns = int(columns)
+        self.frames_per_col = int(frames_per_col)
+        self.mins = np.zeros(self.columns, dtype=np.float32)
+        self.maxs = np.zeros(self.columns, dtype=np.float32)
+        self.meansq = np.zeros(self.columns, dtype=np.float32)
+        self.head = 0        # 다음에 쓸 링 위치
+        self.filled = 0      # 유효 컬럼 수
+        # 아직 컬럼을 다 채우지 못한 자투리 프레임
+        self._partial = np.zeros(self.frames_per_col, dtype=np.float32)
+        self._partial_n = 0
+        # 미터(블록 단위 peak/RMS + peak hold)
+        self.peak = 0.0
+        self.rms = 0.0
+        self.peak_hold = 0.0
+        self.peak_decay = float(peak_decay)   # hold 감쇠 (1/s)
+
+    def reset(self):
+        self.head = 0
+        self.filled = 0
+        self._partial_n = 0
+        self.peak = self.rms = self.peak_hold = 0.0
+
+    def push(self, block):
+        block = _to_mono(block)
+        if len(block) == 0:
+            return
+        # 미터: 이번 블록만
+        self.peak = float(np.max(np.abs(block)))
+        self.rms = float(np.sqrt(np.dot(block, block) / len(block)))
+        self.peak_hold = max(self.peak_hold, self.peak)
+
+        fpc = self.frames_per_col
+        i = 0
+        if self._partial_n:
+            take = min(fpc - self._partial_n, len(block))
+            self._partial[self._partial_n:self._partial_n + take] = block[:take]
+            self._partial_n += take
+            i = take
+            if self._partial_n == fpc:
+                self._write(self._partial[None, :])
+                self._partial_n = 0
+        full = (len(block) - i) // fpc
+        if full:
+            self._write(block[i:i + full * fpc].reshape(full, fpc))
+            i += full * fpc
+        rest = len(block) - i
+        if rest:
+            self._partial[:rest] = block[i:]
+            self._partial_n = rest
+
+    def _write(self, cols):
+        mn = cols.min(axis=1)
+        mx = cols.max(axis=1)
+        sq = np.einsum("ij,ij->i", cols, cols) / cols.shape[1]
+        n = len(mn)
+        if n >= self.columns:
+            mn, mx, sq = mn[-self.columns:], mx[-self.columns:], sq[-self.columns:]
+            n = self.columns
+        idx = (self.head + np.arange(n)) % self.columns
+        self.mins[idx] = mn
+        self.maxs[idx] = mx
+        self.meansq[idx] = sq
+        self.head = (self.head + n) % self.columns
+        self.filled = min(self.columns, self.filled + n)
+
+    def decay(self, dt):
+        """프레임마다 호출 — peak hold를 서서히 내림"""
+        self.peak_hold = max(self.peak, self.peak_hold - self.peak_decay * dt)
+
+    def snapshot(self):
+        """오래된 → 최신 순의 (mins, maxs, rms). 길이 = filled"""
+        n = self.filled
+        idx = (self.head - n + np.arange(n)) % self.columns
+        return self.mins[idx], self.maxs[idx], np.sqrt(self.meansq[idx])
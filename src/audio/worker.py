@@ -0,0 +1,264 @@
+# ============================================
+# audio/worker.py - 멀티프로세스 오디오 워커
+# ============================================
+"""
+무거운 DSP(Speed 리샘플, EQ, 루프 믹스다운, Sound Stone 특징 추출, 템포/키 추정)를 별도 프로세스에서 실행해
+pygame 루프와 GIL을 다투지 않게 한다.
+
+- 배열은 multiprocessing.shared_memory로만 주고받는다 (pickle되는 건 이름/길이/파라미터뿐)
+  · 입력: UI가 공유 메모리를 만들어 복사 → 워커가 붙어서 읽기
+  · 출력: 워커가 공유 메모리를 만들어 기록 → UI가 poll()에서 복사 후 해제
+- submit()은 바로 AudioJob을 돌려주고, 씬의 update에서 poll()을 부르면
+  끝난 작업의 콜백이 UI 스레드에서 실행된다
+- AUDIO_WORKERS = 0 이거나 프로세스 풀을 못 만들면 스레드 하나로 대체
+- blocking=True(헤드리스 리플레이): poll()이 대기 중인 작업을 기다림 → 결과가 항상
+  같은 프레임에 도착해 리플레이가 재현 가능
+"""
+
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config import AUDIO_WORKERS, SAMPLE_RATE
+
+try:
+    from multiprocessing import get_context, shared_memory, resource_tracker
+    from concurrent.futures import ProcessPoolExecutor
+    SHM_AVAILABLE = True
+except ImportError:
+    SHM_AVAILABLE = False
+
+
+# ---------- 작업 함수 (워커 프로세스에서 실행) ----------
+def _job_craft(inputs, params):
+    from audio.dsp import craft
+    return craft(inputs["audio"], params.get("sample_rate", SAMPLE_RATE), params)
+
+
+def _job_mixdown(inputs, params):
+    from audio.loop_engine import render_loop, grid_from_job
+    grid = grid_from_job(params["grid"], inputs)
+    return render_loop(grid, params["bpm"], params.get("sample_rate", SAMPLE_RATE))
+
+
+def _job_features(inputs, params):
+    from audio.features import extract, pack
+    audio = inputs["audio"]
+    return pack(extract(audio, params.get("sample_rate", SAMPLE_RATE)), len(audio))
+
+
+def _job_analysis(inputs, params):
+    from audio.analysis import analyze, pack
+    return pack(analyze(inputs["audio"], params.get("sample_rate", SAMPLE_RATE)))
+
+
+JOBS = {
+    "craft": _job_craft,
+    "mixdown": _job_mixdown,
+    "features": _job_features,
+    "analysis": _job_analysis,
+}
+
+
+def _untrack(shm):
+    """UI 쪽이 해제할 세그먼트 — 워커 종료 시 resource_tracker가 먼저 지우지 않게"""
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+def _run_job(kind, specs, params):
+    """specs: {key: (shm 이름, 프레임 수)} → (출력 shm 이름, 프레임 수)"""
+    handles, inputs = [], {}
+    try:
+        for key, (name, n) in specs.items():
+            # 입력은 UI가 만든 세그먼트 — 붙기만 (resource_tracker는 부모와 공유)
+            shm = shared_memory.SharedMemory(name=name)
+            handles.append(shm)
+            inputs[key] = np.ndarray((n,), dtype=np.float32, buffer=shm.buf)
+        out = np.ascontiguousarray(JOBS[kind](inputs, params), dtype=np.float32)
+        # 결과가 입력 view일 수 있으므로 공유 메모리를 닫기 전에 복사본으로 확정
+        if any(np.shares_memory(out, a) for a in inputs.values()):
+            out = out.copy()
+    finally:
+        inputs.clear()
+        for shm in handles:
+            shm.close()
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, out.nbytes))
+    np.ndarray(out.shape, dtype=np.float32, buffer=shm.buf)[:] = out
+    name = shm.name
+    _untrack(shm)         # UI 쪽이 읽고 unlink
+    shm.close()
+    return name, len(out)
+
+
+def _ping():
+    return True
+
+
+def _run_job_inline(kind, arrays, params):
+    """공유 메모리가 없는 환경: 같은 프로세스 스레드에서 바로 실행"""
+    return JOBS[kind](arrays, params)
+
+
+# ---------- UI 쪽 ----------
+class AudioJob:
+    def __init__(self, job_id, kind, callback):
+        self.id = job_id
+        self.kind = kind
+        self.callback = callback
+        self.result = None      # float32 mono
+        self.error = None
+        self.done = False
+        self.cancelled = False
+        self._future = None
+        self._inputs = []       # 이 작업이 끝나면 해제할 입력 공유 메모리
+
+
+class AudioWorker:
+    def __init__(self, workers=AUDIO_WORKERS, blocking=False):
+        self.workers = int(workers)
+        self.blocking = blocking
+        self._pool = None
+        self._use_shm = False
+        self._jobs = []
+        self._ids = itertools.count(1)
+
+    def _executor(self):
+        if self._pool is None:
+            if SHM_AVAILABLE and self.workers > 0:
+                try:
+                    # fork는 pygame/오디오 스레드 상태까지 복제하므로 spawn
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=get_context("spawn"))
+                    self._use_shm = True
+                except (OSError, ValueError, NotImplementedError) as e:
+                    print(f"[AudioWorker] process pool unavailable — thread fallback ({e})")
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=1)
+                self._use_shm = SHM_AVAILABLE
+        return self._pool
+
+    def warm_up(self):
+        """프로세스 풀을 미리 띄움 (spawn 비용을 첫 렌더 전에)"""
+        self._executor().submit(_ping)
+
+    @property
+    def busy(self):
+        return any(not j.done for j in self._jobs)
+
+    def submit(self, kind, inputs, params=None, callback=None):
+        """
+        inputs: {key: 배열} (float32 mono로 변환), params: 작은 dict (pickle됨)
+        callback(job): poll()에서 UI 스레드로 호출
+        """
+        pool = self._executor()
+        job = AudioJob(next(self._ids), kind, callback)
+        params = dict(params or {})
+        arrays = {k: np.ascontiguousarray(a, dtype=np.float32).reshape(-1) for k, a in inputs.items()}
+        if not self._use_shm:
+            job._future = pool.submit(_run_job_inline, kind, arrays, params)
+        else:
+            specs = {}
+            for key, arr in arrays.items():
+                shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+                np.ndarray(arr.shape, dtype=np.float32, buffer=shm.buf)[:] = arr
+                specs[key] = (shm.name, len(arr))
+                job._inputs.append(shm)
+            job._future = pool.submit(_run_job, kind, specs, params)
+        self._jobs.append(job)
+        return job
+
+    def cancel(self, job):
+        if job is None or job.done:
+            return
+        job.cancelled = True
+        job._future.cancel()
+
+    def poll(self):
+        """끝난 작업 정리 + 콜백 (씬 update에서 매 프레임 호출) → 완료된 작업 수"""
+        if self.blocking:
+            for job in self._jobs:
+                try:
+                    job._future.result()
+                except Exception:
+                    pass
+        finished = [j for j in self._jobs if j._future.done()]
+        if not finished:
+            return 0
+        self._jobs = [j for j in self._jobs if not j._future.done()]
+        for job in finished:
+            self._collect(job)
+            if job.callback is not None and not job.cancelled:
+                job.callback(job)
+        return len(finished)
+
+    def wait(self, job, timeout=None):
+        """동기 대기 (배치/테스트용) — 콜백은 poll()에서"""
+        try:
+            job._future.result(timeout=timeout)
+        except Exception:
+            pass
+        self.poll()
+
+    def _collect(self, job):
+        job.done = True
+        for shm in job._inputs:
+            shm.close()
+            shm.unlink()
+        job._inputs = []
+        if job._future.cancelled():
+            job.cancelled = True
+            return
+        try:
+            res = job._future.result()
+        except Exception as e:
+            job.error = e
+            print(f"[AudioWorker] {job.kind} job failed: {e}")
+            return
+        if not self._use_shm:
+            job.result = np.asarray(res, dtype=np.float32)
+            return
+        name, n = res
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            job.result = np.ndarray((n,), dtype=np.float32, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self):
+        for job in self._jobs:
+            self.cancel(job)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self.poll()
+
+
+# ---------- 공유 워커 ----------
+_shared = None
+_blocking = False
+
+
+def configure(blocking=False):
+    """공유 워커 설정 (헤드리스 런타임이 get_worker() 전에 호출)"""
+    global _blocking
+    _blocking = blocking
+    if _shared is not None:
+        _shared.blocking = blocking
+
+
+def get_worker():
+    global _shared
+    if _shared is None:
+        _shared = AudioWorker(blocking=_blocking)
+    return _shared
+
+
+def shutdown_worker():
+    global _shared
+    if _shared is not None:
+        _shared.shutdown()
+        _shared = None
@@ -2,11 +2,15 @@
 # config.py - 전역 설정
 # ============================================
 
+import os
+
 # Display
 WIDTH = 800
 HEIGHT = 480
 FPS = 60
 FULLSCREEN = True
+HEADLESS = False          # True: 디스플레이 없이 오프스크린 Surface에 그림 (CI/부하 테스트)
+START_SCENE = "recording"
 
 USE_GPIO = False  # 지금은 키보드 테스트만
 
@@ -29,14 +33,31 @@ LONGPRESS_MS    = 600
 SAMPLE_RATE = 44100
 CHANNELS = 2  # Stereo
 BUFFER_SIZE = 512
+LOOKAHEAD_BLOCKS = 16    # 다음 bar를 bar 끝 몇 블록(BUFFER_SIZE) 전에 미리 렌더할지
+PREFETCH_HEAD_SEC = 3.0  # Library 미리듣기용으로 미리 읽어둘 팩 앞부분(초)
+PREFETCH_CACHE_MB = 32   # 프리패치 캐시 상한
+MAX_VOICES = 16          # 믹서 보이스 풀 크기(고정, 미리 할당)
+AUDIO_OUTPUT = "auto"    # "auto" | "sounddevice" | "pygame" | "null" | "manual" | "wav:<path>"
+AUDIO_WORKERS = 1        # DSP 워커 프로세스 수 (0 = 같은 프로세스의 스레드)
+HEADLESS_AUDIO = "manual"  # 헤드리스 모드 출력 — manual이면 런타임이 프레임마다 dt만큼 펌프
 
 # Game Settings
 MAX_LAYERS = 4
 MAX_BARS = 8
 DEFAULT_BPM = 120
+MAX_STONE_SEC = 96.0     # Sound Stone 최대 길이 (가장 긴 루프 8 bars @ 40 BPM = 48s의 두 배)
 
 # Colors (예시)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 GHOST_BLUE = (100, 150, 200)
-TAIL_ORANGE = (255, 150, 50)
\ No newline at end of file
+TAIL_ORANGE = (255, 150, 50)
+
+# Data paths (data/ 는 저장소 루트 기준)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+SAMPLES_DIR = os.path.join(DATA_DIR, "samples")
+LIBRARY_DIR = os.path.join(DATA_DIR, "library")
+IMPORT_DIR = os.path.join(DATA_DIR, "import")   # 여기 넣은 WAV는 Library 진입 시 가져옴
+IMPORT_WORKERS = 0       # 가져오기 프로세스 수 (0 = CPU 코어 수)
+LIBRARY_CODEC = "auto"   # 라이브러리 오디오 저장 포맷: "auto"(FLAC, 없으면 pcmz) | "flac" | "pcmz" | "wav"
+BLOB_SWEEP_GRACE_SEC = 24 * 3600   # 참조 없는 블롭을 이만큼 지난 뒤에야 지움 (기록 직전인 export/가져오기 보호)
@@ -1,28 +1,46 @@
 # core/scene_manager.py
-from typing import Dict, Type, Optional
+import importlib
+from typing import Dict, Type, Optional, Union
 
 class SceneManager:
     """
     씬 등록/전환/업데이트/그리기만 담당하는 순수 매니저.
     state_manager는 선택(없어도 동작).
+
+    register()에 클래스 대신 "패키지.모듈:클래스" 문자열을 넘기면
+    처음 그 씬으로 전환할 때 import한다 (콜드 스타트 단축).
     """
     def __init__(self, screen, state_manager: Optional[object] = None):
         self.screen = screen
         self.state_manager = state_manager
-        self._registry: Dict[str, Type] = {}
+        self._registry: Dict[str, Union[Type, str]] = {}
         self.current = None
         self.current_name = None
 
-    def register(self, name: str, scene_cls: Type):
+    def register(self, name: str, scene_cls: Union[Type, str]):
         self._registry[name] = scene_cls
 
-    def change_scene(self, name: str, **kwargs):
-        if self.current and hasattr(self.current, "exit"):
-            self.current.exit()
-
+    def resolve(self, name: str) -> Type:
+        """등록된 씬 클래스 (문자열 경로면 여기서 import 후 캐시)"""
         cls = self._registry.get(name)
         if cls is None:
             raise ValueError(f"Scene '{name}' not registered")
+        if isinstance(cls, str):
+            module_path, sep, attr = cls.partition(":")
+            if not sep:
+                module_path, _, attr = cls.rpartition(".")
+            cls = getattr(importlib.import_module(module_path), attr)
+            self._registry[name] = cls
+        return cls
+
+    def is_loaded(self, name: str) -> bool:
+        return not isinstance(self._registry.get(name), str)
+
+    def change_scene(self, name: str, **kwargs):
+        cls = self.resolve(name)
+
+        if self.current and hasattr(self.current, "exit"):
+            self.current.exit()
 
         self.current = cls(self.screen, self)
         self.current_name = name
@@ -1,64 +1,164 @@
 # ============================================
-# game.py - 게임 메인 클래스
+# game.py - 게임 메인 클래스 (단일 런타임)
 # ============================================
+"""
+main.py가 만드는 유일한 런타임.
 
+- 설정은 config.py (FPS, FULLSCREEN, USE_GPIO, HEADLESS, START_SCENE)
+- 헤드리스: 창 없이 오프스크린 Surface에 그리고, 고정 dt(1/FPS)로 최대 속도 진행
+  입력은 ScriptedInput(텍스트 스크립트 또는 InputRecorder 로그 리플레이),
+  오디오는 HEADLESS_AUDIO("manual"이면 프레임마다 dt만큼 펌프), 시계는 utils.clock 가상 시간
+- 프레임별 update/draw 시간을 모아 종료 시 요약 (부하 테스트/프로파일링)
+"""
+
+import os
+import sys
+import time
 import pygame
 from core.scene_manager import SceneManager
-from core.state_manager import StateManager
 from inputs.hardware_input import HardwareInput
+from utils.startup_timer import StartupTimer
+from utils import clock
 from config import *
 
+# 씬들 — 문자열 경로로 등록해 처음 전환할 때 import (numpy/오디오 모듈 지연 로드)
+SCENES = {
+    "recording":        "scenes.work_lane.recording_scene:RecordingScene",
+    "sound_crafting":   "scenes.work_lane.sound_crafting_scene:SoundCraftingScene",
+    "loop_composition": "scenes.work_lane.loop_composition_scene:LoopCompositionScene",
+    "bridge":           "scenes.bridge_scene:BridgeScene",
+    "library":          "scenes.library_lane.library_scene:LibraryScene",
+}
+
 class Game:
-    def __init__(self):
-        # 디스플레이 초기화
-        flags = pygame.FULLSCREEN if FULLSCREEN else 0
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), flags)
-        pygame.display.set_caption("Deadcat Recorder")
-        pygame.mouse.set_visible(False)
-        
+    def __init__(self, headless=HEADLESS, input_source=None, max_frames=None,
+                 start_scene=START_SCENE, timer=None):
+        """
+        input_source: HardwareInput과 같은 인터페이스 (None이면 HardwareInput)
+        max_frames: 이 프레임 수만큼 돌고 종료 (None이면 무한 / 스크립트 끝까지)
+        """
+        self.headless = headless
+        self.max_frames = max_frames
+        self.timer = timer or StartupTimer()
+        self.timer.mark("imports")
+
+        # 디스플레이 초기화 — pygame.init()은 mixer(오디오 장치)까지 열어 느리므로 필요한 모듈만
+        if headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.font.init()
+        self.timer.mark("pygame")
+        if headless:
+            # 가상 시계: 최대 속도로 돌아도 씬/레코더가 보는 시간은 프레임 × dt
+            clock.set_virtual(0.0)
+            self.screen = pygame.Surface((WIDTH, HEIGHT))
+            from audio.mixer import configure_output
+            from audio import worker
+            configure_output(HEADLESS_AUDIO)
+            worker.configure(blocking=True)   # 렌더 결과가 항상 같은 프레임에 도착
+        else:
+            flags = pygame.FULLSCREEN if FULLSCREEN else 0
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT), flags)
+            pygame.display.set_caption("Deadcat Recorder")
+            pygame.mouse.set_visible(False)
+        self.timer.mark("display")
+
         # 시스템 초기화
         self.clock = pygame.time.Clock()
         self.running = True
-        
+        self.frame = 0
+        self.frame_ms = []    # 프레임별 update+draw 시간
+
         # 매니저 초기화
-        self.state_manager = StateManager()
-        self.scene_manager = SceneManager(self.screen, self.state_manager)
-        self.hardware_input = HardwareInput()
-        
-        # 초기 씬 설정 (Bridge에서 시작)
-        self.scene_manager.change_scene("bridge")
-    
+        self.scene_manager = SceneManager(self.screen)
+        for name, path in SCENES.items():
+            self.scene_manager.register(name, path)
+        self.hardware_input = input_source if input_source is not None else HardwareInput()
+
+        # 초기 씬 설정 (항상 Pre-record부터)
+        self.scene_manager.change_scene(start_scene)
+        self.timer.mark("scene")
+
     def handle_events(self):
+        if self.headless:
+            return
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    self.running = False
-                # 개발용 키보드 매핑
-                self.hardware_input.handle_keyboard(event)
-            
-            # 현재 씬에 이벤트 전달
-            self.scene_manager.handle_event(event)
-    
+            self.hardware_input.feed_event(event)
+
     def update(self, dt):
         # 하드웨어 입력 읽기
         hw_state = self.hardware_input.read()
-        
+
         # 씬 업데이트
         self.scene_manager.update(dt, hw_state)
-    
+
     def draw(self):
         self.screen.fill(BLACK)
         self.scene_manager.draw()
-        pygame.display.flip()
-    
-    def run(self):
-        while self.running:
-            dt = self.clock.tick(FPS) / 1000.0  # delta time in seconds
-            
+        if not self.headless:
+            pygame.display.flip()
+
+    def pump_audio(self, dt):
+        """헤드리스 manual 출력: 화면 프레임과 같은 시간만큼 오디오를 렌더"""
+        from audio.mixer import get_output
+        out = get_output()
+        if out is not None and hasattr(out, "pump") and not out.realtime:
+            out.pump(int(round(dt * out.mixer.sample_rate)))
+
+    def finished(self):
+        if self.max_frames is not None:
+            return self.frame >= self.max_frames
+        # 스크립트 입력은 마지막 펄스까지 내보내면 끝
+        return bool(getattr(self.hardware_input, "done", False))
+
+    def run(self, screenshot=None):
+        """screenshot: 종료 직전 마지막 프레임을 저장할 이미지 경로"""
+        while self.running and not self.finished():
+            if self.headless:
+                dt = 1.0 / FPS
+                clock.advance(dt)
+            else:
+                dt = self.clock.tick(FPS) / 1000.0  # delta time in seconds
+
+            t0 = time.perf_counter()
             self.handle_events()
             self.update(dt)
             self.draw()
-        
+            if self.headless:
+                self.pump_audio(dt)
+            self.hardware_input.post_frame_reset()
+            self.frame_ms.append((time.perf_counter() - t0) * 1000.0)
+
+            if self.frame == 0:
+                self.timer.mark("first frame")
+                self.timer.report()
+            self.frame += 1
+
+        if screenshot:
+            pygame.image.save(self.screen, screenshot)
+        self.shutdown()
+
+    def shutdown(self):
+        if self.scene_manager.current is not None:
+            self.scene_manager.current.exit()
+        if self.headless:
+            self.report()
+        # 오디오 워커를 썼다면 프로세스/공유 메모리 정리
+        if "audio.worker" in sys.modules:
+            sys.modules["audio.worker"].shutdown_worker()
         self.hardware_input.cleanup()
+        pygame.quit()
+
+    def report(self):
+        """프레임 시간 요약 (update + draw + 헤드리스 오디오 펌프)"""
+        if not self.frame_ms:
+            return None
+        ms = sorted(self.frame_ms)
+        avg = sum(ms) / len(ms)
+        p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+        line = (f"[Game] {len(ms)} frames | avg {avg:.2f}ms | p95 {p95:.2f}ms | "
+                f"max {ms[-1]:.2f}ms | budget {1000.0 / FPS:.1f}ms")
+        print(line)
+        return line
@@ -0,0 +1,116 @@
+# ============================================
+# inputs/input_log.py - 입력 녹화/리플레이 로그
+# ============================================
+"""
+실제 세션의 hw_state 펄스를 작은 바이너리 파일로 남기고 그대로 다시 재생.
+
+포맷 (little-endian):
+    헤더   "DCIN" | version u8 | fps u16 | 키 개수 u8
+    레코드 frame u32 | time_ms u32 | mask u8     ← 펄스가 있던 프레임만 (9 bytes)
+    마지막 레코드는 mask=0 — 세션이 끝난 프레임 (리플레이 길이 보존)
+
+mask 비트 순서는 scripted_input.KEYS.
+리플레이는 ScriptedInput.from_log() — 기본은 프레임 번호 그대로(프레임 정확),
+by_time=True면 타임스탬프를 다른 FPS의 프레임으로 다시 매핑.
+"""
+
+import struct
+from utils import clock
+from inputs.scripted_input import KEYS
+
+MAGIC = b"DCIN"
+VERSION = 1
+_HEADER = struct.Struct("<4sBHB")
+_RECORD = struct.Struct("<IIB")
+
+
+def pulses_to_mask(hw_state):
+    mask = 0
+    for bit, key in enumerate(KEYS):
+        if hw_state.get(key):
+            mask |= 1 << bit
+    return mask
+
+
+def mask_to_keys(mask):
+    return [key for bit, key in enumerate(KEYS) if mask & (1 << bit)]
+
+
+def is_input_log(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(4) == MAGIC
+    except OSError:
+        return False
+
+
+def save_input_log(path, records, fps):
+    """records: [(frame, time_ms, mask), ...]"""
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, int(fps), len(KEYS)))
+        for frame, t_ms, mask in records:
+            f.write(_RECORD.pack(int(frame), int(t_ms), int(mask)))
+
+
+def load_input_log(path):
+    """→ (fps, [(frame, time_ms, mask), ...])"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if len(raw) < _HEADER.size:
+        raise ValueError(f"Input log too short: {path}")
+    magic, version, fps, nkeys = _HEADER.unpack_from(raw, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not an input log: {path}")
+    if version != VERSION or nkeys != len(KEYS):
+        raise ValueError(f"Unsupported input log v{version} ({nkeys} keys): {path}")
+    body = raw[_HEADER.size:]
+    usable = len(body) - len(body) % _RECORD.size
+    records = list(_RECORD.iter_unpack(body[:usable]))
+    return fps, records
+
+
+class InputRecorder:
+    """
+    입력 소스(HardwareInput 등)를 감싸 펄스를 기록. 인터페이스는 그대로 통과.
+    cleanup()에서 파일로 저장.
+    """
+
+    def __init__(self, source, path, fps):
+        self.source = source
+        self.path = path
+        self.fps = int(fps)
+        self.frame = 0
+        self.records = []
+        self._t0 = None     # 첫 read()에서 — 런타임이 시계(가상/실시간)를 정한 뒤
+        self._t = 0
+
+    @property
+    def done(self):
+        return getattr(self.source, "done", False)
+
+    def feed_event(self, event):
+        self.source.feed_event(event)
+
+    def read(self):
+        out = self.source.read()
+        if self._t0 is None:
+            self._t0 = clock.now()
+        self._t = int((clock.now() - self._t0) * 1000.0)
+        mask = pulses_to_mask(out)
+        if mask:
+            self.records.append((self.frame, self._t, mask))
+        return out
+
+    def post_frame_reset(self):
+        self.source.post_frame_reset()
+        self.frame += 1
+
+    def cleanup(self):
+        # 끝 표시: 마지막으로 진행한 프레임
+        end = (max(0, self.frame - 1), self._t, 0)
+        try:
+            save_input_log(self.path, self.records + [end], self.fps)
+            print(f"[InputRecorder] {len(self.records)} pulses / {self.frame} frames → {self.path}")
+        except OSError as e:
+            print(f"[InputRecorder] save failed: {e}")
+        self.source.cleanup()
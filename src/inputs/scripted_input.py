@@ -0,0 +1,103 @@
+# ============================================
+# inputs/scripted_input.py - 스크립트 입력 (헤드리스/부하 테스트용)
+# ============================================
+"""
+HardwareInput과 같은 인터페이스(feed_event/read/post_frame_reset/cleanup)로
+미리 정한 프레임에 펄스를 내보낸다.
+
+스크립트: [(frame, key), ...], 텍스트 파일, 또는 InputRecorder 로그(from_log)
+    # 주석
+    0   REC
+    90  REC
+    120 RC PDC      ← 한 프레임에 여러 펄스
+"""
+
+from utils.constants import PC, RC, RR_CW, RR_CCW, PDC, PLC, REC
+
+KEYS = (PC, RC, RR_CW, RR_CCW, PDC, PLC, REC)
+
+
+def parse_script(text):
+    """텍스트 스크립트 → [(frame, key), ...]"""
+    events = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        try:
+            frame = int(parts[0])
+        except ValueError:
+            raise ValueError(f"line {lineno}: frame number expected, got {parts[0]!r}")
+        for key in parts[1:]:
+            if key not in KEYS:
+                raise ValueError(f"line {lineno}: unknown input {key!r}")
+            events.append((frame, key))
+    return events
+
+
+class ScriptedInput:
+    def __init__(self, events=(), end_frame=None):
+        """end_frame: 이 프레임까지는 펄스가 없어도 진행 (녹화된 세션 길이)"""
+        # frame → [key, ...]
+        self._by_frame = {}
+        for frame, key in events:
+            self._by_frame.setdefault(int(frame), []).append(key)
+        self.last_frame = max(self._by_frame, default=-1)
+        if end_frame is not None:
+            self.last_frame = max(self.last_frame, int(end_frame))
+        self.frame = 0
+        self.state = {k: False for k in KEYS}
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(parse_script(f.read()))
+
+    @classmethod
+    def from_log(cls, path, by_time=False, fps=None):
+        """
+        InputRecorder 로그 리플레이.
+        by_time=False: 녹화 프레임 번호 그대로 (프레임 정확)
+        by_time=True: time_ms를 fps 기준 프레임으로 다시 매핑
+        """
+        from inputs.input_log import load_input_log, mask_to_keys
+        log_fps, records = load_input_log(path)
+        fps = fps or log_fps
+        events, end = [], None
+        for frame, t_ms, mask in records:
+            if by_time:
+                frame = int(round(t_ms * fps / 1000.0))
+            for key in mask_to_keys(mask):
+                events.append((frame, key))
+            end = frame if end is None else max(end, frame)
+        return cls(events, end_frame=end)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """로그(바이너리)/텍스트 스크립트 자동 판별"""
+        from inputs.input_log import is_input_log
+        if is_input_log(path):
+            return cls.from_log(path, **kwargs)
+        return cls.from_file(path)
+
+    @property
+    def done(self):
+        """마지막 스크립트 프레임까지 다 내보냈는지"""
+        return self.frame > self.last_frame
+
+    def feed_event(self, event):
+        # 스크립트가 유일한 입력원 (헤드리스에는 이벤트가 없다)
+        return
+
+    def read(self):
+        out = self.state.copy()
+        for key in self._by_frame.get(self.frame, ()):
+            out[key] = True
+        return out
+
+    def post_frame_reset(self):
+        self.frame += 1
+
+    def cleanup(self):
+        return
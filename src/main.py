@@ -1,54 +1,51 @@
 # main.py
-import os, sys, pygame
-from core.scene_manager import SceneManager
-from inputs.hardware_input import HardwareInput
-
-# 씬들
-from scenes.work_lane.recording_scene import RecordingScene
-from scenes.work_lane.sound_crafting_scene import SoundCraftingScene
-from scenes.work_lane.loop_composition_scene import LoopCompositionScene
-from scenes.bridge_scene import BridgeScene
-from scenes.library_lane.library_scene import LibraryScene
-
-WIDTH, HEIGHT = 800, 480
-FPS = 60
-
-def main():
-    pygame.init()
-    pygame.font.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
-    pygame.display.set_caption("Deadcat Recorder")
-
-    clock = pygame.time.Clock()
-    hw = HardwareInput()
-
-    sm = SceneManager(screen)  # ← state_manager 인자 불필요
-    sm.register("recording", RecordingScene)
-    sm.register("sound_crafting", SoundCraftingScene)
-    sm.register("loop_composition", LoopCompositionScene)
-    sm.register("bridge", BridgeScene)
-    sm.register("library", LibraryScene)
-
-    # 항상 Pre-record부터
-    sm.change_scene("recording")
-
-    running = True
-    while running:
-        dt = clock.tick(FPS) / 1000.0
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            hw.feed_event(event)
-
-        hw_state = hw.read()
-        sm.update(dt, hw_state)
-        sm.draw()
-        pygame.display.flip()
-        hw.post_frame_reset()
-
-    hw.cleanup()
-    pygame.quit()
+import time
+_T0 = time.perf_counter()   # 콜드 스타트 측정 기준 (import 시간 포함)
+
+import argparse
+from game import Game
+from config import HEADLESS, FPS
+from utils.startup_timer import StartupTimer
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Deadcat Recorder")
+    p.add_argument("--headless", action="store_true", default=HEADLESS,
+                   help="no display: draw to an offscreen surface at fixed dt")
+    p.add_argument("--script", help="scripted input: text (frame KEY ...) or a recorded input log"
+                                    " — implies --headless")
+    p.add_argument("--by-time", action="store_true",
+                   help="replay a recorded log by timestamp instead of frame number")
+    p.add_argument("--record-input", metavar="PATH", help="log input pulses to PATH for later replay")
+    p.add_argument("--frames", type=int, help="stop after this many frames")
+    p.add_argument("--screenshot", help="save the last frame to this image file")
+    args = p.parse_args(argv)
+    if args.by_time:
+        from inputs.input_log import is_input_log
+        if not args.script:
+            p.error("--by-time requires --script with a recorded input log")
+        if not is_input_log(args.script):
+            p.error(f"--by-time only applies to recorded input logs; {args.script} is not one")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    headless = args.headless or bool(args.script)
+
+    input_source = None
+    if args.script:
+        from inputs.scripted_input import ScriptedInput
+        if args.by_time:
+            input_source = ScriptedInput.from_log(args.script, by_time=True, fps=FPS)
+        else:
+            input_source = ScriptedInput.load(args.script)
+    if args.record_input:
+        from inputs.input_log import InputRecorder
+        from inputs.hardware_input import HardwareInput
+        input_source = InputRecorder(input_source or HardwareInput(), args.record_input, FPS)
+
+    game = Game(headless=headless, input_source=input_source, max_frames=args.frames,
+                timer=StartupTimer(_T0))
+    game.run(screenshot=args.screenshot)
 
 if __name__ == "__main__":
     main()
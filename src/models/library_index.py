@@ -0,0 +1,230 @@
+# ============================================
+# models/library_index.py - 라이브러리(TailPack) 인메모리 인덱스
+# ============================================
+"""
+TailPack 메타데이터 검색 인덱스.
+
+- 주 인덱스: 날짜 오름차순 정렬 (bisect)
+- 보조 인덱스: bpm / duration 정렬 리스트, key / layers 해시 버킷(날짜순 유지)
+- 질의는 가장 좁은 인덱스로 범위를 자른 뒤 나머지 조건만 검사 → O(log n + k)
+- 망원경 초점(0=가까움/최신 ~ 100=멀리/오래됨)을 날짜 구간으로 변환
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+
+FOCUS_MAX = 100
+FOCUS_WINDOW = 0.1    # 초점 하나가 보여주는 날짜 구간(전체 기간 대비 비율)
+
+
+def date_key(value):
+    """'2024-01-15' / ISO datetime / timestamp → 정렬용 float timestamp"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class LibraryIndex:
+    def __init__(self, packs=()):
+        self._packs = {}          # id → pack
+        self._next_id = 0
+        # 정렬 인덱스: (키, id) 튜플 리스트
+        self._by_date = []
+        self._by_bpm = []
+        self._by_duration = []
+        # 해시 버킷: 값 → 날짜순 (date, id) 리스트
+        self._by_key = {}
+        self._by_layers = {}
+        self.add_many(packs)
+
+    def __len__(self):
+        return len(self._packs)
+
+    # ---------- 추가/삭제 ----------
+    def _claim_id(self, pid):
+        """index.json의 id → int (없거나 정수가 아니거나 이미 있으면 새 번호)"""
+        try:
+            pid = int(pid)
+        except (TypeError, ValueError):
+            pid = None
+        if pid is None or pid in self._packs:
+            pid = self._next_id
+        self._next_id = max(self._next_id, pid) + 1
+        return pid
+
+    def add(self, pack):
+        pid = self._claim_id(pack.get("id"))
+        pack["id"] = pid
+        self._packs[pid] = pack
+        d = date_key(pack.get("date"))
+        insort(self._by_date, (d, pid))
+        if pack.get("bpm") is not None:
+            insort(self._by_bpm, (float(pack["bpm"]), pid))
+        if pack.get("duration") is not None:
+            insort(self._by_duration, (float(pack["duration"]), pid))
+        insort(self._by_key.setdefault(pack.get("key"), []), (d, pid))
+        insort(self._by_layers.setdefault(pack.get("layers"), []), (d, pid))
+        return pid
+
+    def add_many(self, packs):
+        """대량 추가: 한 번에 붙이고 정렬(insort 반복보다 빠름)"""
+        packs = list(packs)
+        if not packs:
+            return
+        if len(packs) < 8:
+            for p in packs:
+                self.add(p)
+            return
+        for p in packs:
+            pid = self._claim_id(p.get("id"))
+            p["id"] = pid
+            self._packs[pid] = p
+            d = date_key(p.get("date"))
+            self._by_date.append((d, pid))
+            if p.get("bpm") is not None:
+                self._by_bpm.append((float(p["bpm"]), pid))
+            if p.get("duration") is not None:
+                self._by_duration.append((float(p["duration"]), pid))
+            self._by_key.setdefault(p.get("key"), []).append((d, pid))
+            self._by_layers.setdefault(p.get("layers"), []).append((d, pid))
+        for lst in (self._by_date, self._by_bpm, self._by_duration,
+                    *self._by_key.values(), *self._by_layers.values()):
+            lst.sort()
+
+    def remove(self, pid):
+        pack = self._packs.pop(pid, None)
+        if pack is None:
+            return None
+        d = date_key(pack.get("date"))
+        self._discard(self._by_date, (d, pid))
+        if pack.get("bpm") is not None:
+            self._discard(self._by_bpm, (float(pack["bpm"]), pid))
+        if pack.get("duration") is not None:
+            self._discard(self._by_duration, (float(pack["duration"]), pid))
+        self._discard(self._by_key.get(pack.get("key"), []), (d, pid))
+        self._discard(self._by_layers.get(pack.get("layers"), []), (d, pid))
+        return pack
+
+    @staticmethod
+    def _discard(lst, item):
+        i = bisect_left(lst, item)
+        if i < len(lst) and lst[i] == item:
+            del lst[i]
+
+    # ---------- 조회 ----------
+    def get(self, pid):
+        return self._packs.get(pid)
+
+    def packs_by_date(self, newest_first=True):
+        ids = [pid for _, pid in self._by_date]
+        if newest_first:
+            ids.reverse()
+        return [self._packs[i] for i in ids]
+
+    @staticmethod
+    def _bounds(lst, lo, hi):
+        """정렬 리스트에서 lo <= key <= hi 구간 → (lst, a, b) (복사하지 않음)"""
+        a = 0 if lo is None else bisect_left(lst, (lo, -1))
+        b = len(lst) if hi is None else bisect_right(lst, (hi, float("inf")))
+        return lst, a, b
+
+    def query(self, date_range=None, bpm_range=None, duration_range=None, key=None, layers=None,
+              newest_first=True):
+        """
+        조건을 모두 만족하는 팩 목록(날짜순).
+        *_range = (lo, hi) — 한쪽을 None으로 두면 열린 구간.
+        """
+        date_lo, date_hi = (None, None)
+        if date_range is not None:
+            date_lo = None if date_range[0] is None else date_key(date_range[0])
+            date_hi = None if date_range[1] is None else date_key(date_range[1])
+
+        # 후보 집합: 인덱스마다 bisect 경계만 구하고, 가장 좁은 것 하나만 슬라이스
+        candidates = []
+        if key is not None:
+            candidates.append(("date", self._bounds(self._by_key.get(key, []), date_lo, date_hi)))
+        if layers is not None:
+            candidates.append(("date", self._bounds(self._by_layers.get(layers, []), date_lo, date_hi)))
+        if bpm_range is not None:
+            candidates.append(("bpm", self._bounds(self._by_bpm, *bpm_range)))
+        if duration_range is not None:
+            candidates.append(("duration", self._bounds(self._by_duration, *duration_range)))
+        if not candidates or date_range is not None:
+            candidates.append(("date", self._bounds(self._by_date, date_lo, date_hi)))
+        kind, (lst, a, b) = min(candidates, key=lambda c: c[1][2] - c[1][1])
+        base = lst[a:b]
+
+        out = []
+        for _, pid in base:
+            p = self._packs[pid]
+            if key is not None and p.get("key") != key:
+                continue
+            if layers is not None and p.get("layers") != layers:
+                continue
+            if bpm_range is not None and not self._in(p.get("bpm"), bpm_range):
+                continue
+            if duration_range is not None and not self._in(p.get("duration"), duration_range):
+                continue
+            if date_range is not None and not self._in(date_key(p.get("date")), (date_lo, date_hi)):
+                continue
+            out.append(p)
+        if kind != "date":
+            out.sort(key=lambda p: date_key(p.get("date")))
+        if newest_first:
+            out.reverse()
+        return out
+
+    @staticmethod
+    def _in(v, rng):
+        if v is None:
+            return False
+        lo, hi = rng
+        return (lo is None or v >= lo) and (hi is None or v <= hi)
+
+    # ---------- 망원경 초점 ----------
+    def date_span(self):
+        if not self._by_date:
+            return 0.0, 0.0
+        return self._by_date[0][0], self._by_date[-1][0]
+
+    def focus_to_date_range(self, focus, window=FOCUS_WINDOW):
+        """초점(0=최신 ~ FOCUS_MAX=가장 오래됨) → (lo, hi) timestamp"""
+        oldest, newest = self.date_span()
+        span = newest - oldest
+        center = newest - (max(0, min(FOCUS_MAX, focus)) / float(FOCUS_MAX)) * span
+        half = span * window / 2.0
+        return center - half, center + half
+
+    def focus_slice(self, focus, window=FOCUS_WINDOW):
+        """
+        초점 구간 안의 (date, id) 슬라이스(최신순).
+        구간이 비면 초점 날짜에 가장 가까운 팩 하나라도 돌려준다.
+        """
+        if not self._by_date:
+            return []
+        lo, hi = self.focus_to_date_range(focus, window)
+        a = bisect_left(self._by_date, (lo, -1))
+        b = bisect_right(self._by_date, (hi, float("inf")))
+        if a >= b:
+            i = min(a, len(self._by_date) - 1)
+            if a > 0 and (a == len(self._by_date) or
+                          abs(self._by_date[a - 1][0] - (lo + hi) / 2) < abs(self._by_date[i][0] - (lo + hi) / 2)):
+                i = a - 1
+            a, b = i, i + 1
+        return self._by_date[a:b][::-1]
+
+    def packs_in_focus(self, focus, window=FOCUS_WINDOW):
+        return [self._packs[pid] for _, pid in self.focus_slice(focus, window)]
+
+    def rank_of(self, pid):
+        """날짜순(최신=0) 순위 — 가상 리스트 위치 계산용"""
+        pack = self._packs.get(pid)
+        if pack is None:
+            return None
+        i = bisect_left(self._by_date, (date_key(pack.get("date")), pid))
+        return len(self._by_date) - 1 - i
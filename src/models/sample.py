@@ -22,19 +22,30 @@ class Sample:
         """샘플 역재생"""
         self.audio_data = self.audio_data[::-1]
     
-    def change_speed(self, factor):
-        """속도 변경"""
-        # TODO: 적절한 리샘플링 구현
-        pass
+    def change_speed(self, factor, keep_pitch=False):
+        """속도 변경 (keep_pitch=True면 피치 유지 — WSOLA)"""
+        from audio.stretch import change_speed
+        self.audio_data = change_speed(self.audio_data, factor, keep_pitch)
+        self.duration = len(self.audio_data) / self.sample_rate
 
 class SoundStone:
     """AI 처리된 소리 원석"""
     def __init__(self, sample, visual_properties):
         self.sample = sample
         self.visual_properties = visual_properties
+        self.descriptors = None
         self.color = None
         self.shape = None
         self.texture = None
+
+    def apply_descriptors(self, descriptors):
+        """오디오 디스크립터(audio/features.py)로 색/모양/질감 결정"""
+        from audio.features import stone_visuals
+        self.descriptors = descriptors
+        visual = stone_visuals(descriptors)
+        self.color = visual["color"]
+        self.shape = visual["shape"]
+        self.texture = visual["texture"]
     
     def apply_tool(self, tool_name, parameters):
         """도구 적용"""
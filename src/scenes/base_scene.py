@@ -37,3 +37,28 @@ class BaseScene:
         """텍스트 그리기 헬퍼"""
         surface = self.font.render(text, True, color)
         self.screen.blit(surface, (x, y))
+
+    def draw_waveform(self, peaks, rect, start_sec=0.0, end_sec=None,
+                      color=(120, 170, 220), rms_color=(200, 225, 250)):
+        """피크 피라미드(audio.waveform.PeakPyramid)로 파형 그리기 — 픽셀 폭만큼만 계산"""
+        if peaks is None:
+            return
+        rect = pygame.Rect(rect)
+        if end_sec is None:
+            end_sec = peaks.duration
+        mins, maxs, rms = peaks.columns(start_sec, end_sec, rect.width)
+        self.draw_waveform_columns(mins, maxs, rms, rect.x, rect.centery, rect.height / 2.0,
+                                   color, rms_color)
+
+    def draw_waveform_columns(self, mins, maxs, rms, x0, mid, half,
+                              color=(120, 170, 220), rms_color=(200, 225, 250)):
+        """컬럼별 min/max 세로선 + RMS 막대 (x0부터 한 픽셀에 한 컬럼)"""
+        top = (mid - maxs * half).astype(int)
+        bot = (mid - mins * half).astype(int)
+        rh = (rms * half).astype(int)
+        line = pygame.draw.line
+        for i in range(len(top)):
+            x = x0 + i
+            line(self.screen, color, (x, top[i]), (x, bot[i]))
+            if rh[i] > 0:
+                line(self.screen, rms_color, (x, mid - rh[i]), (x, mid + rh[i]))
@@ -1,6 +1,7 @@
 # scenes/bridge_scene.py (핵심 부분만)
 from scenes.base_scene import BaseScene
 from utils.constants import PC, RC, RR_CW, RR_CCW
+from utils.file_manager import append_library_pack
 import pygame
 
 class BridgeScene(BaseScene):
@@ -12,7 +13,12 @@ class BridgeScene(BaseScene):
     def enter(self, **kwargs):
         if kwargs.get("from_scene") == "loop_composition":
             # 꼬리 달아주기 애니메이션 (placeholder)
-            pass
+            tail_pack = kwargs.get("tail_pack")
+            if tail_pack:
+                try:
+                    append_library_pack(tail_pack)
+                except OSError as e:
+                    print(f"[Bridge] could not save tail pack: {e}")
 
     def update(self, dt, hw_state):
         if hw_state.get(RR_CW):  self.selected = (self.selected + 1) % len(self.options)
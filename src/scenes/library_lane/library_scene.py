@@ -3,43 +3,133 @@
 # ============================================
 """Library Scene - 사냥꾼의 창고"""
 
+import math
+import threading
 import pygame
 from scenes.base_scene import BaseScene
-from utils.constants import PC, RC, RR_CW, RR_CCW, PDC
+from audio.mixer import get_mixer
+from audio.prefetch import AudioPrefetcher, PackStream
+from audio.importer import BulkImport, scan
+from config import IMPORT_DIR
+from models.library_index import LibraryIndex
+from ui.components import VirtualList
+from ui.thumbnails import ThumbnailCache
+from utils.file_manager import load_library_packs, remove_library_pack, sweep_library_blobs
+from utils.constants import PC, RC, RR_CW, RR_CCW, PDC, PLC
+
+# 망원경 원 / 행 배치
+SCOPE_CENTER = (400, 240)
+SCOPE_RADIUS = 180
+ROW_H = 40
+THUMB_RECT = (250, 250, 300, 100)   # 상세 뷰 꼬리 시각화 영역
+PREFETCH_RADIUS = 4                 # 선택 주변 몇 개 팩의 썸네일을 미리 디코딩할지
+AUDIO_PREFETCH_RADIUS = 2           # 선택 주변 몇 개 팩의 오디오 앞부분을 미리 읽을지
 
 class LibraryScene(BaseScene):
     def __init__(self, screen, scene_manager):
         super().__init__(screen, scene_manager)
-        self.tail_packs = []  # 저장된 꼬리들
+        self.tail_packs = []  # 저장된 꼬리들 (최신순)
+        self.index = LibraryIndex()
         self.focus_distance = 50  # 망원경 초점 거리
-        self.selected_pack = 0
         self.view_mode = "TELESCOPE"  # TELESCOPE or DETAIL
+        # 가상 리스트: 원 안에 들어오는 행만 배치, 행 Surface는 캐시/재활용
+        self.vlist = VirtualList(self._render_row, key=lambda p: p.get("id"))
+        self.thumbs = ThumbnailCache()
+        self._prefetched_at = None
+        # 오디오 앞부분 프리패치 (워커 스레드, 씬에 있는 동안만) + 재생 중인 스트림
+        self.audio_prefetch = None
+        self.stream = None
+        # data/import/ 의 새 WAV 일괄 가져오기 (백그라운드, 끝나면 라이브러리 다시 로드)
+        self.bulk_import = None
+        # 상세 뷰 P-LC 한 번 = 삭제 대기, 한 번 더 = 삭제 (다른 입력이면 취소)
+        self._delete_armed = False
+        self._swept = False
+
+    @property
+    def selected_pack(self):
+        """tail_packs(최신순) 기준 선택 인덱스 — 가상 리스트가 관리"""
+        return self.vlist.selected
     
+    def exit(self):
+        self._stop_preview()
+        if self.audio_prefetch is not None:
+            self.audio_prefetch.close()      # 워커 스레드 종료 + 캐시된 앞부분 해제
+            self.audio_prefetch = None
+        if self.bulk_import is not None:
+            self.bulk_import.cancel()
+            self.bulk_import = None
+
     def enter(self, **kwargs):
+        if self.audio_prefetch is None:
+            self.audio_prefetch = AudioPrefetcher()
         # 라이브러리 로드
         self.load_library()
         self.focus_distance = 50
+        self._delete_armed = False
+        self.update_view()
+        if not self._swept:
+            # 참조되지 못한 블롭 정리는 세션당 한 번, 백그라운드에서
+            self._swept = True
+            threading.Thread(target=sweep_library_blobs, daemon=True).start()
+        self._start_import()
+
+    def _start_import(self):
+        sources = scan(IMPORT_DIR, self.tail_packs)
+        if sources:
+            self.bulk_import = BulkImport(sources).start()
+
+    def _poll_import(self):
+        imp = self.bulk_import
+        imp.poll()
+        if imp.finished:
+            self.bulk_import = None
+            if imp.entries:
+                self.load_library()
+                self.update_view()
     
     def load_library(self):
-        # TODO: 실제 파일에서 tail_packs 로드
-        # 더미 데이터
-        self.tail_packs = [
-            {"name": "Mystic Tail #1", "date": "2024-01-15", "layers": 3},
-            {"name": "Shadow Tail #2", "date": "2024-01-14", "layers": 2},
-        ]
+        # data/library/index.json (없으면 더미 데이터)
+        packs = load_library_packs()
+        if packs is None:
+            packs = [
+                {"name": "Mystic Tail #1", "date": "2024-01-15", "layers": 3},
+                {"name": "Shadow Tail #2", "date": "2024-01-14", "layers": 2},
+            ]
+        self.index = LibraryIndex(packs)
+        self.tail_packs = self.index.packs_by_date(newest_first=True)
+        self.vlist.set_items(self.tail_packs)
     
     def update(self, dt, hw_state):
-        # P-C: 뒤로 (Bridge로)
+        # P-LC: 상세 보기에서 팩 삭제 (두 번 눌러 확인)
+        if self.view_mode == "DETAIL" and hw_state.get(PLC):
+            if self._delete_armed:
+                self.delete_selected_pack()
+            self._delete_armed = not self._delete_armed
+        elif any(hw_state.get(k) for k in (PC, RC, RR_CW, RR_CCW, PDC)):
+            self._delete_armed = False
+
+        # P-C: 뒤로 (DETAIL → TELESCOPE, TELESCOPE → Recording)
         if hw_state.get(PC):
-            self.scene_manager.change_scene("recording")
+            if self.view_mode == "DETAIL":
+                self.view_mode = "TELESCOPE"
+            else:
+                self.scene_manager.change_scene("recording")
+                return
         
-        # R-R: 망원경 초점 조절
-        if hw_state.get(RR_CW):
-            self.focus_distance = min(100, self.focus_distance + 5)
-            self.update_view()
-        elif hw_state.get(RR_CCW):
-            self.focus_distance = max(0, self.focus_distance - 5)
-            self.update_view()
+        if self.view_mode == "TELESCOPE":
+            # R-R: 망원경 초점 조절
+            if hw_state.get(RR_CW):
+                self.focus_distance = min(100, self.focus_distance + 5)
+                self.update_view()
+            elif hw_state.get(RR_CCW):
+                self.focus_distance = max(0, self.focus_distance - 5)
+                self.update_view()
+        else:
+            # R-R: 상세 보기에서는 이웃 팩으로 한 칸씩
+            if hw_state.get(RR_CW):
+                self.vlist.move(1)
+            elif hw_state.get(RR_CCW):
+                self.vlist.move(-1)
         
         # R-C: 선택/훔치기
         if hw_state.get(RC):
@@ -51,12 +141,30 @@ class LibraryScene(BaseScene):
         # P-DC: 미리듣기
         if hw_state.get(PDC):
             self.preview_pack()
+        
+        # 선택이 바뀌면 주변 팩 썸네일 예약, 매 프레임 조금씩 디코딩
+        if self._prefetched_at != self.selected_pack:
+            self._prefetched_at = self.selected_pack
+            lo = max(0, self.selected_pack - PREFETCH_RADIUS)
+            self.thumbs.prefetch(self.tail_packs[lo:self.selected_pack + PREFETCH_RADIUS + 1])
+            self._prefetch_audio()
+        self.thumbs.pump()
+        if self.bulk_import is not None:
+            self._poll_import()
+
+        # 끝까지 재생한 스트림 정리
+        if self.stream is not None and self.stream.done:
+            self._stop_preview()
     
     def update_view(self):
         # 초점 거리에 따라 다른 콘텐츠 표시
         # 멀리: 오래된 꼬리들
         # 가까이: 최근 꼬리들
-        pass
+        # 초점 → 날짜 구간 → 이분 탐색 (프레임마다가 아니라 초점이 바뀔 때만)
+        # 초점 구간의 가장 최근 팩으로 선택을 옮기면 가상 리스트가 그 주변만 그림
+        hit = self.index.focus_slice(self.focus_distance)
+        if hit:
+            self.vlist.select(self.index.rank_of(hit[0][1]))
     
     def steal_tail_pack(self):
         # 꼬리 훔치기 (Export)
@@ -67,9 +175,59 @@ class LibraryScene(BaseScene):
             # 훔치기 애니메이션
             self.show_steal_animation()
     
+    def delete_selected_pack(self):
+        # 인덱스에서 삭제 → 블롭 참조 해제 (다른 팩이 안 쓰는 오디오/grid 파일은 지워짐)
+        pack = self.vlist.current()
+        if pack is None or pack.get("id") is None:    # 인덱스가 없을 때의 더미 팩
+            return
+        self._stop_preview()
+        try:
+            remove_library_pack(pack["id"])
+        except OSError as e:
+            print(f"[Library] could not delete {pack.get('name')}: {e}")
+            return
+        self.thumbs.discard(pack["id"])
+        self.load_library()
+        self._prefetched_at = None
+        if not self.tail_packs:
+            self.view_mode = "TELESCOPE"
+
+    def _prefetch_audio(self):
+        # 선택 팩 먼저, 그다음 가까운 이웃 순으로
+        sel = self.selected_pack
+        order = [sel]
+        for d in range(1, AUDIO_PREFETCH_RADIUS + 1):
+            order += [sel + d, sel - d]
+        paths = [self.tail_packs[i].get("audio_path") for i in order if 0 <= i < len(self.tail_packs)]
+        self.audio_prefetch.request(paths)
+
+    def _stop_preview(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream = None
+        get_mixer().stop_tag("pack")
+
     def preview_pack(self):
-        # 선택된 팩 미리듣기
-        pass
+        # 선택된 팩 미리듣기 (다시 누르면 정지)
+        mixer = get_mixer()
+        if self.stream is not None or mixer.is_playing("pack"):
+            self._stop_preview()
+            return
+        if not self.tail_packs or self.selected_pack >= len(self.tail_packs):
+            return
+        pack = self.tail_packs[self.selected_pack]
+        if pack.get("audio") is not None:
+            mixer.play(pack["audio"], tag="pack")
+            return
+        if not pack.get("audio_path"):
+            return
+        # 프리패치된 앞부분으로 즉시 시작, 나머지는 스트리밍
+        try:
+            entry = self.audio_prefetch.load_now(pack["audio_path"])
+        except (OSError, ValueError, EOFError) as e:
+            print(f"[Library] preview failed: {e}")
+            return
+        self.stream = PackStream(mixer, entry).start()
     
     def show_steal_animation(self):
         # TODO: 훔치기 애니메이션
@@ -82,6 +240,10 @@ class LibraryScene(BaseScene):
             self.draw_telescope_view()
         else:
             self.draw_detail_view()
+
+        if self.bulk_import is not None:
+            done, total = self.bulk_import.progress
+            self.draw_text(f"Importing {done}/{total}", 600, 30, (120, 170, 220))
     
     def draw_telescope_view(self):
         # 망원경 뷰
@@ -94,12 +256,19 @@ class LibraryScene(BaseScene):
         focus_text = f"Focus: {self.focus_distance}m"
         self.draw_text(focus_text, 340, 80, (100, 100, 100))
         
-        # 꼬리들 표시 (거리에 따라)
-        visible_packs = self.get_visible_packs()
-        for i, pack in enumerate(visible_packs[:5]):
-            y = 150 + i * 40
-            color = (200, 150, 100) if i == self.selected_pack else (100, 100, 100)
-            self.draw_text(pack["name"], 320, y, color)
+        # 꼬리들 표시 (거리에 따라) — 원 안의 행만
+        cx, cy = SCOPE_CENTER
+        first, last = self.vlist.window(self._rows_in_scope())
+        sel_row = self.vlist.selected - first
+        for i in range(first, last):
+            y = cy + (i - first - sel_row) * ROW_H
+            # 원의 현(chord) 폭 — 원 밖 행은 (목록 끝에서 창이 한쪽으로 밀려도) 렌더/캐시하지 않음
+            half = math.sqrt(max(0.0, SCOPE_RADIUS ** 2 - (y - cy) ** 2)) - 8
+            if half < 0.5:
+                continue
+            surf = self.vlist.row_surface(i)
+            w = min(surf.get_width(), int(2 * half))
+            self.screen.blit(surf, (cx - w // 2, y - surf.get_height() // 2), (0, 0, w, surf.get_height()))
         
         # 컨트롤
         self.draw_text("R-R: Focus | R-C: Select | P-C: Back", 220, 430, (80, 80, 80))
@@ -111,22 +280,37 @@ class LibraryScene(BaseScene):
             
             # 꼬리 상세 정보
             self.draw_text(pack["name"], 300, 100, (255, 200, 100))
-            self.draw_text(f"Created: {pack['date']}", 300, 140, (150, 150, 150))
-            self.draw_text(f"Layers: {pack['layers']}", 300, 180, (150, 150, 150))
+            self.draw_text(f"Created: {pack.get('date', '-')}", 300, 140, (150, 150, 150))
+            self.draw_text(f"Layers: {pack.get('layers', '-')}", 300, 180, (150, 150, 150))
             
             # 꼬리 시각화
             self.draw_tail_visualization(pack)
             
             # 컨트롤
-            self.draw_text("R-C: Steal (Export) | P-DC: Preview | P-C: Back", 200, 430, (80, 80, 80))
+            if self._delete_armed:
+                self.draw_text("P-LC again: Delete this tail", 260, 400, (230, 90, 90))
+            self.draw_text("R-C: Steal | P-DC: Preview | P-LC: Delete | P-C: Back", 170, 430, (80, 80, 80))
     
     def draw_tail_visualization(self, pack):
-        # 꼬리 모양 시각화
-        # TODO: 실제 꼬리 데이터 기반 시각화
-        pygame.draw.rect(self.screen, (100, 150, 200), (250, 250, 300, 100))
+        # 꼬리 모양 시각화 — export 때 만든 썸네일 (없으면 placeholder)
+        x, y, w, h = THUMB_RECT
+        surf = self.thumbs.get(pack, (w, h))
+        if surf is not None:
+            self.screen.blit(surf, (x, y))
+            return
+        pygame.draw.rect(self.screen, (100, 150, 200), THUMB_RECT)
         self.draw_text("Tail Visualization", 350, 290, (255, 255, 255))
     
     def get_visible_packs(self):
         # 초점 거리에 따라 보이는 팩 필터링
         # 가까울수록 최신, 멀수록 오래된 것
-        return self.tail_packs
\ No newline at end of file
+        first, last = self.vlist.window(self._rows_in_scope())
+        return self.tail_packs[first:last]
+
+    def _rows_in_scope(self):
+        # 선택 행이 원 중심 — 위/아래로 원 안에 들어오는 행 수
+        return 2 * ((SCOPE_RADIUS - ROW_H // 2) // ROW_H) + 1
+
+    def _render_row(self, pack, selected):
+        color = (200, 150, 100) if selected else (100, 100, 100)
+        return self.font.render(pack["name"], True, color)
\ No newline at end of file
@@ -6,17 +6,31 @@
 #   - P-DC: 프리뷰 / P-LC: 리셋(맥락별)
 #   - Sample Nav: 16th grid + P-C+R-R = 32nd 미세 이동(콤보 타임아웃)
 #   - 충돌 시 덮어쓰기, Bar 경계 자동 클리핑
+#   - 팔레트 템플릿 길이 = stone 길이 ÷ 현재 BPM의 32분음표 (BPM 바뀌면 배치된 클립도 함께)
 #   - Sample Adjust: Melody/Rhythm, Pitch(스케일/크로매틱), Gain
 # ============================================
 
+from datetime import datetime
+import numpy as np
 import pygame
 from scenes.base_scene import BaseScene
+from audio.mixer import get_mixer
+from audio.loop_engine import (LoopPlayer, render_bar, template_audio, sample_rate_factor, grid_job_inputs,
+                               BEATS_PER_BAR)
+from audio.worker import get_worker
+from audio import analysis
+from ui.thumbnails import render_thumbnail
+from utils import audio_store
+from utils.file_manager import new_pack_path
+from utils.pack_format import write_pack
+from utils import clock
 from utils.constants import PC, RC, RR_CW, RR_CCW, PDC, PLC
 
 # --- 기본 파라미터(없으면 이 값 사용) ---
 GRID_STEPS = 16          # 1 bar = 16분음표 그리드
 FINE_STEPS = 32          # P-C+R-R 콤보 시 32분음표 정밀도
 MAX_LAYERS = 8
+DEFAULT_TPL_TICKS = FINE_STEPS // 8   # 길이를 모르는 stone (오디오 없음): 1/8 note
 PC_COMBO_MS = 350        # P-C 누른 뒤 이 시간 내 R-R이 오면 '콤보'로 간주
 
 MAJOR_SCALE = [0, 2, 4, 5, 7, 9, 11]  # 장음계(반음 오프셋)
@@ -55,34 +69,151 @@ class LoopCompositionScene(BaseScene):
         self._sa_focus_idx = 0      # index within focusable list [Toggle,(Pitch),Gain]
 
         # 샘플 팔레트(Work Lane에서 넘어온 최신 sound_stone)
-        self.palette = []            # [{id, name, length_ticks, data...}]
+        self.palette = []            # [{id, name, length(ticks), duration(sec), data...}]
         self.palette_idx = 0
+        # 템플릿 길이(초) 벡터 + BPM별 틱 길이 캐시 {bpm: int 배열} — 팔레트가 늘면 비움
+        self._tpl_durations = np.zeros(0)
+        self._tpl_ticks = {}
 
         # P-C + R-R 콤보 처리(Modifier)
         self._pc_combo_started = False
         self._pc_combo_deadline = 0
 
-        # 재생 상태(프리뷰)
+        # 재생 상태(프리뷰) — 트랜스포트가 오디오 프레임 기준으로 진행
         self.playing = False
+        self.loop_player = None
+
+        # Next → 믹스다운을 오디오 워커에서 렌더한 뒤 Bridge로
+        self.export_job = None
+        self._export_pack = None
+
+        # 들어온 stone의 템포/키 추정 (워커, 샘플 버전마다 캐시) → 손대지 않은 BPM/Key의 시작값
+        self.analysis_job = None
+        self.detected = None             # {"bpm", "key_idx", ...} 마지막 추정 결과
+        self._bpm_set_by_user = False
+        self._key_set_by_user = False
 
     # ---------- Scene lifecycle ----------
     def enter(self, **kwargs):
         if "sound_stone" in kwargs and kwargs["sound_stone"] is not None:
             self._ingest_sound_stone(kwargs["sound_stone"])
 
-    def exit(self): pass
+    def exit(self):
+        if self.loop_player is not None:
+            self.loop_player.stop()
+        self.playing = False
+        get_worker().cancel(self.export_job)
+        self.export_job = None
+        get_worker().cancel(self.analysis_job)
+        self.analysis_job = None
 
     # ---------- Helpers ----------
     def _ingest_sound_stone(self, stone):
-        # 데모용 length: 4 * 32nd = 1/8 note (원하면 조정)
+        duration = self._stone_duration(stone)
         item = {
             "id": len(self.palette),
             "name": "Stone {}".format(len(self.palette)),
-            "length": max(1, FINE_STEPS // 8),   # ticks (32분 기준)
+            "length": DEFAULT_TPL_TICKS,   # ticks (32분 기준) — 아래 _template_ticks로 갱신
+            "duration": duration,          # 초 (None이면 DEFAULT_TPL_TICKS 고정)
             "data": stone
         }
         self.palette.append(item)
         self.palette_idx = len(self.palette) - 1
+        self._tpl_durations = np.append(self._tpl_durations, np.nan if duration is None else duration)
+        self._tpl_ticks.clear()
+        self._retime_templates()
+        self._request_analysis(stone)
+
+    def _stone_duration(self, stone):
+        audio = self._stone_audio(stone)
+        if audio is None or not len(audio["data"]):
+            return None
+        return len(audio["data"]) / float(audio.get("sample_rate", get_mixer().sample_rate))
+
+    def _template_ticks(self, bpm):
+        """팔레트 전체의 32분음표 틱 길이 (BPM별 캐시, 1..FINE_STEPS)"""
+        ticks = self._tpl_ticks.get(bpm)
+        if ticks is None:
+            tick_sec = 60.0 / bpm * BEATS_PER_BAR / FINE_STEPS
+            d = self._tpl_durations
+            ticks = np.where(np.isnan(d), DEFAULT_TPL_TICKS,
+                             np.clip(np.rint(np.nan_to_num(d) / tick_sec), 1, FINE_STEPS)).astype(np.int64)
+            self._tpl_ticks[bpm] = ticks
+        return ticks
+
+    def _retime_templates(self):
+        """
+        현재 BPM으로 템플릿 길이와 배치된 클립 경계를 한 번에 갱신.
+        클립 길이 = min(템플릿 틱, 같은 레인 다음 클립 시작, bar 끝) - 시작 (최소 1)
+        """
+        ticks = self._template_ticks(self.bpm)
+        for item, t in zip(self.palette, ticks):
+            item["length"] = int(t)
+
+        # 레인 순서로 평탄화 (레인 안은 start 순으로 정렬돼 있음)
+        index = {id(item): i for i, item in enumerate(self.palette)}
+        lanes = [samples for bar in self.grid for samples in bar]
+        clips = [s for samples in lanes for s in samples]
+        if not clips:
+            return
+        lane_id = np.repeat(np.arange(len(lanes)), [len(samples) for samples in lanes])
+        starts = np.fromiter((s["start"] for s in clips), dtype=np.int64, count=len(clips))
+        # 팔레트 밖 템플릿(-1)은 현재 길이 유지 — 경계 계산에는 참여
+        tpl_idx = np.fromiter((index.get(id(s.get("tpl")), -1) for s in clips), dtype=np.int64, count=len(clips))
+        current = np.fromiter((s["length"] for s in clips), dtype=np.int64, count=len(clips))
+        want = np.where(tpl_idx >= 0, ticks[np.maximum(tpl_idx, 0)] if len(ticks) else current, current)
+
+        nxt = np.full(len(clips), FINE_STEPS)
+        same = lane_id[1:] == lane_id[:-1]
+        nxt[:-1][same] = starts[1:][same]
+        lengths = np.maximum(1, np.minimum(starts + want, nxt) - starts)
+        for s, n in zip(clips, lengths.tolist()):
+            s["length"] = n
+
+    def _set_bpm(self, bpm):
+        bpm = clamp(bpm, 40, 220)
+        if bpm != self.bpm:
+            self.bpm = bpm
+            self._retime_templates()
+
+    def _stone_audio(self, stone):
+        audio = stone.get("processed_audio") if isinstance(stone, dict) else None
+        return audio if isinstance(audio, dict) and audio.get("data") is not None else None
+
+    def _request_analysis(self, stone):
+        """템포/키 추정: 샘플 버전(processed_audio)에 캐시가 있으면 바로, 없으면 워커에서"""
+        audio = self._stone_audio(stone)
+        if audio is None:
+            return
+        if audio.get("analysis") is not None:
+            self._apply_analysis(audio["analysis"])
+            return
+        worker = get_worker()
+        worker.cancel(self.analysis_job)
+        self.analysis_job = worker.submit(
+            "analysis", {"audio": audio["data"]},
+            {"sample_rate": audio.get("sample_rate", get_mixer().sample_rate)},
+            callback=lambda job: self._on_analysis(job, audio))
+
+    def _on_analysis(self, job, audio):
+        if job is not self.analysis_job:
+            return
+        self.analysis_job = None
+        result = analysis.unpack(job.result) if job.result is not None else None
+        if result is None:
+            return
+        audio["analysis"] = result
+        self._apply_analysis(result)
+
+    def _apply_analysis(self, result):
+        """추정값을 시작값으로 제안 — 사용자가 이미 돌린 값은 건드리지 않음"""
+        self.detected = result
+        if result["bpm"] > 0 and not self._bpm_set_by_user:
+            self._set_bpm(int(round(result["bpm"])))
+        if result["key_confidence"] > 0 and not self._key_set_by_user:
+            self.key_idx = result["key_idx"]
+        if self.playing:
+            self._sync_loop_player()
 
     def _ensure_min_layers(self, n):
         while len(self.layers) < n:
@@ -116,8 +247,15 @@ class LoopCompositionScene(BaseScene):
 
     # ---------- Update ----------
     def update(self, dt, hw):
+        # 믹스다운 중에는 입력을 받지 않고 완료만 기다림
+        if self.export_job is not None:
+            get_worker().poll()
+            return
+        if self.analysis_job is not None:
+            get_worker().poll()
+
         # 콤보 만료 처리
-        if self._pc_combo_started and pygame.time.get_ticks() > self._pc_combo_deadline:
+        if self._pc_combo_started and clock.ticks_ms() > self._pc_combo_deadline:
             # 콤보 시간 내 R-R이 없었다면 "Back"으로 처리
             self._pc_combo_started = False
             self._back_action()
@@ -141,6 +279,18 @@ class LoopCompositionScene(BaseScene):
         elif self.mode == "SAMPLE_ADJUST":
             self._update_sample_adjust(hw)
 
+        # 재생 중 편집 → 시퀀서에 반영 (BPM/Bars는 다음 bar 경계에서 적용)
+        if self.playing and any(hw.values()):
+            self._sync_loop_player()
+
+    def _sync_loop_player(self):
+        lp = self.loop_player
+        if lp is None:
+            return
+        lp.set_bpm(self.bpm)
+        lp.set_bars(self.bars)
+        lp.refresh(self.grid)
+
     # ----- Mode 1: Loop Adjust -----
     def _update_loop_adjust(self, hw):
         # 포커스 항목 개수
@@ -159,12 +309,8 @@ class LoopCompositionScene(BaseScene):
                     # BPM/Key/Bars 조정 모드로 진입 (값 즉시 변경 X)
                     self.loop_adj_submode = "ADJUST"
                 elif self.loop_focus == 4:
-                    # Next → Bridge
-                    self.scene_manager.change_scene(
-                        "bridge",
-                        from_scene="loop_composition",
-                        tail_pack=self._export_tail_pack()
-                    )
+                    # Next → 믹스다운 렌더 후 Bridge
+                    self._start_export()
 
             # 최상위라 P-C는 무시
             if hw.get(PC):
@@ -175,9 +321,11 @@ class LoopCompositionScene(BaseScene):
             if hw.get(RR_CW) or hw.get(RR_CCW):
                 d = 1 if hw.get(RR_CW) else -1
                 if self.loop_focus == 1:       # BPM
-                    self.bpm = clamp(self.bpm + d, 40, 220)
+                    self._set_bpm(self.bpm + d)
+                    self._bpm_set_by_user = True
                 elif self.loop_focus == 2:     # Key
                     self.key_idx = (self.key_idx + d) % len(KEYS)
+                    self._key_set_by_user = True
                 elif self.loop_focus == 3:     # Bars
                     old = self.bars
                     self.bars = clamp(self.bars + d, 1, 16)
@@ -246,7 +394,7 @@ class LoopCompositionScene(BaseScene):
         # P-C 콤보 관문
         if hw.get(PC):
             self._pc_combo_started = True
-            self._pc_combo_deadline = pygame.time.get_ticks() + PC_COMBO_MS
+            self._pc_combo_deadline = clock.ticks_ms() + PC_COMBO_MS
             # Back은 콤보가 실패했을 때 실행됨(위 update()에서)
 
         step = FINE_STEPS // 1  # 기본: 32분음표 단위
@@ -337,7 +485,7 @@ class LoopCompositionScene(BaseScene):
         # --- P-C: Pitch 조정 시 크로매틱 모드(콤보) / 실패 시 Back ---
         if hw.get(PC):
             self._pc_combo_started = True
-            self._pc_combo_deadline = pygame.time.get_ticks() + PC_COMBO_MS
+            self._pc_combo_deadline = clock.ticks_ms() + PC_COMBO_MS
             # 콤보 실패 시 Back은 상위 update()의 만료 처리에서 수행
 
         # --- R-R: FOCUS에선 항목 이동, ADJUST에선 값 변경 ---
@@ -457,15 +605,35 @@ class LoopCompositionScene(BaseScene):
 
     def _toggle_preview(self):
         self.playing = not self.playing
-        # TODO: 실제 오디오 루프 미리듣기
+        if self.loop_player is None:
+            self.loop_player = LoopPlayer(get_mixer(), self.bpm, self.bars)
+        if self.playing:
+            self.loop_player.set_bpm(self.bpm)
+            self.loop_player.set_bars(self.bars)
+            self.loop_player.start(self.grid)
+        else:
+            self.loop_player.stop()
+
+    def _playhead(self):
+        """(bar, tick 소수) 또는 None"""
+        if self.playing and self.loop_player is not None:
+            return self.loop_player.playhead()
+        return None
 
     def _preview_layer(self, bar, layer):
-        # TODO: 해당 레이어만 프리뷰
-        print(f"[Preview] Bar {bar}, Layer {layer}")
+        # 해당 bar의 레이어 하나만 1회 재생
+        mixer = get_mixer()
+        mixer.stop_tag("preview")
+        mixer.play(render_bar(self.grid[bar], self.bpm, only_layer=layer), tag="preview")
 
     def _preview_sample(self, sample):
-        # TODO: 개별 샘플 프리뷰
-        print(f"[Preview] Sample gain={sample['gain']} pitch={sample['pitch']}")
+        # 개별 샘플: 원본 템플릿을 pitch/gain 그대로 재생
+        audio = template_audio(sample.get("tpl"))
+        if audio is None:
+            return
+        mixer = get_mixer()
+        mixer.stop_tag("preview")
+        mixer.play(audio, gain=sample["gain"] / 100.0, rate=sample_rate_factor(sample), tag="preview")
 
     # ---------- Draw ----------
     def draw(self):
@@ -475,6 +643,8 @@ class LoopCompositionScene(BaseScene):
         self.draw_text(top, 20, 20, (160, 160, 170))
         mode_txt = f"[{self.mode}]"
         self.draw_text(mode_txt, 680, 20, (120, 170, 220))
+        if self.export_job is not None:
+            self.draw_text("Exporting...", 340, 20, (230, 210, 150))
 
         if self.mode == "LOOP_ADJUST":
             self._draw_loop_adjust()
@@ -518,6 +688,17 @@ class LoopCompositionScene(BaseScene):
                 x = x0 + int(W * b / self.bars)
                 pygame.draw.line(self.screen, col_grid_light, (x, y0), (x, y0 + H), 1)
 
+        # 재생 위치
+        ph = self._playhead()
+        if ph is not None and self.bars > 0:
+            px = x0 + int(W * (ph[0] + ph[1] / FINE_STEPS) / self.bars)
+            pygame.draw.line(self.screen, (120, 230, 160), (px, y0), (px, y0 + H), 2)
+
+        if ph is not None:
+            st = self.loop_player.stats()
+            if st["underruns"]:
+                self.draw_text(f"underruns {st['underruns']}", x0 + W - 150, y0 + H + 6, (230, 120, 120))
+
         # 포커스 링(Loop 선택 중일 때만)
         if sel_loop:
             pygame.draw.rect(self.screen, col_focus, (x0 - 3, y0 - 3, W + 6, H + 6), 2, border_radius=14)
@@ -545,6 +726,18 @@ class LoopCompositionScene(BaseScene):
 
             x += 160  # 칩 간 간격
 
+        # 추정값 (제안으로 채워졌거나 사용자가 바꾼 뒤에도 참고용으로)
+        if self.analysis_job is not None:
+            self.draw_text("Detecting tempo/key...", 110, 240, col_text_dim)
+        elif self.detected is not None:
+            parts = []
+            if self.detected["bpm"] > 0:
+                parts.append(f"{self.detected['bpm']:.0f} BPM")
+            if self.detected["key_confidence"] > 0:
+                parts.append(KEYS[self.detected["key_idx"]])
+            if parts:
+                self.draw_text("Detected: " + " / ".join(parts), 110, 240, col_text_dim)
+
         # --- 힌트 ---
         if self.loop_adj_submode == "FOCUS":
             hint = "R-R: Move focus  |  R-C: Drill/Adjust  |  P-DC: Preview"
@@ -634,6 +827,12 @@ class LoopCompositionScene(BaseScene):
             # 미니 헤드 마커
             pygame.draw.rect(self.screen, (230, 210, 250), (sx + 1, y0 + 16, 2, H - 32))
 
+        # 재생 위치(현재 bar를 지날 때만)
+        ph = self._playhead()
+        if ph is not None and ph[0] == self.current_bar:
+            px = x0 + int(W * ph[1] / FINE_STEPS)
+            pygame.draw.line(self.screen, (120, 230, 160), (px, y0), (px, y0 + H), 1)
+
         # 커서(32nd 정밀)
         cx = x0 + int(W * (self.tick / FINE_STEPS))
         pygame.draw.line(self.screen, (255, 210, 120), (cx, y0), (cx, y0 + H), 2)
@@ -725,8 +924,11 @@ class LoopCompositionScene(BaseScene):
 
     # --- Tail Pack Export ---
     def _export_tail_pack(self):
-        """Bridge로 넘길 TailPack 생성"""
-        return {
+        """Bridge로 넘길 TailPack 생성 (라이브러리용 썸네일 포함)"""
+        pack = {
+            "name": f"Tail {datetime.now():%m%d-%H%M%S}",
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "duration": self.bars * BEATS_PER_BAR * 60.0 / self.bpm,
             "bpm": self.bpm,
             "key": KEYS[self.key_idx],
             "bars": self.bars,
@@ -749,3 +951,60 @@ class LoopCompositionScene(BaseScene):
                 for b in range(self.bars)
             ],
         }
+        pack["thumb"] = render_thumbnail(pack)
+        return pack
+
+    def _save_templates(self):
+        """
+        grid에 쓰인 템플릿 오디오를 저장소에 저장 → {tpl_name: {"blob", "sample_rate", "source", "craft"}}
+        (tools/batch_render가 팩을 다시 렌더할 때 읽음 — source/craft가 있으면 DSP부터 다시)
+        같은 오디오는 한 블롭 — 해시는 샘플 버전(processed_audio)에 캐시
+        """
+        used = {id(s["tpl"]): s["tpl"] for bar in self.grid[:self.bars] for layer in bar
+                for s in layer if s.get("tpl")}
+        out = {}
+        for tpl in used.values():
+            audio = self._stone_audio(tpl["data"])
+            if audio is None:
+                continue
+            sr = audio.get("sample_rate", get_mixer().sample_rate)
+            if audio.get("blob") is None:
+                audio["blob"] = audio_store.write_blob(audio["data"], sr)
+            entry = {"blob": audio["blob"], "sample_rate": sr}
+            if audio.get("source"):
+                entry["source"] = audio["source"]
+            if audio.get("craft") is not None:
+                entry["craft"] = dict(audio["craft"])
+            out[tpl["name"]] = entry
+        return out
+
+    def _start_export(self):
+        """TailPack 메타데이터는 즉시, 믹스다운은 오디오 워커에서 (끝나면 _on_mixdown)"""
+        self._export_pack = self._export_tail_pack()
+        arrays, plain = grid_job_inputs(self.grid)
+        self.export_job = get_worker().submit("mixdown", arrays, {"grid": plain, "bpm": self.bpm},
+                                              callback=self._on_mixdown)
+
+    def _on_mixdown(self, job):
+        if job is not self.export_job:
+            return
+        self.export_job = None
+        pack, self._export_pack = self._export_pack, None
+        # 라이브러리 미리듣기용 믹스다운 (Library는 앞부분만 프리패치해 바로 재생)
+        if job.result is not None:
+            try:
+                digest = audio_store.write_blob(job.result)
+                pack["audio_blob"], pack["audio_path"] = digest, audio_store.blob_path(digest)
+            except OSError as e:
+                print(f"[LoopComposition] mixdown save failed: {e}")
+        try:
+            pack["templates"] = self._save_templates()
+        except OSError as e:
+            print(f"[LoopComposition] template save failed: {e}")
+        # grid는 .tailpack(열 배열)으로 — 라이브러리 인덱스에는 메타데이터만
+        try:
+            pack["pack_path"] = write_pack(new_pack_path(), pack)
+            del pack["grid"]
+        except OSError as e:
+            print(f"[LoopComposition] pack save failed: {e}")
+        self.scene_manager.change_scene("bridge", from_scene="loop_composition", tail_pack=pack)
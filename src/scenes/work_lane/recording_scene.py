@@ -3,16 +3,20 @@
 # ============================================
 """Recording Scene - Work Lane의 첫 번째 씬"""
 
+import math
 import pygame
-import numpy as np
 from scenes.base_scene import BaseScene
-from audio.recorder import AudioRecorder
 from utils.constants import PC, RC, RR_CW, RR_CCW, PDC, PLC, REC
 
+LIVE_RECT = (100, 70, 580, 100)     # 녹음 중 스크롤 파형 영역
+METER_RECT = (700, 70, 16, 100)     # 레벨 미터(peak/RMS)
+
 class RecordingScene(BaseScene):
     def __init__(self, screen, scene_manager):
         super().__init__(screen, scene_manager)
-        self.recorder = AudioRecorder()
+        # 레코더/파형(numpy)은 첫 녹음 때 만든다 — 첫 화면을 빨리 띄우기 위해
+        self._recorder = None
+        self._live = None
         self.is_recording = False
         self.is_playing = False
         self.recorded_sample = None
@@ -21,6 +25,21 @@ class RecordingScene(BaseScene):
         # UI 상태
         self.state = "PRE_RECORD"  # PRE_RECORD, RECORDING, POST_RECORD
     
+    @property
+    def recorder(self):
+        if self._recorder is None:
+            from audio.recorder import AudioRecorder
+            self._recorder = AudioRecorder()
+        return self._recorder
+
+    @property
+    def live(self):
+        # 녹음 중 스크롤 파형 + 레벨 미터 (블록 단위 증분 계산)
+        if self._live is None:
+            from audio.waveform import LiveWaveform
+            self._live = LiveWaveform(columns=LIVE_RECT[2])
+        return self._live
+
     def enter(self, **kwargs):
         self.state = "PRE_RECORD"
         self.recorded_sample = None
@@ -41,10 +60,18 @@ class RecordingScene(BaseScene):
             if hw_state.get(REC):
                 self.stop_recording()
             
+            # 새로 캡처된 블록만 파형/미터에 반영
+            for block in self.recorder.poll_blocks():
+                self.live.push(block)
+            self.live.decay(dt)
+            
             # 애니메이션 업데이트
             self.animation_frame += dt * 10
         
         elif self.state == "POST_RECORD":
+            # 샘플 끝까지 재생되면 Play 표시 해제
+            if self.is_playing and not self.recorder.is_playing():
+                self.is_playing = False
             if hw_state.get(RC):  self.proceed_to_next()
             if hw_state.get(PDC): self.toggle_playback()
             if hw_state.get(PLC): self.state = "PRE_RECORD"; self.recorded_sample = None
@@ -52,6 +79,7 @@ class RecordingScene(BaseScene):
     def start_recording(self):
         self.state = "RECORDING"
         self.is_recording = True
+        self.live.reset()
         self.recorder.start()
     
     def stop_recording(self):
@@ -97,18 +125,40 @@ class RecordingScene(BaseScene):
     
     def draw_recording_ui(self):
         # 녹음 중 애니메이션
-        radius = 40 + np.sin(self.animation_frame) * 10
-        color = (255, 100 + np.sin(self.animation_frame) * 50, 100)
+        radius = 40 + math.sin(self.animation_frame) * 10
+        color = (255, 100 + math.sin(self.animation_frame) * 50, 100)
         pygame.draw.circle(self.screen, color, (400, 240), int(radius))
         
+        self.draw_live_waveform()
+        
         # 상태 표시
         self.draw_text("RECORDING...", 340, 320, (255, 100, 100))
         self.draw_text("Press REC to stop", 320, 380, (150, 150, 150))
     
+    def draw_live_waveform(self):
+        x, y, w, h = LIVE_RECT
+        pygame.draw.rect(self.screen, (30, 36, 44), LIVE_RECT)
+        mins, maxs, rms = self.live.snapshot()
+        # 최신 컬럼이 오른쪽 끝에 오도록 스크롤
+        self.draw_waveform_columns(mins, maxs, rms, x + w - len(mins), y + h // 2, h / 2.0,
+                                   (200, 90, 90), (255, 170, 160))
+        
+        # 레벨 미터: RMS 막대 + peak hold 라인
+        mx, my, mw, mh = METER_RECT
+        pygame.draw.rect(self.screen, (40, 44, 52), METER_RECT)
+        rms_h = int(mh * min(1.0, self.live.rms))
+        pygame.draw.rect(self.screen, (120, 200, 120), (mx, my + mh - rms_h, mw, rms_h))
+        hold_y = my + mh - int(mh * min(1.0, self.live.peak_hold))
+        hold_col = (255, 80, 80) if self.live.peak_hold >= 0.99 else (240, 230, 120)
+        pygame.draw.line(self.screen, hold_col, (mx, hold_y), (mx + mw, hold_y), 2)
+    
     def draw_post_record_ui(self):
         # 녹음된 샘플 시각화
         pygame.draw.rect(self.screen, (50, 100, 150), (250, 150, 300, 100))
-        self.draw_text("Sample Recorded", 310, 190, (255, 255, 255))
+        peaks = self.recorded_sample.get("peaks") if self.recorded_sample else None
+        if peaks is not None:
+            self.draw_waveform(peaks, (250, 150, 300, 100))
+        self.draw_text("Sample Recorded", 310, 120, (255, 255, 255))
         
         # 컨트롤 옵션
         controls = [
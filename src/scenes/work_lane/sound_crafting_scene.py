@@ -3,17 +3,27 @@
 # - Tools (카루셀): Trim - Beginning, Trim - End, Reverse, Speed, EQ - Low Pass, EQ - High Pass, Next
 # - NAVIGATE: 중앙에 선택 툴이 수평 정렬된 카루셀(좌/우 이웃 포함)
 # - ADJUST: 선택 툴 하나만 + Sound Stone + 전용 커서/슬라이더
-#   * Trim: 절대 초 단위 (R-R=0.5s, P-C+R-R=0.05s), 핸들 스위치 없음, 핸들별 툴 분리
-#   * Speed: 0.01x ~ 50x (로그 바 표시, 중앙 x1.0 라인), R-R으로 배율 변경, R-C로 Confirm
+#   * Trim: R-R=다음/이전 onset·무음 경계로 스냅 (후보가 없으면 0.5s), P-C+R-R=0.05s,
+#           핸들 스위치 없음, 핸들별 툴 분리
+#   * Speed: 0.01x ~ 50x (로그 바 표시, 중앙 x1.0 라인), R-R으로 배율 변경, R-C로 Confirm,
+#            P-LC로 피치 유지(keep pitch) 토글
 #   * LP/HP: 기존과 동일(Hz), R-R 변경, R-C Confirm
 #   * Reverse: R-C 토글
 #   * 모든 툴: ADJUST 재진입 시 커서/표시값을 latest confirm 기준으로 세팅
 # - P-C: NAVIGATE로 복귀, P-DC: 프리뷰 토글
+#   * 프리뷰는 스트리밍(CraftPreview): ADJUST 중엔 confirm 전 값을 R-R 디텐트마다 다음 오디오 블록부터 반영
 
 import math
 import pygame
 from scenes.base_scene import BaseScene
-from utils.constants import PC, RC, RR_CW, RR_CCW, PDC
+from audio.waveform import PeakPyramid
+from audio.mixer import get_mixer
+from audio.worker import get_worker
+from audio.stream import CraftPreview
+from audio import features, onsets
+from utils import clock
+from config import SAMPLE_RATE
+from utils.constants import PC, RC, RR_CW, RR_CCW, PDC, PLC
 
 # -------------------------------
 # 설정/상수
@@ -38,6 +48,9 @@ SPEED_FINE   = 1.01   # (옵션) Trim처럼 P-C 콤보를 쓰고 싶으면 ×1.0
 LP_MIN, LP_MAX = 200, 20000
 HP_MIN, HP_MAX = 20, 5000
 
+TRIM_ZOOM_SEC = 2.0   # Trim 패널 확대 스트립이 보여주는 구간 길이(초)
+TRIM_PREVIEW_LEAD_SEC = 1.0   # Trim - End 조정 중 프리뷰: 끝점 몇 초 전부터 들려줄지
+
 # -------------------------------
 # Scene 구현
 # -------------------------------
@@ -46,6 +59,8 @@ class SoundCraftingScene(BaseScene):
         super().__init__(screen, scene_manager)
         self.sample = None
         self.sound_stone = None
+        self.peaks = None                # 파형 피크 피라미드(샘플당 1회 계산)
+        self.trim_points = None          # Trim 스냅 후보(초, 정렬) — 샘플당 1회
 
         self.mode = "NAVIGATE"           # "NAVIGATE" | "ADJUST"
         self.current_tool = 0            # 카루셀 중심 툴 인덱스
@@ -60,32 +75,56 @@ class SoundCraftingScene(BaseScene):
             "Trim - Beginning": {"sec": 0.00, "last_confirm": 0.00},
             "Trim - End":       {"sec": 0.00, "last_confirm": 0.00},
             "Reverse":          {"on": False},
-            "Speed":            {"value": 1.00, "last_confirm": 1.00},     # 배율
+            "Speed":            {"value": 1.00, "last_confirm": 1.00, "keep_pitch": False},  # 배율
             "EQ - Low Pass":    {"cutoff": 20000, "last_confirm": 20000},
             "EQ - High Pass":   {"cutoff": 20,    "last_confirm": 20},
         }
         self.preview_on = False
+        self.preview_stream = None       # 스트리밍 프리뷰 (CraftPreview)
+
+        # 오디오 워커 렌더 (confirm마다 비동기 작업, 최신 요청만 유효)
+        self.render_job = None
+        self.stone_peaks = None          # 처리된 오디오 파형 (Sound Stone 카드)
+        self._next_after_render = False  # 렌더 중 Next → 끝나면 넘어감
+
+        # Sound Stone 디스크립터 (샘플 버전마다 워커에서 한 번)
+        self.features_job = None
+        self._stone_surf = None          # 비주얼이 바뀔 때만 다시 그림
 
     # -------- lifecycle --------
     def enter(self, **kwargs):
         self.sample = kwargs.get("sample")
         self._generate_sound_stone()
+        get_worker().warm_up()
 
     def _generate_sound_stone(self):
-        # 실제 오디오 처리 대신 구조만 유지
         # duration_sec: 있으면 사용, 없으면 기본 10초
+        # 비주얼은 디스크립터가 준비되면 (캐시 또는 워커 "features" 작업) 채워짐
         duration = 10.0
         if isinstance(self.sample, dict):
-            duration = float(self.sample.get("duration_sec", duration))
+            duration = float(self.sample.get("duration_sec", self.sample.get("duration", duration)))
+        self.peaks = PeakPyramid.for_sample(self.sample)
+        self.trim_points = onsets.for_sample(self.sample)
         self.sound_stone = {
-            "visual": "stone",
+            "visual": None,
+            "descriptors": None,
             "properties": {"duration_sec": duration},
             "processed_audio": self.sample
         }
+        self._stone_surf = None
+        self._request_features(self.sample)
         # Trim End 기본값을 파일 길이(최근 컨펌도 동일)로 초기화
         self.params["Trim - End"]["sec"] = duration
         self.params["Trim - End"]["last_confirm"] = duration
 
+    def exit(self):
+        if self.preview_on:
+            self._toggle_preview()
+        get_worker().cancel(self.render_job)
+        self.render_job = None
+        get_worker().cancel(self.features_job)
+        self.features_job = None
+
     # -------- 공통 도우미 --------
     def _duration_sec(self):
         return float(self.sound_stone["properties"].get("duration_sec", 10.0)) if self.sound_stone else 10.0
@@ -105,10 +144,18 @@ class SoundCraftingScene(BaseScene):
 
     # -------- update --------
     def update(self, dt, hw):
+        # 끝난 렌더/특징 추출 작업 콜백
+        if self.render_job is not None or self.features_job is not None:
+            get_worker().poll()
+        if self._next_after_render:
+            # Next 대기 중: 렌더가 끝나면 넘어가고 그 전엔 입력 무시
+            if self.render_job is None:
+                self._go_next()
+            return
+
         # 공통: 프리뷰 토글
         if hw.get(PDC):
-            self.preview_on = not self.preview_on
-            # TODO: 실제 오디오 프리뷰 처리
+            self._toggle_preview()
 
         if self.mode == "NAVIGATE":
             self._update_navigate(hw)
@@ -124,8 +171,11 @@ class SoundCraftingScene(BaseScene):
         if hw.get(RC):
             tool = TOOLS[self.current_tool]
             if tool == "Next":
-                # 다음 씬으로
-                self.scene_manager.change_scene("loop_composition", sound_stone=self.sound_stone)
+                # 다음 씬으로 (렌더 중이면 끝난 뒤)
+                if self.render_job is not None:
+                    self._next_after_render = True
+                else:
+                    self._go_next()
                 return
             self.selected_tool = tool
             self.mode = "ADJUST"
@@ -142,24 +192,19 @@ class SoundCraftingScene(BaseScene):
             self.mode = "NAVIGATE"
             self.selected_tool = None
             self._pc_combo_started = False
+            self._sync_preview()          # confirm 안 한 값은 프리뷰에서도 되돌림
             return
 
         # Trim 전용: P-C + R-R 콤보(미세 0.05s)
         if tool.startswith("Trim") and hw.get(PC):
             self._pc_combo_started = True
-            self._pc_combo_deadline = pygame.time.get_ticks() + PC_COMBO_MS
+            self._pc_combo_deadline = clock.ticks_ms() + PC_COMBO_MS
 
         # 값 변경
         if hw.get(RR_CW) or hw.get(RR_CCW):
             d = 1 if hw.get(RR_CW) else -1
-            if tool == "Trim - Beginning":
-                step = 0.05 if self._is_pc_combo_alive() else 0.5
-                self.params[tool]["sec"] += d * step
-                self._ensure_trim_bounds()
-                self._consume_pc_combo()
-            elif tool == "Trim - End":
-                step = 0.05 if self._is_pc_combo_alive() else 0.5
-                self.params[tool]["sec"] += d * step
+            if tool in ("Trim - Beginning", "Trim - End"):
+                self.params[tool]["sec"] = self._trim_step(self.params[tool]["sec"], d)
                 self._ensure_trim_bounds()
                 self._consume_pc_combo()
             elif tool == "Speed":
@@ -172,6 +217,14 @@ class SoundCraftingScene(BaseScene):
             elif tool == "EQ - High Pass":
                 self.params[tool]["cutoff"] = max(HP_MIN, min(HP_MAX, self.params[tool]["cutoff"] + d * 20))
             # Reverse는 R-R 없음
+            if tool != "Reverse":
+                self._sync_preview(seek=self._preview_seek(tool))
+
+        # Speed 전용: P-LC 피치 유지 토글 (Reverse처럼 바로 반영)
+        if tool == "Speed" and hw.get(PLC):
+            self.params["Speed"]["keep_pitch"] = not self.params["Speed"]["keep_pitch"]
+            self._request_render()
+            self._sync_preview()
 
         # Confirm / Toggle
         if hw.get(RC):
@@ -188,11 +241,21 @@ class SoundCraftingScene(BaseScene):
             elif tool == "EQ - High Pass":
                 self.params["EQ - High Pass"]["last_confirm"] = self.params["EQ - High Pass"]["cutoff"]
             # 컨펌해도 ADJUST 유지
+            self._request_render()
+            self._sync_preview()
 
         # 콤보 타임아웃
-        if self._pc_combo_started and pygame.time.get_ticks() > self._pc_combo_deadline:
+        if self._pc_combo_started and clock.ticks_ms() > self._pc_combo_deadline:
             self._pc_combo_started = False
 
+    def _trim_step(self, sec, d):
+        """R-R 한 디텐트: 미세 콤보면 0.05s, 아니면 다음/이전 후보로 스냅 (후보 없으면 0.5s)"""
+        if self._is_pc_combo_alive():
+            return sec + d * 0.05
+        if self.trim_points is not None and len(self.trim_points) > 2:
+            return onsets.snap(self.trim_points, sec, d)
+        return sec + d * 0.5
+
     def _recall_last_confirm(self, tool):
         """ADJUST 재진입 시 커서를 latest confirm 값으로 복원"""
         if tool in ("Trim - Beginning", "Trim - End"):
@@ -206,8 +269,143 @@ class SoundCraftingScene(BaseScene):
             self.params["EQ - High Pass"]["cutoff"] = int(self.params["EQ - High Pass"]["last_confirm"])
         # Reverse는 on/off 그대로 보임
 
+    def _go_next(self):
+        self._next_after_render = False
+        self.scene_manager.change_scene("loop_composition", sound_stone=self.sound_stone)
+
+    # -------- 렌더 (오디오 워커) --------
+    def _craft_params(self, live=False):
+        """
+        dsp.craft 파라미터 (기본값인 툴은 생략)
+        live=False: confirm된 값만 (워커 렌더)
+        live=True: ADJUST 중인 툴은 조정 중인 값 (프리뷰)
+        """
+        p = self.params
+
+        def value(tool, key):
+            if live and self.mode == "ADJUST" and tool == self.selected_tool:
+                return p[tool][key]
+            return p[tool]["last_confirm"]
+
+        dur = self._duration_sec()
+        b, e = value("Trim - Beginning", "sec"), value("Trim - End", "sec")
+        speed = value("Speed", "value")
+        lp, hp = value("EQ - Low Pass", "cutoff"), value("EQ - High Pass", "cutoff")
+        out = {"sample_rate": self.sample.get("sample_rate", SAMPLE_RATE)}
+        if b > 0.0 or e < dur:
+            out["trim"] = (b, max(b, e))
+        if p["Reverse"]["on"]:
+            out["reverse"] = True
+        if speed != 1.0:
+            out["speed"] = float(speed)
+            out["keep_pitch"] = bool(p["Speed"]["keep_pitch"])
+        if lp < LP_MAX:
+            out["lowpass"] = float(lp)
+        if hp > HP_MIN:
+            out["highpass"] = float(hp)
+        return out
+
+    def _request_render(self):
+        if not isinstance(self.sample, dict) or self.sample.get("data") is None:
+            return
+        worker = get_worker()
+        worker.cancel(self.render_job)
+        params = self._craft_params()
+        self.render_job = worker.submit("craft", {"audio": self.sample["data"]}, params,
+                                        callback=lambda job: self._on_rendered(job, params))
+
+    def _on_rendered(self, job, params):
+        if job is not self.render_job:
+            return
+        self.render_job = None
+        if job.result is None:
+            return
+        sr = self.sample.get("sample_rate", SAMPLE_RATE)
+        # source/craft: 원본 테이크 + 체인 값 — 배치 렌더(tools/batch_render)가 DSP를 다시 돌릴 때 사용
+        processed = {"data": job.result, "sample_rate": sr, "duration": len(job.result) / float(sr),
+                     "source": self.sample.get("path"), "craft": params}
+        self.sound_stone["processed_audio"] = processed
+        self.stone_peaks = PeakPyramid.from_audio(job.result, sr)
+        self._request_features(processed)     # 새 샘플 버전 → 디스크립터 다시
+
+    # -------- Sound Stone 디스크립터 --------
+    def _request_features(self, audio):
+        """audio(샘플 dict)의 디스크립터: 캐시에 있으면 바로, 없으면 워커에서 한 번"""
+        desc = features.for_sample(audio)
+        if desc is not None:
+            self._apply_descriptors(desc)
+            return
+        if not isinstance(audio, dict) or audio.get("data") is None:
+            return
+        worker = get_worker()
+        worker.cancel(self.features_job)
+        params = {"sample_rate": audio.get("sample_rate", SAMPLE_RATE)}
+        self.features_job = worker.submit("features", {"audio": audio["data"]}, params,
+                                          callback=lambda job: self._on_features(job, audio))
+
+    def _on_features(self, job, audio):
+        if job is not self.features_job:
+            return
+        self.features_job = None
+        desc = features.unpack(job.result) if job.result is not None else None
+        if desc is None:
+            return
+        features.store(audio, desc)
+        self._apply_descriptors(desc)
+
+    def _apply_descriptors(self, desc):
+        self.sound_stone["descriptors"] = desc
+        self.sound_stone["visual"] = features.stone_visuals(desc)
+        self._stone_surf = None
+
+    def _preview_audio(self):
+        if self.sound_stone is not None:
+            processed = self.sound_stone.get("processed_audio")
+            if isinstance(processed, dict) and processed.get("data") is not None:
+                return processed["data"]
+        if isinstance(self.sample, dict):
+            return self.sample.get("data")
+        return None
+
+    def _toggle_preview(self):
+        self.preview_on = not self.preview_on
+        self._restart_preview()
+
+    def _restart_preview(self):
+        mixer = get_mixer()
+        mixer.stop_tag("preview")
+        if self.preview_stream is not None:
+            self.preview_stream.stop()
+            self.preview_stream = None
+        if not self.preview_on:
+            return
+        if isinstance(self.sample, dict) and self.sample.get("data") is not None:
+            # 원본에 체인을 블록 단위로 적용 — 워커 렌더 결과를 기다리지 않음
+            sr = self.sample.get("sample_rate", SAMPLE_RATE)
+            self.preview_stream = CraftPreview(mixer, self.sample["data"], sr,
+                                               self._craft_params(live=True)).start()
+            return
+        audio = self._preview_audio()
+        if audio is not None and len(audio):
+            mixer.play(audio, tag="preview", loop=True)
+
+    def _sync_preview(self, seek=None):
+        """조정 중인 값을 프리뷰 스트림에 반영 (다음 오디오 블록부터 들림)"""
+        if self.preview_stream is not None:
+            self.preview_stream.update(self._craft_params(live=True), seek=seek)
+
+    def _preview_seek(self, tool):
+        """Trim 핸들을 움직이면 그 핸들 근처부터 다시 재생 (트림된 view 기준 프레임)"""
+        if not tool.startswith("Trim"):
+            return None
+        at_end = (tool == "Trim - End") != self.params["Reverse"]["on"]
+        if not at_end:
+            return 0
+        sr = self.sample.get("sample_rate", SAMPLE_RATE) if isinstance(self.sample, dict) else SAMPLE_RATE
+        return -int(TRIM_PREVIEW_LEAD_SEC * sr)
+
     def _is_pc_combo_alive(self):
-        return self._pc_combo_started and pygame.time.get_ticks() <= self._pc_combo_deadline
+        return self._pc_combo_started and clock.ticks_ms() <= self._pc_combo_deadline
 
     def _consume_pc_combo(self):
         if self._pc_combo_started:
@@ -293,10 +491,44 @@ class SoundCraftingScene(BaseScene):
 
     def _draw_stone_card(self, x, y, w, h):
         pygame.draw.rect(self.screen, (80, 100, 120), (x, y, w, h), border_radius=8)
+        peaks = self.stone_peaks if self.stone_peaks is not None else self.peaks
+        if peaks is not None:
+            self.draw_waveform(peaks, (x + 10, y + 20, w - 20, h // 2 - 30),
+                               color=(150, 180, 200), rms_color=(210, 230, 240))
         self.draw_text("Sound Stone", x + 68, y + h // 2 - 10, (255, 255, 255))
+        visual = self.sound_stone.get("visual") if self.sound_stone else None
+        if visual is not None:
+            if self._stone_surf is None:
+                self._stone_surf = self._render_stone(visual, 80)
+            self.screen.blit(self._stone_surf, self._stone_surf.get_rect(center=(x + w - 48, y + h - 48)))
+        if self.render_job is not None:
+            self.draw_text("Rendering...", x + 70, y + h - 40, (230, 210, 150))
         if self.preview_on:
             self.draw_text("Preview: ON", x + 64, y + h // 2 + 26, (180, 230, 180))
 
+    def _render_stone(self, visual, size):
+        """디스크립터 비주얼 → 원석 Surface (비주얼이 바뀔 때만 호출)"""
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        shape = visual["shape"]
+        n, c, r = shape["vertices"], size / 2.0, size / 2.0 - 2
+        pts = [(c + r * k * math.cos(2 * math.pi * i / n - math.pi / 2),
+                c + r * k * math.sin(2 * math.pi * i / n - math.pi / 2))
+               for i, k in enumerate(shape["radii"])]
+        pygame.draw.polygon(surf, visual["color"], pts)
+        # 질감: 결정적 위치의 점 (glassy는 하이라이트 한 줄만)
+        light = tuple(min(255, v + 60) for v in visual["color"])
+        if visual["texture"] == "glassy":
+            pygame.draw.line(surf, light, (c - r * 0.35, c - r * 0.45), (c + r * 0.1, c - r * 0.6), 2)
+        else:
+            count = 12 if visual["texture"] == "grainy" else 28
+            dark = tuple(max(0, v - 50) for v in visual["color"])
+            for i in range(count):
+                a, d = i * 2.39996, r * 0.75 * math.sqrt((i + 0.5) / count)   # 황금각 분포
+                pygame.draw.circle(surf, dark if i % 2 else light,
+                                   (int(c + d * math.cos(a)), int(c + d * math.sin(a))), 1 + i % 2)
+        pygame.draw.polygon(surf, (30, 34, 40), pts, 2)
+        return surf
+
     # ------- ADJUST -------
     def _draw_adjust_panel(self):
         tool = self.selected_tool
@@ -333,6 +565,10 @@ class SoundCraftingScene(BaseScene):
         last = self.params["Trim - Beginning"]["last_confirm"] if handle == "begin" \
                else self.params["Trim - End"]["last_confirm"]
 
+        # 전체 파형 개요
+        if self.peaks is not None:
+            self.draw_waveform(self.peaks, (panel.x + 20, panel.y + 14, panel.width - 40, 48))
+
         # 타임라인 바
         bar = pygame.Rect(panel.x + 20, panel.y + 110, panel.width - 40, 10)
         pygame.draw.rect(self.screen, (60, 66, 78), bar, border_radius=6)
@@ -348,14 +584,42 @@ class SoundCraftingScene(BaseScene):
         pygame.draw.circle(self.screen, (255, 210, 140), (curx, bar.y + 5), 6)
         pygame.draw.circle(self.screen, (160, 160, 160), (othx, bar.y + 5), 6)
 
+        # 스냅 후보(onset/무음 경계) 눈금
+        if self.trim_points is not None:
+            for t in self.trim_points:
+                tx = bar.x + int(bar.width * (t / max(0.001, dur)))
+                pygame.draw.line(self.screen, (120, 130, 150), (tx, bar.y + bar.height + 2), (tx, bar.y + bar.height + 6), 1)
+
         # 최근 컨펌 값(얇은 금색 라인)
         lx = bar.x + int(bar.width * (last / max(0.001, dur)))
         pygame.draw.line(self.screen, (255, 220, 160), (lx, bar.y - 2), (lx, bar.y + bar.height + 2), 1)
 
+        # 핸들 주변 확대 스트립 (피라미드 레벨만 바뀌므로 줌이 부드러움)
+        if self.peaks is not None:
+            self._draw_trim_zoom(panel, cur_val, b, e, dur)
+
         self.draw_text(f"{'Begin' if handle=='begin' else 'End'}: {cur_val:0.2f}s / {dur:0.2f}s"
-                       "   (R-R=0.5s, P-C+R-R=0.05s, R-C=Confirm)",
+                       "   (R-R=snap, P-C+R-R=0.05s, R-C=Confirm)",
                        panel.x + 20, panel.y + 70, (170, 170, 170))
 
+    def _draw_trim_zoom(self, panel, center, b, e, dur):
+        win = min(dur, TRIM_ZOOM_SEC)
+        z0 = max(0.0, min(dur - win, center - win / 2.0))
+        z1 = z0 + win
+        strip = pygame.Rect(panel.x + 20, panel.y + 140, panel.width - 40, 100)
+        pygame.draw.rect(self.screen, (32, 36, 44), strip, border_radius=6)
+        self.draw_waveform(self.peaks, strip, z0, z1)
+        # 트림 구간 밖은 어둡게
+        for t0, t1 in ((z0, b), (e, z1)):
+            if t1 > t0:
+                x0 = strip.x + int(strip.width * (t0 - z0) / max(0.001, win))
+                x1 = strip.x + int(strip.width * (t1 - z0) / max(0.001, win))
+                shade = pygame.Surface((max(1, x1 - x0), strip.height), pygame.SRCALPHA)
+                shade.fill((0, 0, 0, 140))
+                self.screen.blit(shade, (x0, strip.y))
+        cx = strip.x + int(strip.width * (center - z0) / max(0.001, win))
+        pygame.draw.line(self.screen, (255, 210, 140), (cx, strip.y), (cx, strip.bottom), 1)
+
     def _draw_reverse_panel(self, panel):
         on = self.params["Reverse"]["on"]
         pygame.draw.rect(self.screen, (60, 66, 78), (panel.x + 20, panel.y + 80, panel.width - 40, 60), border_radius=8)
@@ -391,6 +655,9 @@ class SoundCraftingScene(BaseScene):
 
         # 레이블
         self.draw_text(f"x{v:0.2f}   (range x0.01 ~ x50)", x + w + 12, y - 4, (170, 170, 170))
+        keep = self.params["Speed"]["keep_pitch"]
+        self.draw_text(f"Keep pitch: {'ON' if keep else 'OFF'}   (P-LC to toggle)", x, y + 40,
+                       (180, 230, 180) if keep else (170, 170, 170))
 
     def _draw_lowpass_panel(self, panel):
         cut = self.params["EQ - Low Pass"]["cutoff"]
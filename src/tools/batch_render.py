@@ -0,0 +1,148 @@
+# ============================================
+# tools/batch_render.py - 저장된 TailPack 오프라인 일괄 렌더
+# ============================================
+"""
+라이브러리(또는 지정한 팩 JSON)의 TailPack을 디스플레이 없이 WAV로 다시 렌더.
+
+    cd src && python -m tools.batch_render [pack.json ...] [--out DIR] [--stems] [--recraft] [--jobs N]
+
+- 입력: 인자가 없으면 data/library/index.json 전체, 있으면 각 JSON(팩 하나 또는 팩 목록)
+- 팩 하나 = 작업 하나 → ProcessPoolExecutor로 코어마다 병렬
+- 렌더는 씬과 같은 코드: loop_engine.render_bar (믹스다운 / --stems면 레이어별),
+  --recraft면 템플릿마다 원본 테이크(source)에 dsp.craft(저장된 체인 값)를 다시 적용
+  → DSP를 바꾼 뒤 라이브러리 전체를 밤새 다시 뽑을 때
+- 템플릿 오디오가 없는 팩(templates 저장 이전 export)은 해당 이벤트가 무음
+"""
+
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+from config import DATA_DIR, SAMPLE_RATE
+
+RENDERS_DIR = os.path.join(DATA_DIR, "renders")
+
+
+def load_packs(paths):
+    """JSON 경로들 → 팩 목록 (경로가 없으면 라이브러리 인덱스)"""
+    from utils.file_manager import load_json, load_library_packs
+    if not paths:
+        return load_library_packs() or []
+    packs = []
+    for path in paths:
+        obj = load_json(path, default=None)
+        if isinstance(obj, dict):
+            packs.append(obj)
+        elif isinstance(obj, list):
+            packs.extend(obj)
+        else:
+            print(f"[batch_render] skipped {path}: not a pack")
+    return packs
+
+
+def _template_audio(entry, recraft):
+    """templates 항목 → float32 mono (읽을 수 없으면 None)"""
+    from utils.file_manager import load_wav
+    from audio.mixer import as_mono_f32
+    source, params = entry.get("source"), entry.get("craft")
+    if recraft and source and params is not None and os.path.exists(source):
+        from audio.dsp import craft
+        data, sr = load_wav(source)
+        return as_mono_f32(craft(as_mono_f32(data), sr, params))
+    if entry.get("blob"):
+        from utils import audio_store
+        path = audio_store.blob_path(entry["blob"])
+        return audio_store.load(entry["blob"]) if os.path.exists(path) else None
+    path = entry.get("path")          # 블롭 저장소 이전 export
+    if not path or not os.path.exists(path):
+        return None
+    data, _ = load_wav(path)
+    return as_mono_f32(data)
+
+
+def pack_grid(pack, recraft=False):
+    """
+    팩 grid(tpl_name 참조, 인덱스에 없으면 pack_path의 .tailpack) → render_bar가 읽는 grid
+    (템플릿 오디오는 한 번씩만 로드 —
+    블롭은 audio_store 캐시로 같은 프로세스의 다른 팩과도 공유)
+    """
+    source_grid = pack.get("grid")
+    if source_grid is None and pack.get("pack_path"):
+        from utils.pack_format import PackReader
+        source_grid = PackReader(pack["pack_path"]).grid()
+    source_grid = source_grid or []
+    stones = {}
+    for name, entry in (pack.get("templates") or {}).items():
+        audio = _template_audio(entry, recraft)
+        if audio is not None:
+            stones[name] = {"data": audio, "_mono": audio}
+    grid = [[[dict(ev, tpl=({"data": stones[ev["tpl_name"]]} if ev.get("tpl_name") in stones else None))
+              for ev in layer] for layer in bar] for bar in source_grid]
+    missing = {ev.get("tpl_name") for bar in source_grid for layer in bar for ev in layer
+               if ev.get("tpl_name") and ev["tpl_name"] not in stones}
+    return grid, sorted(missing)
+
+
+def _slug(pack):
+    name = re.sub(r"[^A-Za-z0-9._-]+", "_", str(pack.get("name", "pack"))).strip("_") or "pack"
+    return f"{pack.get('id', 0):04d}_{name}" if isinstance(pack.get("id"), int) else name
+
+
+def render_pack(pack, out_dir, stems=False, recraft=False):
+    """작업 하나 (워커 프로세스) → (이름, 쓴 파일 목록, 누락 템플릿, 걸린 초)"""
+    from audio.loop_engine import render_bar
+    from utils.file_manager import save_wav
+    t0 = time.perf_counter()
+    grid, missing = pack_grid(pack, recraft)
+    bpm = float(pack.get("bpm") or 120)
+    slug = _slug(pack)
+    written = []
+    if grid:
+        mix = np.concatenate([render_bar(bar, bpm) for bar in grid])
+        written.append(save_wav(os.path.join(out_dir, slug + ".wav"), mix, SAMPLE_RATE))
+        if stems:
+            layers = max(len(bar) for bar in grid)
+            for li in range(layers):
+                stem = np.concatenate([render_bar(bar, bpm, only_layer=li) for bar in grid])
+                written.append(save_wav(os.path.join(out_dir, f"{slug}_layer{li}.wav"), stem, SAMPLE_RATE))
+    return pack.get("name", slug), written, missing, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Render saved tail packs to WAV without a display")
+    ap.add_argument("packs", nargs="*", help="pack JSON files (default: the whole library index)")
+    ap.add_argument("--out", default=RENDERS_DIR, help="output directory")
+    ap.add_argument("--stems", action="store_true", help="also write one WAV per layer")
+    ap.add_argument("--recraft", action="store_true",
+                    help="re-run the Sound Crafting DSP on each template's source take")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    args = ap.parse_args()
+
+    packs = load_packs(args.packs)
+    if not packs:
+        print("[batch_render] nothing to render")
+        return
+    os.makedirs(args.out, exist_ok=True)
+    jobs = max(1, min(args.jobs, len(packs)))
+    print(f"[batch_render] {len(packs)} packs → {args.out} ({jobs} processes)")
+    t0 = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(render_pack, p, args.out, args.stems, args.recraft): p for p in packs}
+        for i, fut in enumerate(as_completed(futures), 1):
+            try:
+                name, written, missing, sec = fut.result()
+            except Exception as e:        # 팩 하나가 깨져도 나머지는 계속
+                failed += 1
+                print(f"[{i}/{len(packs)}] {futures[fut].get('name', '?')}: failed ({e})")
+                continue
+            note = f" (missing templates: {', '.join(missing)})" if missing else ""
+            print(f"[{i}/{len(packs)}] {name}: {len(written)} files in {sec:.2f}s{note}")
+    print(f"[batch_render] done in {time.perf_counter() - t0:.1f}s, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# ============================================
+# tools/bench_filters.py - EQ 필터 엔진 벤치마크
+# ============================================
+"""
+audio/biquad.py 처리량(samples/sec)을 측정.
+
+    cd src && python -m tools.bench_filters [--seconds 10] [--order 2]
+
+블록 크기(실시간 BUFFER_SIZE / 오프라인 65536) × 채널(mono/stereo) × 엔진
+(scipy sosfilt / NumPy 폴백) 조합, 그리고 컷오프 램프 중 처리량을 출력.
+실시간 여유 = 처리량 / SAMPLE_RATE (1이면 겨우 실시간).
+"""
+
+import argparse
+import time
+import numpy as np
+
+from audio import biquad
+from config import SAMPLE_RATE, BUFFER_SIZE
+
+
+def _bench(engine, block, channels, seconds, order, sweep=False):
+    x = np.random.default_rng(0).standard_normal((int(seconds * SAMPLE_RATE), channels)).astype(np.float32)
+    f = biquad.BiquadFilter("lowpass", 2000, SAMPLE_RATE, channels=channels, order=order)
+    saved = biquad.SCIPY_AVAILABLE
+    biquad.SCIPY_AVAILABLE = engine == "scipy"
+    try:
+        t0 = time.perf_counter()
+        for i in range(0, len(x), block):
+            if sweep and (i // block) % 8 == 0:
+                # R-R 디텐트마다 컷오프가 바뀌는 상황 (블록 8개마다 한 칸)
+                f.set_cutoff(200 + (i // block) % 200 * 100)
+            f.process(x[i:i + block])
+        dt = time.perf_counter() - t0
+    finally:
+        biquad.SCIPY_AVAILABLE = saved
+    return len(x) / dt
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the streaming biquad filter engine")
+    ap.add_argument("--seconds", type=float, default=10.0, help="audio length per case")
+    ap.add_argument("--order", type=int, default=2, help="Butterworth order (even)")
+    args = ap.parse_args()
+
+    engines = ["numpy"] + (["scipy"] if biquad.SCIPY_AVAILABLE else [])
+    print(f"[bench_filters] {args.seconds:.0f}s per case, order {args.order}, "
+          f"scipy {'available' if biquad.SCIPY_AVAILABLE else 'not installed'}")
+    print(f"{'engine':7} {'block':>6} {'ch':>3} {'sweep':>6} {'samples/s':>14} {'x realtime':>11}")
+    for engine in engines:
+        for block in (BUFFER_SIZE, 65536):
+            for channels in (1, 2):
+                for sweep in ((False, True) if block == BUFFER_SIZE else (False,)):
+                    sps = _bench(engine, block, channels, args.seconds, args.order, sweep)
+                    print(f"{engine:7} {block:>6} {channels:>3} {('yes' if sweep else 'no'):>6} "
+                          f"{sps:>14,.0f} {sps / SAMPLE_RATE:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
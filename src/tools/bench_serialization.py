@@ -0,0 +1,86 @@
+# ============================================
+# tools/bench_serialization.py - TailPack 직렬화 벤치마크 (JSON vs .tailpack)
+# ============================================
+"""
+16bar × 8layer 빽빽한 루프(레이어마다 bar당 32분음표 전부 채움)를 JSON과
+utils/pack_format(.tailpack)으로 저장/로드해 시간과 파일 크기를 비교.
+
+    cd src && python -m tools.bench_serialization [--bars 16] [--layers 8] [--repeat 20]
+
+bar 하나만 필요할 때(PackReader.bar)는 JSON은 파일 전체를 파싱해야 하므로 그것도 따로 측정.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import numpy as np
+
+from utils.pack_format import PackReader, write_pack, read_pack
+
+FINE_STEPS = 32
+
+
+def dense_pack(bars, layers, n_templates=12):
+    rng = np.random.default_rng(0)
+    grid = [[[{"start": s, "length": 1, "melody": bool(rng.integers(2)),
+               "pitch": int(rng.integers(-12, 13)), "gain": int(rng.integers(0, 201)),
+               "tpl_name": f"stone_{int(rng.integers(n_templates)):02d}"}
+              for s in range(FINE_STEPS)] for _ in range(layers)] for _ in range(bars)]
+    return {"name": "bench", "date": "2026-01-01T00:00:00", "duration": bars * 2.0, "bpm": 120,
+            "key": "C", "bars": bars, "layers": layers, "grid": grid}
+
+
+def _time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def _save_json(path, pack):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(pack, f, ensure_ascii=False)
+
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark TailPack JSON vs binary serialization")
+    ap.add_argument("--bars", type=int, default=16)
+    ap.add_argument("--layers", type=int, default=8)
+    ap.add_argument("--repeat", type=int, default=20, help="runs per case (best is reported)")
+    args = ap.parse_args()
+
+    pack = dense_pack(args.bars, args.layers)
+    n_events = args.bars * args.layers * FINE_STEPS
+    with tempfile.TemporaryDirectory() as tmp:
+        jpath = os.path.join(tmp, "pack.json")
+        bpath = os.path.join(tmp, "pack.tailpack")
+        rows = [
+            ("json", "save", _time(lambda: _save_json(jpath, pack), args.repeat)),
+            ("json", "load", _time(lambda: _load_json(jpath), args.repeat)),
+            ("json", "1 bar", _time(lambda: _load_json(jpath)["grid"][args.bars // 2], args.repeat)),
+            ("tailpack", "save", _time(lambda: write_pack(bpath, pack), args.repeat)),
+            ("tailpack", "load", _time(lambda: read_pack(bpath), args.repeat)),
+            ("tailpack", "1 bar", _time(lambda: PackReader(bpath).bar(args.bars // 2), args.repeat)),
+        ]
+        assert read_pack(bpath)["grid"] == pack["grid"], "round trip mismatch"
+        sizes = {"json": os.path.getsize(jpath), "tailpack": os.path.getsize(bpath)}
+
+    print(f"[bench_serialization] {args.bars} bars x {args.layers} layers, {n_events} events")
+    print(f"{'format':9} {'op':6} {'ms':>9}")
+    for fmt, op, ms in rows:
+        print(f"{fmt:9} {op:6} {ms:>9.2f}")
+    for fmt, size in sizes.items():
+        print(f"{fmt:9} size {size:>10,} bytes ({size / sizes['json']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# ============================================
+# tools/check_analysis.py - 템포/키 추정 합성 신호 점검
+# ============================================
+"""
+audio/analysis.analyze를 합성 신호로 점검 (실패하면 종료 코드 1).
+
+    cd src && python -m tools.check_analysis
+
+- 지속음(사인, 장3화음)과 노이즈: onset이 없으므로 bpm == 0 (씬/가져오기가 BPM을 덮어쓰지 않음)
+- 클릭 트랙 / 아르페지오: 기대 BPM ±2 안
+"""
+
+import sys
+import numpy as np
+
+from audio.analysis import analyze
+from config import SAMPLE_RATE
+
+SECONDS = 8
+TOLERANCE_BPM = 2.0
+
+
+def _clicks(bpm, rng, noise=0.0):
+    x = np.zeros(SAMPLE_RATE * SECONDS, dtype=np.float32)
+    burst = np.exp(-np.arange(2000) / 300.0) * 0.8
+    for i in range(0, len(x) - 2000, int(SAMPLE_RATE * 60 / bpm)):
+        x[i:i + 2000] += burst * rng.standard_normal(2000)
+    return x + noise * rng.standard_normal(len(x))
+
+
+def _arpeggio(bpm):
+    x = np.zeros(SAMPLE_RATE * SECONDS, dtype=np.float32)
+    step = int(SAMPLE_RATE * 60 / bpm / 2)      # 8분음표
+    n = np.arange(step)
+    for k, i in enumerate(range(0, len(x) - step, step)):
+        f = (261.6, 329.6, 392.0, 523.2)[k % 4]
+        x[i:i + step] += 0.4 * np.sin(2 * np.pi * f * n / SAMPLE_RATE) * np.exp(-n / 8000.0)
+    return x
+
+
+def cases():
+    rng = np.random.default_rng(0)
+    t = np.arange(SAMPLE_RATE * SECONDS) / float(SAMPLE_RATE)
+    yield "sine 440 Hz", 0.5 * np.sin(2 * np.pi * 440 * t), 0.0
+    yield "C major chord", sum(0.2 * np.sin(2 * np.pi * f * t) for f in (261.6, 329.6, 392.0)), 0.0
+    yield "white noise", 0.3 * rng.standard_normal(len(t)), 0.0
+    yield "clicks 120", _clicks(120, rng), 120.0
+    yield "clicks 90 + noise", _clicks(90, rng, noise=0.01), 90.0
+    yield "arpeggio 100", _arpeggio(100), 100.0
+
+
+def main():
+    failed = 0
+    for name, x, want in cases():
+        r = analyze(np.asarray(x, dtype=np.float32), SAMPLE_RATE)
+        ok = r["bpm"] == 0.0 if want == 0.0 else abs(r["bpm"] - want) <= TOLERANCE_BPM
+        failed += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name:18} bpm {r['bpm']:6.1f} (want {want:.0f}) "
+              f"conf {r['bpm_confidence']:.2f}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# ============================================
+# tools/import_wavs.py - 외부 WAV 일괄 가져오기 (CLI)
+# ============================================
+"""
+audio/importer.BulkImport를 디스플레이 없이 실행.
+
+    cd src && python -m tools.import_wavs <dir> [--jobs N]
+
+Library 진입 시 data/import/를 가져오는 것과 같은 파이프라인 (이미 가져온 파일은 건너뜀).
+"""
+
+import argparse
+import time
+
+from audio.importer import BulkImport, scan
+from config import IMPORT_DIR
+from utils.file_manager import load_library_packs
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Import a directory of WAV files into the library")
+    ap.add_argument("directory", nargs="?", default=IMPORT_DIR, help="directory to scan")
+    ap.add_argument("--jobs", type=int, default=0, help="worker processes (0 = all cores)")
+    args = ap.parse_args()
+
+    sources = scan(args.directory, load_library_packs() or [])
+    if not sources:
+        print(f"[import_wavs] nothing new in {args.directory}")
+        return
+    t0 = time.perf_counter()
+    imp = BulkImport(sources, workers=args.jobs).start()
+    last = -1
+    while not imp.finished:
+        if not imp.poll():
+            time.sleep(0.1)
+        done, total = imp.progress
+        if done != last:
+            last = done
+            print(f"\r[import_wavs] {done}/{total}", end="", flush=True)
+    print(f"\n[import_wavs] {len(imp.entries)} imported, {len(imp.errors)} failed "
+          f"in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# ============================================
+# ui/components.py - 공통 UI 컴포넌트
+# ============================================
+"""재사용 UI 조각들"""
+
+from collections import OrderedDict
+
+
+class VirtualList:
+    """
+    가상화 리스트: 항목이 수천 개여도 화면에 들어오는 행만 배치/렌더.
+
+    - items: 전체 항목 시퀀스(순서 = 논리 순서). selected는 이 순서의 인덱스
+    - window(rows): 선택 항목을 중심으로 화면에 보일 인덱스 범위만 계산
+    - row_surface(i): render_row(item, selected)로 만든 Surface를 LRU로 캐시/재활용
+      (키 = (item key, selected)이므로 초점 이동 시 재렌더는 새로 들어온 행뿐)
+    """
+
+    def __init__(self, render_row, key=None, cache_size=48):
+        self.render_row = render_row
+        self.key = key or id
+        self.cache_size = int(cache_size)
+        self.items = []
+        self.selected = 0
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.items)
+
+    def set_items(self, items):
+        self.items = items
+        self.selected = max(0, min(self.selected, len(items) - 1))
+        self._cache.clear()
+
+    def select(self, index):
+        if self.items:
+            self.selected = max(0, min(len(self.items) - 1, int(index)))
+        return self.selected
+
+    def move(self, d):
+        return self.select(self.selected + d)
+
+    def current(self):
+        return self.items[self.selected] if self.items else None
+
+    def window(self, rows):
+        """선택 행을 가운데 두고 rows개 → (first, last) (last는 미포함)"""
+        n = len(self.items)
+        if n == 0 or rows <= 0:
+            return 0, 0
+        rows = min(rows, n)
+        first = self.selected - rows // 2
+        first = max(0, min(n - rows, first))
+        return first, first + rows
+
+    def row_surface(self, i):
+        item = self.items[i]
+        sel = (i == self.selected)
+        k = (self.key(item), sel)
+        surf = self._cache.get(k)
+        if surf is None:
+            surf = self.render_row(item, sel)
+            self._cache[k] = surf
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)   # 가장 오래 안 쓴 행 재활용
+        else:
+            self._cache.move_to_end(k)
+        return surf
+
+    def invalidate(self, item=None):
+        if item is None:
+            self._cache.clear()
+            return
+        k = self.key(item)
+        self._cache.pop((k, True), None)
+        self._cache.pop((k, False), None)
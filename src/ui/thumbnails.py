@@ -0,0 +1,137 @@
+# ============================================
+# ui/thumbnails.py - TailPack 썸네일 (export 시 생성 + 메모리 LRU)
+# ============================================
+"""
+- render_thumbnail(pack): export 시 grid로부터 작은 RGB 이미지를 NumPy로 그려
+  zlib 압축 + base64로 라이브러리 인덱스에 저장 (pygame 없이도 동작 → 배치/헤드리스 OK)
+  · 단색 사각형/2색 파형이라 96×32 RGB 12KB → 보통 수백 바이트 (빽빽한 16bar 루프도 ~2KB)
+    — 팩이 수천 개여도 Library 진입 때마다 읽는 index.json이 커지지 않게
+- ThumbnailCache: 디코딩된 pygame Surface LRU. 초점 근처 팩은 update에서
+  프레임당 몇 개씩 미리 디코딩(prefetch)해 그리기 프레임에서 디코딩하지 않음
+"""
+
+import base64
+import zlib
+from collections import OrderedDict
+import numpy as np
+
+THUMB_W, THUMB_H = 96, 32
+BG = (40, 46, 56)
+MELODY_COL = np.array([150, 110, 200], dtype=np.float32)
+RHYTHM_COL = np.array([255, 150, 60], dtype=np.float32)
+TICKS_PER_BAR = 32
+ZLIB_LEVEL = 9
+
+
+def _encode(img):
+    h, w = img.shape[:2]
+    return {"w": w, "h": h, "z": base64.b64encode(zlib.compress(img.tobytes(), ZLIB_LEVEL)).decode("ascii")}
+
+
+def render_thumbnail(pack, w=THUMB_W, h=THUMB_H):
+    """pack["grid"]([bar][layer] = [event]) → {"w", "h", "z"(zlib RGB, base64)}"""
+    img = np.empty((h, w, 3), dtype=np.uint8)
+    img[:] = BG
+    grid = pack.get("grid") or []
+    bars = max(1, len(grid))
+    layers = max(1, max((len(b) for b in grid), default=1))
+    row_h = max(1, h // layers)
+    for bi, bar in enumerate(grid):
+        x_bar = bi * w / float(bars)
+        bar_w = w / float(bars)
+        for li, events in enumerate(bar):
+            y0 = li * row_h
+            y1 = min(h, y0 + row_h - (1 if row_h > 2 else 0))
+            for ev in events:
+                x0 = int(x_bar + bar_w * ev["start"] / TICKS_PER_BAR)
+                x1 = int(x_bar + bar_w * (ev["start"] + ev["length"]) / TICKS_PER_BAR)
+                x1 = max(x1, x0 + 1)
+                col = MELODY_COL if ev.get("melody", True) else RHYTHM_COL
+                shade = 0.45 + 0.55 * min(1.0, ev.get("gain", 100) / 100.0)
+                img[y0:y1, x0:x1] = np.clip(col * shade, 0, 255).astype(np.uint8)
+        # bar 경계선
+        xb = int(x_bar)
+        if bi:
+            img[:, xb] = (90, 98, 112)
+    return _encode(img)
+
+
+def render_waveform_thumbnail(peaks, w=THUMB_W, h=THUMB_H):
+    """grid 없는 팩(가져온 WAV) → 피크 피라미드 min/max 파형 썸네일 (같은 포맷)"""
+    img = np.empty((h, w, 3), dtype=np.uint8)
+    img[:] = BG
+    mins, maxs, _ = peaks.columns(0.0, peaks.duration, w)
+    mid = (h - 1) / 2.0
+    y0 = np.clip(np.round(mid - maxs * mid), 0, h - 1).astype(np.int64)
+    y1 = np.clip(np.round(mid - mins * mid), 0, h - 1).astype(np.int64)
+    rows = np.arange(h)[:, None]
+    img[(rows >= y0[None, :]) & (rows <= y1[None, :])] = MELODY_COL.astype(np.uint8)
+    return _encode(img)
+
+
+def decode_thumbnail(thumb):
+    """{"w","h","z"} (예전 항목은 압축 안 한 "rgb") → (h, w, 3) uint8 배열"""
+    if "z" in thumb:
+        raw = zlib.decompress(base64.b64decode(thumb["z"]))
+    else:
+        raw = base64.b64decode(thumb["rgb"])
+    return np.frombuffer(raw, dtype=np.uint8).reshape(thumb["h"], thumb["w"], 3)
+
+
+class ThumbnailCache:
+    """디코딩된 Surface LRU (+ 표시 크기별 스케일 결과도 같은 항목에 보관)"""
+
+    def __init__(self, capacity=64, per_frame=2):
+        self.capacity = int(capacity)
+        self.per_frame = int(per_frame)   # update 한 번에 미리 디코딩할 최대 개수
+        self._cache = OrderedDict()       # pack id → {size: Surface}
+        self._pending = []                # prefetch 대기 팩 목록
+
+    def _decode(self, pack):
+        import pygame
+        arr = decode_thumbnail(pack["thumb"])
+        # frombuffer는 원본 bytes를 참조하므로 copy()로 독립 Surface를 만든다
+        surf = pygame.image.frombuffer(arr.tobytes(), (arr.shape[1], arr.shape[0]), "RGB").copy()
+        return {None: surf}
+
+    def _entry(self, pack):
+        pid = pack.get("id")
+        entry = self._cache.get(pid)
+        if entry is None:
+            if not pack.get("thumb"):
+                return None
+            entry = self._decode(pack)
+            self._cache[pid] = entry
+            if len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(pid)
+        return entry
+
+    def get(self, pack, size=None):
+        """Surface 반환 (size=(w,h)면 그 크기로 스케일한 것을 캐시)"""
+        entry = self._entry(pack)
+        if entry is None:
+            return None
+        surf = entry.get(size)
+        if surf is None:
+            import pygame
+            surf = pygame.transform.scale(entry[None], size)
+            entry[size] = surf
+        return surf
+
+    def discard(self, pid):
+        """삭제된 팩의 Surface 버리기 (id가 재사용돼도 옛 썸네일이 안 보이게)"""
+        self._cache.pop(pid, None)
+
+    def prefetch(self, packs):
+        """초점 근처 팩들을 예약 — 실제 디코딩은 pump()에서 조금씩"""
+        self._pending = [p for p in packs if p.get("thumb") and p.get("id") not in self._cache]
+
+    def pump(self):
+        n = 0
+        while self._pending and n < self.per_frame:
+            pack = self._pending.pop(0)
+            if pack.get("id") not in self._cache:
+                self._entry(pack)
+                n += 1
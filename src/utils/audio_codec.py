@@ -0,0 +1,279 @@
+# ============================================
+# utils/audio_codec.py - 라이브러리 오디오 압축 포맷 (임의 구간 디코딩)
+# ============================================
+"""
+SD카드를 raw WAV로 채우지 않기 위한 선택적 저장 포맷. 확장자로 구분:
+
+- .flac: soundfile이 있으면 FLAC (seek 지원 → 구간 읽기)
+- .pcmz: soundfile 없이 쓰는 블록 압축 PCM
+  · BLOCK_FRAMES 프레임마다 독립 블록. 스테레오는 L/R, L/S, R/S, M/S 중 잔차가 가장 작은
+    채널 쌍으로 (FLAC식 채널 상관 제거)
+  · 채널마다 FLAC식 고정 예측기(차분 0~3차 중 잔차가 가장 작은 것)
+    → Rice식 분할: PARTITION 샘플마다 자기 k (하위 k비트 비트 패킹 + 작은 상위 부분만 zlib)
+    — 조용한 구간과 어택이 한 블록에 섞여도 k가 따라감. 전부 NumPy 벡터 연산, 무손실
+  · v1(블록당 k 하나, 채널 인터리브) 파일도 그대로 읽음
+  · 헤더 뒤 seek table(블록 끝 오프셋) → [start, start+count) 구간은 걸치는 블록만 풀어 읽음
+- 그 외: 16bit PCM WAV (file_manager)
+
+read_frames()는 file_manager.read_wav_frames와 같은 계약(float32 mono) — Library 프리패치/
+스트리밍이 포맷을 몰라도 bar 단위 구간을 바로 읽는다.
+"""
+
+import os
+import struct
+import zlib
+import numpy as np
+from utils.file_manager import (to_int16, save_wav, load_wav, wav_info, read_wav_frames,
+                                ensure_dir)
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    sf = None
+    SOUNDFILE_AVAILABLE = False
+
+PCMZ_SUFFIX = ".pcmz"
+FLAC_SUFFIX = ".flac"
+MAGIC = b"PCMZ"
+VERSION = 2
+READ_VERSIONS = (1, 2)
+BLOCK_FRAMES = 4096
+PARTITION = 256         # Rice 파라미터 k를 따로 고르는 샘플 수
+RICE_K_OFFSET = 4       # k = log2(평균) - 이 값 → 상위 부분은 대부분 60 미만, zlib(허프만)이 엔트로피 부호화
+ZLIB_LEVEL = 6
+MAX_ORDER = 3           # 고정 예측기 최대 차수
+BLOCK_HEAD = struct.Struct("<BBII")     # v1: order, k, zlib 길이, 예외 수
+CH_HEAD = struct.Struct("<BIII")        # v2 채널: order, zlib 길이, 예외 수, 하위 비트 바이트 수
+# v2 스테레오 모드: 저장하는 두 채널
+STEREO_LR, STEREO_LS, STEREO_RS, STEREO_MS = range(4)
+# magic, version, channels, sample_rate, n_frames, block_frames
+HEADER = struct.Struct("<4sHHIQI")
+
+
+def codec_suffix(codec):
+    """설정값("auto" | "flac" | "pcmz" | "wav") → 파일 확장자"""
+    if codec == "auto":
+        codec = "flac" if SOUNDFILE_AVAILABLE else "pcmz"
+    if codec == "flac" and not SOUNDFILE_AVAILABLE:
+        print("[AudioCodec] soundfile not installed — using .pcmz instead of FLAC")
+        codec = "pcmz"
+    return {"flac": FLAC_SUFFIX, "pcmz": PCMZ_SUFFIX}.get(codec, ".wav")
+
+
+# ---------- .pcmz v2 블록 ----------
+def _residual(x):
+    """int32 (m,) → (order, 잔차, |잔차| 합) — 차분 0~MAX_ORDER 중 가장 작은 것"""
+    best = None
+    for order in range(MAX_ORDER + 1):
+        r = np.diff(x, n=order, prepend=np.zeros(order, np.int32)) if order else x
+        cost = int(np.abs(r).sum())
+        if best is None or cost < best[2]:
+            best = (order, r, cost)
+    return best
+
+
+def _stereo(x):
+    """int32 (m, 2) → (모드, [채널 잔차 결과 2개]) — 잔차 합이 가장 작은 채널 쌍"""
+    left, right = x[:, 0], x[:, 1]
+    side = left - right
+    mid = (left + right) >> 1
+    res = {name: _residual(c) for name, c in (("l", left), ("r", right), ("s", side), ("m", mid))}
+    modes = ((STEREO_LR, "l", "r"), (STEREO_LS, "l", "s"), (STEREO_RS, "r", "s"), (STEREO_MS, "m", "s"))
+    mode, a, b = min(modes, key=lambda m: res[m[1]][2] + res[m[2]][2])
+    return mode, [res[a], res[b]]
+
+
+def _encode_channel(order, r):
+    """잔차 → zigzag u → 파티션별 k로 분할: 상위(u >> k)는 uint8 zlib(255 이상 예외), 하위 k비트는 비트 패킹"""
+    u = ((r << 1) ^ (r >> 31)).astype(np.uint32)
+    n = len(u)
+    starts = np.arange(0, n, PARTITION)
+    means = np.add.reduceat(u.astype(np.float64), starts) / np.diff(np.append(starts, n))
+    k = np.maximum(0, np.floor(np.log2(np.maximum(means, 1.0))) - RICE_K_OFFSET).astype(np.uint8)
+    ks = np.repeat(k, PARTITION)[:n].astype(np.uint32)
+    hi = u >> ks
+    esc = hi[hi >= 255].astype("<u4")
+    z = zlib.compress(np.minimum(hi, 255).astype(np.uint8).tobytes(), ZLIB_LEVEL)
+    low = b""
+    top = int(k.max())
+    if top:
+        shifts = np.arange(top - 1, -1, -1, dtype=np.uint32)
+        bits = ((u[:, None] >> shifts) & 1).astype(np.uint8)
+        low = np.packbits(bits[shifts[None, :] < ks[:, None]]).tobytes()
+    return CH_HEAD.pack(order, len(z), len(esc), len(low)) + k.tobytes() + z + esc.tobytes() + low
+
+
+def _decode_channel(payload, at, n):
+    """→ (int32 잔차를 예측기 역으로 푼 채널, 다음 오프셋)"""
+    order, zlen, n_esc, low_len = CH_HEAD.unpack_from(payload, at)
+    at += CH_HEAD.size
+    n_part = -(-n // PARTITION)
+    k = np.frombuffer(payload[at:at + n_part], dtype=np.uint8)
+    at += n_part
+    u = np.frombuffer(zlib.decompress(payload[at:at + zlen]), dtype=np.uint8).astype(np.uint32)
+    at += zlen
+    if n_esc:
+        u[u == 255] = np.frombuffer(payload[at:at + 4 * n_esc], dtype="<u4")
+        at += 4 * n_esc
+    top = int(k.max()) if n_part else 0
+    if top:
+        ks = np.repeat(k, PARTITION)[:n].astype(np.uint32)
+        shifts = np.arange(top - 1, -1, -1, dtype=np.uint32)
+        mask = shifts[None, :] < ks[:, None]
+        bits = np.zeros((n, top), dtype=np.uint8)
+        bits[mask] = np.unpackbits(np.frombuffer(payload[at:at + low_len], dtype=np.uint8),
+                                   count=int(ks.sum()))
+        u = (u << ks) | (bits.astype(np.uint32) @ (np.uint32(1) << shifts))
+    at += low_len
+    r = (u >> 1).astype(np.int32) ^ -(u & 1).astype(np.int32)
+    for _ in range(order):
+        r = np.cumsum(r, dtype=np.int32)
+    return r, at
+
+
+def _encode_block(x):
+    """int16 (m, ch) → v2 블록 바이트: 스테레오 모드 1바이트 + 채널별 CH_HEAD/k/상위/예외/하위"""
+    wide = x.astype(np.int32)
+    if wide.shape[1] == 2:
+        mode, chans = _stereo(wide)
+    else:
+        mode, chans = STEREO_LR, [_residual(wide[:, c]) for c in range(wide.shape[1])]
+    return bytes([mode]) + b"".join(_encode_channel(order, r) for order, r, _ in chans)
+
+
+def _decode_block(payload, frames, channels):
+    mode = payload[0]
+    at = 1
+    cols = []
+    for _ in range(channels):
+        c, at = _decode_channel(payload, at, frames)
+        cols.append(c)
+    if channels == 2 and mode != STEREO_LR:
+        a, side = cols
+        if mode == STEREO_LS:
+            cols = [a, a - side]
+        elif mode == STEREO_RS:
+            cols = [a + side, a]
+        else:
+            mid = (a << 1) | (side & 1)
+            cols = [(mid + side) >> 1, (mid - side) >> 1]
+    return np.stack(cols, axis=1).astype(np.int16)
+
+
+# ---------- .pcmz v1 블록 (읽기 전용) ----------
+def _decode_block_v1(payload, frames, channels):
+    """v1: 채널을 인터리브한 잔차 하나, 블록당 k 하나 (order, k, zlib 길이, 예외 수 헤더)"""
+    order, k, zlen, n_esc = BLOCK_HEAD.unpack_from(payload)
+    at = BLOCK_HEAD.size
+    n = frames * channels
+    u = np.frombuffer(zlib.decompress(payload[at:at + zlen]), dtype=np.uint8).astype(np.uint32)
+    at += zlen
+    if n_esc:
+        u[u == 255] = np.frombuffer(payload[at:at + 4 * n_esc], dtype="<u4")
+        at += 4 * n_esc
+    if k:
+        bits = np.unpackbits(np.frombuffer(payload[at:], dtype=np.uint8), count=n * k).reshape(n, k)
+        u = (u << k) | (bits.astype(np.uint32) @ (np.uint32(1) << np.arange(k - 1, -1, -1, dtype=np.uint32)))
+    r = ((u >> 1).astype(np.int32) ^ -(u & 1).astype(np.int32)).reshape(frames, channels)
+    for _ in range(order):
+        r = np.cumsum(r, axis=0)
+    return r.astype(np.int16)
+
+
+def save_pcmz(path, data, sample_rate):
+    pcm = to_int16(data)
+    if pcm.ndim == 1:
+        pcm = pcm[:, None]
+    n, ch = pcm.shape
+    blocks = [_encode_block(pcm[i:i + BLOCK_FRAMES]) for i in range(0, n, BLOCK_FRAMES)]
+    ends = np.cumsum([len(b) for b in blocks], dtype=np.uint64)
+    ensure_dir(os.path.dirname(path) or ".")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, ch, int(sample_rate), n, BLOCK_FRAMES))
+        f.write(ends.astype("<u8").tobytes())
+        for b in blocks:
+            f.write(b)
+    os.replace(tmp, path)
+    return path
+
+
+def _pcmz_header(f):
+    magic, version, ch, sr, n, block = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version not in READ_VERSIONS:
+        raise ValueError(f"not a PCMZ v{'/'.join(map(str, READ_VERSIONS))} file")
+    n_blocks = -(-n // block)
+    ends = np.frombuffer(f.read(8 * n_blocks), dtype="<u8").astype(np.int64)
+    return ch, sr, n, block, ends, HEADER.size + 8 * n_blocks, version
+
+
+def read_pcmz(path, start=0, count=None):
+    """[start, start+count) 프레임 → int16 (k, ch), sample_rate — 걸치는 블록만 압축 해제"""
+    with open(path, "rb") as f:
+        ch, sr, n, block, ends, data_at, version = _pcmz_header(f)
+        start = max(0, min(int(start), n))
+        stop = n if count is None else min(n, start + max(0, int(count)))
+        if stop <= start:
+            return np.zeros((0, ch), dtype=np.int16), sr
+        b0, b1 = start // block, (stop - 1) // block + 1
+        begin = ends[b0 - 1] if b0 else 0
+        f.seek(data_at + begin)
+        raw = f.read(int(ends[b1 - 1] - begin))
+    decode = _decode_block if version == VERSION else _decode_block_v1
+    out = []
+    for b in range(b0, b1):
+        lo = (ends[b - 1] if b else 0) - begin
+        frames = min(block, n - b * block)
+        out.append(decode(raw[lo:ends[b] - begin], frames, ch))
+    pcm = np.concatenate(out)
+    return pcm[start - b0 * block:stop - b0 * block], sr
+
+
+# ---------- 포맷 무관 API ----------
+def save_audio(path, data, sample_rate):
+    if path.endswith(PCMZ_SUFFIX):
+        return save_pcmz(path, data, sample_rate)
+    if path.endswith(FLAC_SUFFIX):
+        ensure_dir(os.path.dirname(path) or ".")
+        sf.write(path, to_int16(data), int(sample_rate), format="FLAC", subtype="PCM_16")
+        return path
+    return save_wav(path, data, sample_rate)
+
+
+def load_audio(path):
+    """→ (float32 배열, sample_rate) — load_wav와 같은 모양 (모노면 (n,))"""
+    if path.endswith(PCMZ_SUFFIX):
+        pcm, sr = read_pcmz(path)
+        data = pcm.astype(np.float32) / 32768.0
+        return (data[:, 0] if data.shape[1] == 1 else data), sr
+    if path.endswith(FLAC_SUFFIX):
+        data, sr = sf.read(path, dtype="float32")
+        return data, sr
+    return load_wav(path)
+
+
+def audio_info(path):
+    """(frames, sample_rate, channels)"""
+    if path.endswith(PCMZ_SUFFIX):
+        with open(path, "rb") as f:
+            ch, sr, n, _, _, _, _ = _pcmz_header(f)
+        return n, sr, ch
+    if path.endswith(FLAC_SUFFIX):
+        i = sf.info(path)
+        return i.frames, i.samplerate, i.channels
+    return wav_info(path)
+
+
+def read_frames(path, start, count):
+    """[start, start+count) 프레임만 float32 mono로 (파일 전체를 풀지 않음)"""
+    if path.endswith(PCMZ_SUFFIX):
+        pcm, _ = read_pcmz(path, start, count)
+        data = pcm.astype(np.float32) / 32768.0
+        return data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+    if path.endswith(FLAC_SUFFIX):
+        with sf.SoundFile(path) as f:
+            f.seek(max(0, min(int(start), f.frames)))
+            data = f.read(int(count), dtype="float32", always_2d=True)
+        return data.mean(axis=1)
+    return read_wav_frames(path, start, count)
@@ -0,0 +1,174 @@
+# ============================================
+# utils/audio_store.py - 내용 주소 오디오 저장소 (중복 제거 + 참조 카운트)
+# ============================================
+"""
+같은 녹음이 여러 팩/팔레트에 들어가도 디스크와 메모리에 한 벌만 두는 저장소.
+
+- 키: 저장될 16bit PCM 바이트(+ sample_rate, 채널 수)의 BLAKE2b 해시 (32 hex)
+  → 파일: data/library/blobs/<앞 2글자>/<해시><LIBRARY_CODEC 확장자> (사이드카 .peaks.npz 등도
+  옆에 — 함께 공유). 해시는 PCM 기준이라 포맷을 바꿔도 같은 오디오는 같은 블롭
+- 참조 카운트: blobs/refs.json {해시: 참조 수}. 팩이 블롭을 가리킬 때마다 +1,
+  팩이 지워지면 -1 → 0이 되면 파일과 사이드카를 지움 (GC)
+- write_blob()은 카운트를 건드리지 않는다 (워커 프로세스에서 써도 안전) —
+  참조 기록은 UI 프로세스가 add_refs()로 한 번에
+- sweep(): 쓰였지만 끝내 참조되지 않은 블롭(취소/실패한 export·가져오기, 기록 전 종료) 정리.
+  참조 수 0인 GC는 release에서만 돌기 때문에 따로 필요. 막 써서 아직 기록 전인 블롭을
+  지우지 않도록 BLOB_SWEEP_GRACE_SEC보다 오래된 것만 (이미 있는 블롭을 다시 쓰면 시각 갱신)
+- load(): 해시 → float32 mono. 살아 있는 배열은 약한 참조 캐시로 공유
+"""
+
+import hashlib
+import os
+import time
+import weakref
+import numpy as np
+from config import LIBRARY_DIR, SAMPLE_RATE, LIBRARY_CODEC, BLOB_SWEEP_GRACE_SEC
+from utils.file_manager import to_int16, load_json, save_json
+from utils.audio_codec import codec_suffix, save_audio, load_audio, PCMZ_SUFFIX, FLAC_SUFFIX
+
+BLOBS_DIR = os.path.join(LIBRARY_DIR, "blobs")
+REFS_PATH = os.path.join(BLOBS_DIR, "refs.json")
+SIDECAR_SUFFIXES = (".peaks.npz", ".features.npy")
+BLOB_SUFFIXES = (PCMZ_SUFFIX, FLAC_SUFFIX, ".wav")     # 예전 설정으로 쓴 블롭도 찾음
+_suffix = None
+
+_loaded = weakref.WeakValueDictionary()    # 해시 → float32 mono (누가 쥐고 있는 동안만)
+
+
+def content_hash(data, sample_rate=SAMPLE_RATE):
+    pcm = np.ascontiguousarray(to_int16(data))
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.array([int(sample_rate), 1 if pcm.ndim == 1 else pcm.shape[1]], dtype="<i8").tobytes())
+    h.update(pcm.tobytes())
+    return h.hexdigest()
+
+
+def blob_path(digest):
+    """있는 블롭 파일 경로 (없으면 현재 LIBRARY_CODEC으로 쓸 경로)"""
+    global _suffix
+    base = os.path.join(BLOBS_DIR, digest[:2], digest)
+    for suffix in BLOB_SUFFIXES:
+        if os.path.exists(base + suffix):
+            return base + suffix
+    if _suffix is None:
+        _suffix = codec_suffix(LIBRARY_CODEC)
+    return base + _suffix
+
+
+def write_blob(data, sample_rate=SAMPLE_RATE):
+    """오디오를 저장소에 쓰고 해시를 돌려줌 (이미 있으면 쓰지 않음, 참조 수는 그대로)"""
+    digest = content_hash(data, sample_rate)
+    path = blob_path(digest)
+    if not os.path.exists(path):
+        root, suffix = os.path.splitext(path)
+        tmp = f"{root}.{os.getpid()}.tmp{suffix}"     # 확장자로 포맷을 고르므로 유지
+        save_audio(tmp, data, sample_rate)
+        os.replace(tmp, path)          # 동시에 같은 블롭을 써도 결과는 같은 파일
+    else:
+        try:
+            os.utime(path)             # 곧 참조될 블롭 — sweep 유예 시간을 다시 시작
+        except OSError:
+            pass
+    return digest
+
+
+def load(digest):
+    """해시 → float32 mono (같은 블롭은 메모리에서도 한 벌)"""
+    arr = _loaded.get(digest)
+    if arr is None:
+        data, _ = load_audio(blob_path(digest))
+        arr = np.ascontiguousarray(data.mean(axis=1) if data.ndim > 1 else data, dtype=np.float32)
+        _loaded[digest] = arr
+    return arr
+
+
+# ---------- 참조 카운트 ----------
+def _refs():
+    return load_json(REFS_PATH, default={}) or {}
+
+
+def add_refs(digests):
+    """참조 수 +1씩 (digests에 같은 해시가 여러 번이면 그만큼) — refs.json 쓰기는 한 번"""
+    digests = [d for d in digests if d]
+    if not digests:
+        return
+    refs = _refs()
+    for d in digests:
+        refs[d] = refs.get(d, 0) + 1
+    save_json(REFS_PATH, refs)
+
+
+def put(data, sample_rate=SAMPLE_RATE):
+    digest = write_blob(data, sample_rate)
+    add_refs([digest])
+    return digest
+
+
+def _remove_files(digest, paths):
+    _loaded.pop(digest, None)
+    for p in paths:
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[AudioStore] could not remove {p}: {e}")
+
+
+def release(digests):
+    """참조 수 -1씩, 0이 된 블롭은 파일/사이드카까지 삭제 → 지운 해시 목록"""
+    digests = [d for d in digests if d]
+    if not digests:
+        return []
+    refs = _refs()
+    freed = []
+    for d in digests:
+        n = refs.get(d, 0) - 1
+        if n > 0:
+            refs[d] = n
+        else:
+            refs.pop(d, None)
+            freed.append(d)
+    save_json(REFS_PATH, refs)
+    for d in freed:
+        path = blob_path(d)
+        _remove_files(d, (path,) + tuple(path + s for s in SIDECAR_SUFFIXES))
+    return freed
+
+
+def sweep(keep=(), grace_sec=BLOB_SWEEP_GRACE_SEC):
+    """
+    참조 수가 없고 keep에도 없는 블롭(+ 사이드카, 남은 임시 파일)을 지움 → 지운 해시 목록.
+    블롭 파일이 grace_sec 안에 쓰였으면 건드리지 않음
+    """
+    if not os.path.isdir(BLOBS_DIR):
+        return []
+    live = set(_refs()) | {d for d in keep if d}
+    cutoff = time.time() - grace_sec
+    freed = []
+    for sub in sorted(os.listdir(BLOBS_DIR)):
+        folder = os.path.join(BLOBS_DIR, sub)
+        if not os.path.isdir(folder):
+            continue
+        groups = {}           # 해시 → (파일 목록, 가장 최근 수정 시각)
+        for entry in os.scandir(folder):
+            digest = entry.name[:32]
+            if len(digest) < 32 or digest in live:
+                continue
+            files, newest = groups.get(digest, ([], 0.0))
+            files.append(entry.path)
+            groups[digest] = (files, max(newest, entry.stat().st_mtime))
+        for digest, (files, newest) in groups.items():
+            if newest < cutoff:
+                _remove_files(digest, files)
+                freed.append(digest)
+        if not os.listdir(folder):
+            os.rmdir(folder)
+    return freed
+
+
+def pack_blobs(pack):
+    """팩이 참조하는 블롭 해시들 (믹스다운 + 템플릿, 참조마다 하나씩)"""
+    out = [pack.get("audio_blob")]
+    out += [t.get("blob") for t in (pack.get("templates") or {}).values()]
+    return [d for d in out if d]
@@ -0,0 +1,44 @@
+# ============================================
+# utils/clock.py - 앱 시계 (실시간 / 헤드리스 가상 시간)
+# ============================================
+"""
+씬/레코더가 읽는 '지금'.
+
+- 기본: time.perf_counter() (실시간)
+- 헤드리스 리플레이: 런타임이 set_virtual() 후 프레임마다 advance(dt)
+  → 최대 속도로 돌려도 더블클릭 판정, 더미 녹음 길이 등이 녹화 당시와 같다
+"""
+
+import time
+
+_virtual = None
+
+
+def now():
+    """초 단위 현재 시각"""
+    return time.perf_counter() if _virtual is None else _virtual
+
+
+def ticks_ms():
+    """pygame.time.get_ticks() 대용 (ms, 정수)"""
+    return int(now() * 1000.0)
+
+
+def set_virtual(start=0.0):
+    global _virtual
+    _virtual = float(start)
+
+
+def advance(dt):
+    global _virtual
+    if _virtual is not None:
+        _virtual += dt
+
+
+def use_realtime():
+    global _virtual
+    _virtual = None
+
+
+def is_virtual():
+    return _virtual is not None
@@ -0,0 +1,186 @@
+# ============================================
+# utils/file_manager.py - 파일 저장/로드
+# ============================================
+"""WAV 저장/로드 등 디스크 입출력 도우미"""
+
+import os
+import json
+import wave
+import time
+import threading
+import numpy as np
+from config import SAMPLE_RATE, SAMPLES_DIR, LIBRARY_DIR
+
+LIBRARY_INDEX = os.path.join(LIBRARY_DIR, "index.json")
+
+
+def ensure_dir(path):
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def new_sample_path(prefix="take", directory=SAMPLES_DIR, suffix=".wav"):
+    """data/samples/ (또는 directory) 아래에 겹치지 않는 새 WAV(또는 suffix) 경로"""
+    ensure_dir(directory)
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(directory, f"{prefix}_{stamp}{suffix}")
+    n = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"{prefix}_{stamp}_{n}{suffix}")
+        n += 1
+    return path
+
+
+def new_library_audio_path():
+    """data/library/ 아래 TailPack 믹스다운 WAV 경로"""
+    return new_sample_path("pack", LIBRARY_DIR)
+
+
+def new_pack_path():
+    """data/library/packs/ 아래 TailPack grid 파일(.tailpack) 경로"""
+    return new_sample_path("tail", os.path.join(LIBRARY_DIR, "packs"), ".tailpack")
+
+
+def to_int16(data):
+    """float(-1..1) 또는 int16 배열 → int16 (읽기와 같은 ×32768 — 읽고 다시 써도 값이 그대로)"""
+    data = np.asarray(data)
+    if data.dtype == np.int16:
+        return data
+    return np.clip(np.rint(data * 32768.0), -32768, 32767).astype(np.int16)
+
+
+def save_wav(path, data, sample_rate=SAMPLE_RATE):
+    """float/int16 배열을 16bit PCM WAV로 저장. data: (n,) 또는 (n, ch)"""
+    pcm = to_int16(data)
+    channels = 1 if pcm.ndim == 1 else pcm.shape[1]
+    ensure_dir(os.path.dirname(path) or ".")
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(int(sample_rate))
+        wf.writeframes(pcm.tobytes())
+    return path
+
+
+def _decode_pcm(raw, sampwidth):
+    """정수 PCM 바이트 → float32 (-1..1). 8bit는 unsigned, 24bit는 3바이트 little-endian"""
+    if sampwidth == 1:
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    if sampwidth == 2:
+        return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    if sampwidth == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        v = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        return (np.where(v >= 1 << 23, v - (1 << 24), v) / float(1 << 23)).astype(np.float32)
+    if sampwidth == 4:
+        return (np.frombuffer(raw, dtype=np.int32) / 2147483648.0).astype(np.float32)
+    raise ValueError(f"Unsupported sample width: {sampwidth} bytes")
+
+
+def load_wav(path):
+    """8/16/24/32bit PCM WAV → (float32 배열, sample_rate). 모노면 (n,), 그 외 (n, ch)"""
+    with wave.open(path, "rb") as wf:
+        channels = wf.getnchannels()
+        sr = wf.getframerate()
+        width = wf.getsampwidth()
+        raw = wf.readframes(wf.getnframes())
+    data = _decode_pcm(raw, width)
+    if channels > 1:
+        data = data.reshape(-1, channels)
+    return data, sr
+
+
+def wav_info(path):
+    """(frames, sample_rate, channels)"""
+    with wave.open(path, "rb") as wf:
+        return wf.getnframes(), wf.getframerate(), wf.getnchannels()
+
+
+def read_wav_frames(path, start, count):
+    """WAV의 [start, start+count) 프레임만 읽어 float32 mono로 반환 (전체를 읽지 않음)"""
+    with wave.open(path, "rb") as wf:
+        channels = wf.getnchannels()
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"Only 16-bit PCM WAV supported: {path}")
+        start = max(0, min(int(start), wf.getnframes()))
+        wf.setpos(start)
+        raw = wf.readframes(int(count))
+    data = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        data = data.reshape(-1, channels).mean(axis=1)
+    return data
+
+
+def load_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path, obj):
+    """임시 파일에 쓴 뒤 교체 (쓰다 죽어도 기존 파일 보존)"""
+    ensure_dir(os.path.dirname(path) or ".")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return path
+
+
+# 인덱스 읽기-수정-쓰기 직렬화 (가져오기 취소 후 기록은 백그라운드 스레드에서 일어남)
+_index_lock = threading.RLock()
+
+
+def load_library_packs():
+    """data/library/index.json → 팩 메타데이터 목록 (없으면 None)"""
+    return load_json(LIBRARY_INDEX, default=None)
+
+
+def append_library_pack(pack):
+    """export된 TailPack 메타데이터(썸네일 포함)를 라이브러리 인덱스에 추가"""
+    return append_library_packs([pack])[0]
+
+
+def append_library_packs(new_packs):
+    """
+    여러 팩을 한 번에 추가 — 인덱스 읽기/쓰기(임시 파일 교체)는 한 번뿐.
+    팩이 가리키는 오디오 블롭(audio_store)의 참조 수도 여기서 한 번에 +1
+    """
+    from utils import audio_store
+    with _index_lock:
+        packs = load_library_packs() or []
+        next_id = max((p.get("id", -1) for p in packs), default=-1) + 1
+        for i, pack in enumerate(new_packs):
+            pack["id"] = next_id + i
+        packs.extend(new_packs)
+        save_json(LIBRARY_INDEX, packs)
+        audio_store.add_refs([d for pack in new_packs for d in audio_store.pack_blobs(pack)])
+    return new_packs
+
+
+def remove_library_pack(pid):
+    """인덱스에서 팩 삭제 + 블롭 참조 해제 (아무도 안 쓰게 된 오디오는 지워짐) + grid 파일 삭제"""
+    from utils import audio_store
+    with _index_lock:
+        packs = load_library_packs() or []
+        gone = [p for p in packs if p.get("id") == pid]
+        if not gone:
+            return None
+        save_json(LIBRARY_INDEX, [p for p in packs if p.get("id") != pid])
+        audio_store.release(audio_store.pack_blobs(gone[0]))
+    if gone[0].get("pack_path"):
+        try:
+            os.remove(gone[0]["pack_path"])
+        except OSError:
+            pass
+    return gone[0]
+
+
+def sweep_library_blobs():
+    """인덱스/참조 수 어디에도 없는 오래된 블롭 정리 (audio_store.sweep) → 지운 해시 목록"""
+    from utils import audio_store
+    with _index_lock:
+        packs = load_library_packs() or []
+        keep = {d for p in packs for d in audio_store.pack_blobs(p)}
+        return audio_store.sweep(keep)
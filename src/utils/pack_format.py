@@ -0,0 +1,127 @@
+# ============================================
+# utils/pack_format.py - TailPack 바이너리 포맷 (.tailpack)
+# ============================================
+"""
+TailPack grid를 JSON 대신 열(column) 배열로 저장. 라이브러리 인덱스에는 메타데이터만
+남기고 grid는 팩 파일에 둔다 (index.json이 세션 크기만큼 커지지 않게).
+
+레이아웃 (little-endian):
+    HEADER  magic "TPAK", version, bars, layers, 이벤트 수, 메타 길이
+    META    UTF-8 JSON — grid를 뺀 팩 메타데이터 + "palette"(템플릿 이름 표)
+    BARS    uint32 × (bars + 1) — bar b의 이벤트 행 = [BARS[b], BARS[b+1])
+    COLUMNS COLUMNS 순서대로 열마다 이벤트 수 × itemsize (행은 bar → layer → start 순)
+
+- 이벤트의 템플릿은 palette 인덱스(tpl, 없으면 -1)로 — 이름 문자열을 이벤트마다 반복하지 않음
+- PackReader.bar(b): 헤더/BARS만 읽어 두고, 열마다 그 bar의 행 구간만 seek해서 읽음
+- VERSION이 다르면 ValueError (읽는 쪽이 JSON/재export로 대체)
+"""
+
+import json
+import os
+import struct
+import numpy as np
+from utils.file_manager import ensure_dir
+
+PACK_SUFFIX = ".tailpack"
+MAGIC = b"TPAK"
+VERSION = 1
+# magic, version, bars, layers, 이벤트 수, 메타 길이
+HEADER = struct.Struct("<4sHHHII")
+COLUMNS = (("layer", "<u1"), ("start", "<u1"), ("length", "<u1"), ("pitch", "<i1"),
+           ("gain", "<u2"), ("melody", "<u1"), ("tpl", "<i2"))
+
+
+def _columns(grid, palette_idx):
+    """grid → (bar 오프셋, {열 이름: 배열})"""
+    rows, offsets = [], [0]
+    for bar in grid:
+        for li, layer in enumerate(bar):
+            for ev in sorted(layer, key=lambda e: e["start"]):
+                rows.append((li, ev["start"], ev["length"], ev.get("pitch", 0), ev.get("gain", 100),
+                             1 if ev.get("melody", True) else 0, palette_idx.get(ev.get("tpl_name"), -1)))
+        offsets.append(len(rows))
+    table = np.array(rows, dtype=np.int64).reshape(-1, len(COLUMNS))
+    cols = {name: table[:, i].astype(dt) for i, (name, dt) in enumerate(COLUMNS)}
+    return np.asarray(offsets, dtype="<u4"), cols
+
+
+def _events(cols, palette, layers):
+    """열 배열(한 bar 분량) → [layer] = [event dict]"""
+    out = [[] for _ in range(layers)]
+    names = [palette[t] if t >= 0 else None for t in cols["tpl"].tolist()]
+    for li, start, length, pitch, gain, melody, name in zip(
+            cols["layer"].tolist(), cols["start"].tolist(), cols["length"].tolist(),
+            cols["pitch"].tolist(), cols["gain"].tolist(), cols["melody"].tolist(), names):
+        out[li].append({"start": start, "length": length, "melody": bool(melody), "pitch": pitch,
+                        "gain": gain, "tpl_name": name})
+    return out
+
+
+def write_pack(path, pack):
+    """팩 dict(grid 포함) → .tailpack 파일 (임시 파일에 쓴 뒤 교체)"""
+    grid = pack.get("grid") or []
+    layers = max((len(bar) for bar in grid), default=0)
+    palette = sorted({ev["tpl_name"] for bar in grid for layer in bar for ev in layer if ev.get("tpl_name")})
+    offsets, cols = _columns(grid, {name: i for i, name in enumerate(palette)})
+    meta = {k: v for k, v in pack.items() if k != "grid"}
+    meta["palette"] = palette
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    ensure_dir(os.path.dirname(path) or ".")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(grid), layers, int(offsets[-1]), len(meta_bytes)))
+        f.write(meta_bytes)
+        f.write(offsets.tobytes())
+        for name, _ in COLUMNS:
+            f.write(cols[name].tobytes())
+    os.replace(tmp, path)
+    return path
+
+
+class PackReader:
+    """헤더/메타/bar 오프셋만 먼저 읽고, bar는 요청할 때 읽는 리더"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, self.bars, self.layers, self.n_events, meta_len = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"not a TailPack v{VERSION} file: {path}")
+            self.meta = json.loads(f.read(meta_len).decode("utf-8"))
+            self.offsets = np.frombuffer(f.read(4 * (self.bars + 1)), dtype="<u4").astype(np.int64)
+            at = f.tell()
+        self.palette = self.meta.get("palette", [])
+        self._col_at = {}
+        for name, dt in COLUMNS:
+            self._col_at[name] = (at, np.dtype(dt))
+            at += self.n_events * np.dtype(dt).itemsize
+
+    def _read_rows(self, f, r0, r1):
+        cols = {}
+        for name, (at, dt) in self._col_at.items():
+            f.seek(at + r0 * dt.itemsize)
+            cols[name] = np.frombuffer(f.read((r1 - r0) * dt.itemsize), dtype=dt)
+        return cols
+
+    def bar(self, b):
+        """bar b 하나 → [layer] = [event dict] (그 bar의 행만 읽음)"""
+        if not 0 <= b < self.bars:
+            raise IndexError(b)
+        with open(self.path, "rb") as f:
+            cols = self._read_rows(f, int(self.offsets[b]), int(self.offsets[b + 1]))
+        return _events(cols, self.palette, self.layers)
+
+    def grid(self):
+        with open(self.path, "rb") as f:
+            cols = self._read_rows(f, 0, self.n_events)
+        bounds = self.offsets.tolist()
+        return [_events({k: v[bounds[b]:bounds[b + 1]] for k, v in cols.items()}, self.palette, self.layers)
+                for b in range(self.bars)]
+
+
+def read_pack(path):
+    """.tailpack → 팩 dict (JSON으로 저장하던 것과 같은 모양, grid 포함)"""
+    reader = PackReader(path)
+    pack = {k: v for k, v in reader.meta.items() if k != "palette"}
+    pack["grid"] = reader.grid()
+    return pack
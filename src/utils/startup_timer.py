@@ -0,0 +1,50 @@
+# ============================================
+# utils/startup_timer.py - 콜드 스타트 구간 측정
+# ============================================
+"""
+부팅 → 첫 화면까지 구간별 시간 기록.
+main.py가 단계마다 mark()를 찍고 첫 flip 뒤 report()로 한 줄 출력.
+(무거운 모듈이 첫 프레임 전에 import됐는지도 함께 표시)
+"""
+
+import sys
+import time
+
+# 첫 프레임 전에 로드되면 안 되는(지연 로드 대상) 모듈
+# (numpy는 pygame 2가 surfarray용으로 직접 import하므로 여기서 보지 않는다)
+WATCHED_MODULES = ("audio.mixer", "audio.recorder", "audio.loop_engine", "sounddevice", "pygame.mixer")
+
+
+class StartupTimer:
+    def __init__(self, t0=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self._last = self.t0
+        self.marks = []        # (label, 구간 ms)
+
+    def mark(self, label):
+        now = time.perf_counter()
+        self.marks.append((label, (now - self._last) * 1000.0))
+        self._last = now
+
+    @property
+    def total_ms(self):
+        return (self._last - self.t0) * 1000.0
+
+    def loaded_heavy_modules(self):
+        loaded = [m for m in WATCHED_MODULES if m in sys.modules]
+        # pygame.mixer는 pygame import 시 모듈은 로드되므로 실제 초기화 여부로 판단
+        if "pygame.mixer" in loaded:
+            mixer = sys.modules["pygame.mixer"]
+            if not (hasattr(mixer, "get_init") and mixer.get_init()):
+                loaded.remove("pygame.mixer")
+        return loaded
+
+    def report(self, target_ms=1000.0):
+        parts = " | ".join(f"{label} {ms:.0f}ms" for label, ms in self.marks)
+        verdict = "OK" if self.total_ms <= target_ms else "SLOW"
+        line = f"[Startup] {parts} | total {self.total_ms:.0f}ms ({verdict})"
+        heavy = self.loaded_heavy_modules()
+        if heavy:
+            line += f" | loaded early: {', '.join(heavy)}"
+        print(line)
+        return line